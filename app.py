@@ -4,15 +4,23 @@ import logging
 import threading
 import time
 import json
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template, Response, jsonify, request, redirect, url_for
+from flask import Flask, render_template, Response, jsonify, request, redirect, url_for, send_from_directory, abort
 from flask_socketio import SocketIO, emit
 
 # Import existing components
 from src.config import Config, setup_logging
+from src.logging_setup import add_queued_handler, log_detection_change, set_log_context
+from src.tracing import tracer
 from src.fire_detector import Detector
 from src.notification_service import NotificationService
+from src.clip_recorder import ClipRecorder
+from src.gallery import ThumbnailGallery
+from src.runtime_config import RuntimeConfig, RuntimeSettings, ConfigVersionError
+from src.alert_aggregator import AlertAggregator
+from src.frame_selector import BestFrameSelector
 
 # Initialize Flask app
 app = Flask(__name__, 
@@ -23,20 +31,81 @@ socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
 # Global variables
 frame_buffer = None
+latest_jpeg = None  # (jpeg bytes, frame id) of the last encoded frame
 detection_status = None
 latest_logs = []
 detection_count = {"Fire": 0, "Smoke": 0}
 stats_lock = threading.Lock()  # Lock for thread-safe stats updates
 system_active = False
 processing_thread = None
-alert_cooldown = Config.ALERT_COOLDOWN
-last_alert_time = 0  # Initialize the last alert time
 
 # Initialize system components
 setup_logging()
 logger = logging.getLogger(__name__)
+tracer.configure(enabled=Config.TRACE_ENABLED, capacity=Config.TRACE_CAPACITY)
+tracer.install_signal_handler(Config.TRACE_DIR)
 detector = Detector(Config.MODEL_PATH)
+runtime_config = RuntimeConfig(
+    RuntimeSettings(
+        min_confidence=detector.min_confidence,
+        smoke_confidence=detector.smoke_confidence,
+        iou_threshold=detector.iou_threshold,
+        roi=detector.roi,
+        alert_cooldown=Config.ALERT_COOLDOWN
+    ),
+    config_file=Config.RUNTIME_CONFIG_FILE
+)
+runtime_config.subscribe(lambda settings: detector.update_settings(**settings.detector_settings()))
+runtime_config.start_watching()
 notification_service = NotificationService(Config)
+clip_recorder = ClipRecorder(
+    Config.CLIPS_DIR,
+    pre_seconds=Config.CLIP_PRE_SECONDS,
+    post_seconds=Config.CLIP_POST_SECONDS,
+    max_buffer_bytes=Config.CLIP_BUFFER_MAX_MB * 1024 * 1024
+)
+gallery = ThumbnailGallery(
+    Config.DETECTED_FIRES_DIR,
+    Config.THUMBNAILS_DIR,
+    thumb_size=Config.THUMBNAIL_SIZE
+)
+gallery.start()
+notification_service.on_alert_saved.append(lambda image_path: gallery.refresh())
+
+# Holds opening alerts briefly so the best frame of the moment is sent
+selector = BestFrameSelector(Config.BEST_FRAME_WINDOW_MS)
+
+def deliver_alert(alert, clip_path=None):
+    """Hand an aggregated alert to the notification service"""
+    logger.warning(f"🔥 {alert.detection} {alert.kind} alert queued ({alert.summary})")
+    notification_service.send_alert(
+        alert.frame, alert.detection, clip_path=clip_path, boxes=alert.boxes,
+        details=alert.summary, channels=alert.channels)
+    socketio.emit('alert_sent', {'type': alert.detection, 'kind': alert.kind,
+                                 'time': datetime.now().strftime('%H:%M:%S')})
+
+def send_incident_alert(alert):
+    """Deliver an alert produced by the aggregator"""
+    if alert.kind not in ('first', 'escalation'):
+        # Digests already carry the best frame of the incident
+        deliver_alert(alert)
+        return
+    # Clips only for alerts that open or escalate an incident, digests reuse them
+    clip_path = clip_recorder.trigger(alert.camera_id, alert.detection)
+    selector.begin(
+        alert.camera_id, alert.frame, alert.confidence, alert.boxes,
+        lambda frame, confidence, boxes: deliver_alert(
+            replace(alert, frame=frame, confidence=confidence, boxes=boxes), clip_path))
+
+# Groups detections into incidents and rate-limits alerts per channel
+aggregator = AlertAggregator(
+    send_incident_alert,
+    lambda: notification_service.channels,
+    window=Config.INCIDENT_WINDOW,
+    digest_interval=runtime_config.current.alert_cooldown,
+    rate_limits=Config.ALERT_RATE_LIMITS
+).start()
+runtime_config.subscribe(lambda settings: setattr(aggregator, 'digest_interval', settings.alert_cooldown))
 
 # Configure logging handler to capture logs
 class LogHandler(logging.Handler):
@@ -60,14 +129,15 @@ class LogHandler(logging.Handler):
 
 log_handler = LogHandler()
 log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s: %(message)s'))
-logging.getLogger().addHandler(log_handler)
+# Socket.IO emits run on the logging listener thread, not the thread that logged
+add_queued_handler(log_handler)
 
 def get_logs():
     return log_handler.buffer
 
 def generate_frames():
     """Generate frames from video source with detection overlay"""
-    global frame_buffer, detection_status, last_alert_time
+    global frame_buffer, detection_status, latest_jpeg
     
     # Use OpenCV to capture video
     if str(Config.VIDEO_SOURCE).isdigit():
@@ -80,6 +150,7 @@ def generate_frames():
         return
     
     logger.info(f"Started video processing from: {Config.VIDEO_SOURCE}")
+    source_id = str(Config.VIDEO_SOURCE)
     
     frame_count = 0
     while system_active:
@@ -92,20 +163,24 @@ def generate_frames():
         if frame_count % 10 == 0 and not system_active:
             break
             
-        success, frame = cap.read()
+        with tracer.span('capture', 'dashboard'):
+            success, frame = cap.read()
         if not success:
             # If video file ends, loop back to beginning
             cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
             continue
+        set_log_context(camera_id=source_id, frame_ts=round(time.time(), 3))
             
         # Process frame for detection
-        processed_frame, detection = detector.process_frame(frame)
+        with tracer.span('process_frame', 'dashboard'):
+            processed_frame, detection = detector.process_frame(frame)
         frame_buffer = processed_frame.copy()
         
         # Update detection status when it changes
         if detection != detection_status:
             old_status = detection_status
             detection_status = detection
+            log_detection_change(logger, detection)
             
             if detection:
                 # Use a lock when updating the detection count
@@ -117,29 +192,40 @@ def generate_frames():
                         detection_count["Smoke"] = detection_count.get("Smoke", 0) + 1
                 
                 # Emit the updated counts
-                socketio.emit('detection_update', {'status': detection})
-                socketio.emit('stats_update', dict(detection_count))
-                
-                # Alert logic with cooldown
-                current_time = time.time()
-                if (current_time - last_alert_time) > alert_cooldown:
-                    logger.warning(f"🔥 {detection} Detected! Sending alert")
-                    notification_service.send_alert(processed_frame, detection)
-                    socketio.emit('alert_sent', {'type': detection, 'time': datetime.now().strftime('%H:%M:%S')})
-                    last_alert_time = current_time
+                with tracer.span('socketio.emit', 'dashboard', event='detection_update'):
+                    socketio.emit('detection_update', {'status': detection})
+                    socketio.emit('stats_update', dict(detection_count))
+
+        # The aggregator decides whether this detection becomes an alert
+        if detection:
+            with tracer.span('alert.report', 'dashboard', detection=detection):
+                detections = detector.last_detections
+                confidence = max((d['confidence'] for d in detections
+                                  if d['class'].lower() == detection.lower()), default=0.0)
+                boxes = [d['box'] for d in detections]
+                selector.offer(source_id, processed_frame, confidence, boxes)
+                aggregator.report(source_id, detection, processed_frame, confidence, boxes=boxes)
 
         # Force emit stats periodically (every 30 frames)
         if frame_count % 30 == 0:
-            socketio.emit('stats_update', dict(detection_count))
+            with tracer.span('socketio.emit', 'dashboard', event='stats_update'):
+                socketio.emit('stats_update', dict(detection_count))
         
         # Convert to JPEG format
-        ret, buffer = cv2.imencode('.jpg', processed_frame)
+        with tracer.span('cv2.imencode', 'dashboard'):
+            ret, buffer = cv2.imencode('.jpg', processed_frame)
         if not ret:
             continue
+
+        # Reuse the encoded frame for the clip buffer
+        frame_bytes = buffer.tobytes()
+        latest_jpeg = (frame_bytes, time.monotonic_ns())
+        with tracer.span('clip.add_frame', 'dashboard'):
+            clip_recorder.add_frame(source=source_id, encoded=frame_bytes)
             
         # Yield the frame in bytes
         yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
     
     # Clean up
     cap.release()
@@ -176,11 +262,72 @@ def video_feed():
     return Response(generate_frames(),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
 
+@app.route('/api/snapshot')
+def api_snapshot():
+    """Serve the most recently encoded frame without re-encoding"""
+    snapshot = latest_jpeg
+    if snapshot is None:
+        return jsonify({'error': 'No frame available'}), 503
+
+    frame_bytes, frame_id = snapshot
+    etag = f'frame-{frame_id}'
+    if request.if_none_match.contains(etag):
+        return Response(status=304)
+
+    response = Response(frame_bytes, mimetype='image/jpeg')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+@app.route('/api/gallery')
+def api_gallery():
+    """List cached alert thumbnails, newest first"""
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    items = [{
+        'name': item['name'],
+        'timestamp': item['mtime'] / 1e9,
+        'width': item['width'],
+        'height': item['height'],
+        # The mtime query parameter busts the long-lived browser cache
+        'thumbnail_url': url_for('gallery_thumbnail', name=item['name'], v=item['mtime']),
+        'image_url': url_for('gallery_image', name=item['name'], v=item['mtime']),
+    } for item in gallery.list(limit=limit, offset=offset)]
+    return jsonify({'total': len(gallery), 'items': items})
+
+@app.route('/api/gallery/thumbnails/<name>')
+def gallery_thumbnail(name):
+    """Serve a cached thumbnail"""
+    if name not in gallery:
+        abort(404)
+    response = send_from_directory(
+        Config.THUMBNAILS_DIR, name, max_age=Config.GALLERY_CACHE_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/api/gallery/images/<name>')
+def gallery_image(name):
+    """Serve a full-size alert image"""
+    if name not in gallery:
+        abort(404)
+    response = send_from_directory(
+        Config.DETECTED_FIRES_DIR, name, max_age=Config.GALLERY_CACHE_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
 @app.route('/api/logs')
 def api_logs():
     """Return recent logs as JSON"""
     return jsonify(get_logs())
 
+@app.route('/api/trace')
+def api_trace():
+    """Download the span ring buffer as Chrome trace JSON (chrome://tracing, ui.perfetto.dev)"""
+    response = jsonify(tracer.chrome_trace())
+    filename = f"trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
 @app.route('/api/stats')
 def api_stats():
     """Return detection statistics"""
@@ -196,11 +343,60 @@ def api_stats():
         },
         'system': {
             'active': system_active,
-            'alert_cooldown': alert_cooldown,
+            'alert_cooldown': runtime_config.current.alert_cooldown,
             'video_source': str(Config.VIDEO_SOURCE)
         }
     })
 
+@app.route('/api/config', methods=['GET'])
+def api_get_config():
+    """Return the live-tunable settings and their version"""
+    return jsonify(runtime_config.current.to_dict())
+
+@app.route('/api/config', methods=['POST'])
+def api_update_config():
+    """Apply new thresholds, ROI or cooldown without restarting the pipeline"""
+    changes = request.get_json(silent=True)
+    if not isinstance(changes, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+
+    expected_version = changes.pop('version', None)
+    try:
+        settings = runtime_config.update(changes, expected_version=expected_version)
+    except ConfigVersionError as e:
+        return jsonify({'error': str(e), 'current': runtime_config.current.to_dict()}), 409
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    socketio.emit('config_update', settings.to_dict())
+    return jsonify(settings.to_dict())
+
+@app.route('/api/metrics/http')
+def api_http_metrics():
+    """Return latency and error metrics of outbound notification requests"""
+    return jsonify(notification_service.http_metrics())
+
+@app.route('/api/metrics/outbox')
+def api_outbox_metrics():
+    """Return alert delivery counts per channel and state plus recent dead letters"""
+    return jsonify(notification_service.outbox_metrics(
+        limit=min(request.args.get('limit', 50, type=int), 500)))
+
+@app.route('/api/outbox/retry', methods=['POST'])
+def api_outbox_retry():
+    """Requeue dead-lettered alert deliveries"""
+    return jsonify({'requeued': notification_service.retry_dead_letters()})
+
+@app.route('/api/metrics/images')
+def api_image_metrics():
+    """Return bytes and upload time saved by per-channel image profiles"""
+    return jsonify(notification_service.image_metrics())
+
+@app.route('/api/incident')
+def api_incident():
+    """Return the state of the current alert incident"""
+    return jsonify(aggregator.stats())
+
 @app.route('/api/detection_counts', methods=['GET'])
 def api_detection_counts():
     """Return current detection counts"""
@@ -283,4 +479,10 @@ def handle_connect():
 
 if __name__ == '__main__':
     logger.info("Starting application")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    try:
+        socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    finally:
+        # The selector first: a held opening alert must go out before the final digest
+        selector.stop()
+        aggregator.stop()
+        clip_recorder.close()
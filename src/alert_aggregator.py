@@ -0,0 +1,257 @@
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `rate` tokens per second up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+@dataclass
+class Incident:
+    """Detections grouped across cameras and classes"""
+    started_at: float
+    last_seen: float
+    cameras: List[str] = field(default_factory=list)
+    counts: Counter = field(default_factory=Counter)
+    best_confidence: float = -1.0
+    best_detection: Optional[str] = None
+    best_camera: Optional[str] = None
+    best_frame: Optional[np.ndarray] = None
+    best_boxes: list = field(default_factory=list)
+    alerts_sent: int = 0
+    last_alert_at: float = 0.0
+    unsent: int = 0  # Detections since the last alert
+
+    def summary(self) -> str:
+        counts = ', '.join(f"{name} ×{n}" for name, n in self.counts.most_common())
+        cameras = ', '.join(self.cameras)
+        return f"cameras: {cameras} | {counts} | {int(self.last_seen - self.started_at)}s"
+
+
+@dataclass(frozen=True)
+class AggregatedAlert:
+    """One outbound alert produced by the aggregator"""
+    kind: str  # 'first', 'escalation', 'digest' or 'final'
+    detection: str
+    camera_id: str
+    frame: np.ndarray
+    boxes: list
+    confidence: float
+    summary: str
+    channels: List[str]
+
+
+class AlertAggregator:
+    def __init__(
+        self,
+        send: Callable[[AggregatedAlert], None],
+        channels: Callable[[], List[str]],
+        window: float = 120.0,
+        digest_interval: float = 45.0,
+        rate_limits: Optional[Dict[str, dict]] = None,
+        tick_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+        ):
+        """
+        Group detections from all cameras into incidents and rate-limit alerts.
+
+        The first detection of an incident is sent immediately. A new class or
+        camera joining the incident escalates straight away; everything else
+        is folded into a digest sent at most every `digest_interval` seconds,
+        plus a final digest when the incident goes quiet.
+
+        Args:
+            send (callable): Receives each AggregatedAlert
+            channels (callable): Returns the channels currently available
+            window (float): Seconds without detections that close an incident
+            digest_interval (float): Minimum seconds between digests of one incident
+            rate_limits (dict): Channel mapped to {'rate': tokens/s, 'capacity': burst}
+            tick_interval (float): Seconds between checks for due digests
+            clock (callable): Monotonic time source, replaceable in tests
+        """
+        self.logger = logging.getLogger(__name__)
+        self.send = send
+        self.channels = channels
+        self.window = window
+        self.digest_interval = digest_interval
+        self.tick_interval = tick_interval
+        self.clock = clock
+        self.buckets = {
+            channel: TokenBucket(limit['rate'], limit['capacity'], clock)
+            for channel, limit in (rate_limits or {}).items()
+        }
+        self.incident: Optional[Incident] = None
+        self.suppressed = Counter()  # Alerts withheld per channel by the rate limits
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'AlertAggregator':
+        """Send digests and close incidents from a background thread"""
+        self._thread = threading.Thread(
+            target=self._run, name="alert-aggregator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        # Do not lose the tail of an incident on shutdown
+        self.tick(flush=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.tick_interval):
+            try:
+                self.tick()
+            except Exception as e:
+                self.logger.error(f"Alert aggregator tick failed: {e}")
+
+    def report(self, camera_id: str, detection: str, frame: np.ndarray,
+               confidence: float = 0.0, boxes: Optional[list] = None) -> Optional[AggregatedAlert]:
+        """
+        Feed one detection frame; returns the alert if one was sent right away.
+
+        Args:
+            camera_id (str): Source the frame came from
+            detection (str): Detected class
+            frame (np.ndarray): Processed frame (copied only if it becomes the best one)
+            confidence (float): Highest confidence of the detection in this frame
+            boxes (list): Detection boxes in frame coordinates
+        """
+        now = self.clock()
+        outgoing = []
+        with self._lock:
+            incident = self.incident
+            new_incident = incident is None or now - incident.last_seen > self.window
+            if new_incident:
+                if incident is not None:
+                    outgoing.append(self._close(incident))
+                incident = self.incident = Incident(started_at=now, last_seen=now)
+            escalated = not new_incident and (
+                detection not in incident.counts or camera_id not in incident.cameras)
+
+            incident.last_seen = now
+            incident.counts[detection] += 1
+            incident.unsent += 1
+            if camera_id not in incident.cameras:
+                incident.cameras.append(camera_id)
+            if confidence > incident.best_confidence:
+                incident.best_confidence = confidence
+                incident.best_detection = detection
+                incident.best_camera = camera_id
+                incident.best_frame = frame.copy()
+                incident.best_boxes = list(boxes or [])
+
+            alert = None
+            if new_incident or escalated:
+                # Show the frame that opened or escalated the incident
+                alert = self._prepare(incident, 'first' if new_incident else 'escalation',
+                                      detection, camera_id, frame, boxes, confidence)
+                outgoing.append(alert)
+        # Sending encodes and persists the alert, which must not hold up other reports
+        self._send(outgoing)
+        return alert
+
+    def tick(self, flush: bool = False) -> Optional[AggregatedAlert]:
+        """Send a due digest or close a quiet incident"""
+        now = self.clock()
+        alert = None
+        with self._lock:
+            incident = self.incident
+            if incident is None:
+                return None
+            if flush or now - incident.last_seen > self.window:
+                self.incident = None
+                alert = self._close(incident)
+            elif incident.unsent and now - incident.last_alert_at >= self.digest_interval:
+                alert = self._prepare(incident, 'digest', incident.best_detection)
+        self._send([alert])
+        return alert
+
+    def _close(self, incident: Incident) -> Optional[AggregatedAlert]:
+        self.logger.info(f"Incident closed after {incident.alerts_sent} alerts: {incident.summary()}")
+        if incident.unsent:
+            return self._prepare(incident, 'final', incident.best_detection)
+        return None
+
+    def _send(self, alerts: List[Optional[AggregatedAlert]]) -> None:
+        """Hand prepared alerts to the sender, outside the lock"""
+        for alert in alerts:
+            if alert is None:
+                continue
+            try:
+                self.send(alert)
+            except Exception as e:
+                self.logger.error(f"Sending {alert.kind} alert failed: {e}")
+
+    def _prepare(self, incident: Incident, kind: str, detection: str, camera_id: str = None,
+                 frame: np.ndarray = None, boxes: list = None,
+                 confidence: float = None) -> Optional[AggregatedAlert]:
+        """
+        Build an alert for every channel that still has budget and mark it
+        sent (called with the lock held); the caller sends it after releasing
+        the lock.
+
+        Without an explicit frame the best frame of the incident is sent.
+        """
+        channels = []
+        for channel in self.channels():
+            bucket = self.buckets.get(channel)
+            if bucket is None or bucket.try_acquire():
+                channels.append(channel)
+            else:
+                self.suppressed[channel] += 1
+        if not channels:
+            self.logger.info(f"{kind} alert held back by rate limits, will be digested")
+            return None
+
+        alert = AggregatedAlert(
+            kind=kind,
+            detection=detection,
+            camera_id=camera_id if frame is not None else incident.best_camera,
+            frame=frame if frame is not None else incident.best_frame,
+            boxes=list(boxes or []) if frame is not None else incident.best_boxes,
+            confidence=confidence if frame is not None else incident.best_confidence,
+            summary=incident.summary(),
+            channels=channels,
+        )
+        incident.alerts_sent += 1
+        incident.last_alert_at = self.clock()
+        incident.unsent = 0
+        return alert
+
+    def stats(self) -> dict:
+        with self._lock:
+            incident = self.incident
+            return {
+                'active': incident is not None,
+                'alerts_sent': incident.alerts_sent if incident else 0,
+                'counts': dict(incident.counts) if incident else {},
+                'cameras': list(incident.cameras) if incident else [],
+                'suppressed': dict(self.suppressed),
+            }
@@ -2,7 +2,7 @@ import os
 import re
 from dotenv import load_dotenv
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
+from telegram.ext import ContextTypes
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -72,16 +72,21 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             )
 
 def main() -> None:
+    """Standalone subscriber bot; run it instead of the in-process service
+    (TELEGRAM_SUBSCRIBERS=external), never alongside it"""
+    from subscriber_service import SubscriberService, SubscriberStore
+
     token = os.getenv("TELEGRAM_TOKEN")
-    application = Application.builder().token(token).build()
-    application.add_handlers([
-        CommandHandler("start", start_command),
-        CommandHandler("help", help_command),
-        CallbackQueryHandler(button_handler)
-    ])
+    service = SubscriberService(
+        token,
+        SubscriberStore.from_env(Path(__file__).parent),
+        webhook_url=os.getenv("TELEGRAM_WEBHOOK_URL") or None,
+        webhook_port=int(os.getenv("TELEGRAM_WEBHOOK_PORT", 8443)),
+        webhook_secret=os.getenv("TELEGRAM_WEBHOOK_SECRET") or None
+    )
 
     print("Bot is running...")
-    application.run_polling(drop_pending_updates=True)
+    service.run()
 
 
 if __name__ == "__main__":
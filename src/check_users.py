@@ -17,11 +17,7 @@ async def force_update():
         # Initialize bot
         bot = FlareGuardBot(token)
 
-        # Force update chat IDs
-        print("Updating chat IDs...")
-        await bot.initialize()
-
-        # Read and display current chat IDs
+        # Subscribers are registered by the subscriber service (in-process or src/bot.py)
         print("\nCurrent chat IDs:")
         for i, chat_id in enumerate(bot.chat_ids, 1):
             print(f"{i}. Chat ID: {chat_id}")
@@ -0,0 +1,234 @@
+import cv2
+import numpy as np
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class _PendingClip:
+    """Frames collected for a clip that is still waiting for post-event footage"""
+
+    def __init__(self, path: Path, source: str, frames: List[Tuple[float, bytes]], end_time: float):
+        self.path = path
+        self.source = source
+        self.frames = frames
+        self.end_time = end_time
+        self.size = sum(len(data) for _, data in frames)
+
+
+class ClipRecorder:
+    def __init__(
+        self,
+        output_dir: Path,
+        pre_seconds: float = 5.0,
+        post_seconds: float = 5.0,
+        max_buffer_bytes: int = 64 * 1024 * 1024,
+        jpeg_quality: int = 80,
+        encode_queue_size: int = 8
+        ):
+        """
+        Keep a rolling in-memory buffer of encoded frames per source and
+        write short MP4 clips around detection events.
+
+        Args:
+            output_dir (Path): Directory where clips are written
+            pre_seconds (float): Seconds of footage kept before an event
+            post_seconds (float): Seconds of footage recorded after an event
+            max_buffer_bytes (int): Upper bound of encoded bytes held per source
+            jpeg_quality (int): JPEG quality used when frames are encoded here
+            encode_queue_size (int): Raw frames waiting for their JPEG encode before new ones are dropped
+        """
+        self.logger = logging.getLogger(__name__)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.max_buffer_bytes = max_buffer_bytes
+        self.jpeg_quality = jpeg_quality
+
+        self._buffers: Dict[str, deque] = {}
+        self._buffer_bytes: Dict[str, int] = {}
+        self._pending: List[_PendingClip] = []
+        self._lock = threading.Lock()
+
+        # Encoding happens on a single background thread so the
+        # detection loop only ever appends bytes to a deque
+        self._jobs = queue.Queue()
+        self._running = True
+        self._worker = threading.Thread(
+            target=self._encode_loop, name="clip-encoder", daemon=True)
+        self._worker.start()
+
+        # Raw frames are JPEG-encoded on their own thread, so a clip being
+        # written does not hold up the rolling buffer
+        self._frames = queue.Queue(encode_queue_size)
+        self.dropped_frames = 0
+        self._frame_worker = threading.Thread(
+            target=self._frame_loop, name="clip-jpeg", daemon=True)
+        self._frame_worker.start()
+
+    def add_frame(
+        self,
+        frame: Optional[np.ndarray] = None,
+        source: str = "default",
+        encoded: Optional[bytes] = None,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Append a frame to the rolling buffer of a source.
+
+        A raw frame is handed to the background JPEG encoder and must not be
+        modified afterwards; when the encoder falls behind it is dropped.
+
+        Args:
+            frame (np.ndarray): Raw frame, encoded in the background if `encoded` is not given
+            source (str): Camera or stream identifier
+            encoded (bytes): Already JPEG-encoded frame, avoids a second encode
+            timestamp (float): Capture time, defaults to now
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        if encoded is None:
+            if frame is None:
+                return
+            try:
+                self._frames.put_nowait((frame, source, timestamp))
+            except queue.Full:
+                self.dropped_frames += 1
+            return
+        self._append(source, encoded, timestamp)
+
+    def _append(self, source: str, encoded: bytes, timestamp: float) -> None:
+        finished = []
+        with self._lock:
+            buffer = self._buffers.setdefault(source, deque())
+            buffer.append((timestamp, encoded))
+            size = self._buffer_bytes.get(source, 0) + len(encoded)
+
+            # Drop frames that are too old or exceed the memory budget
+            while buffer and (timestamp - buffer[0][0] > self.pre_seconds
+                              or size > self.max_buffer_bytes):
+                size -= len(buffer.popleft()[1])
+            self._buffer_bytes[source] = size
+
+            for clip in self._pending:
+                if clip.source != source:
+                    continue
+                if timestamp > clip.end_time:
+                    finished.append(clip)
+                elif clip.size + len(encoded) <= self.max_buffer_bytes:
+                    clip.frames.append((timestamp, encoded))
+                    clip.size += len(encoded)
+            for clip in finished:
+                self._pending.remove(clip)
+
+        for clip in finished:
+            self._jobs.put(clip)
+
+    def trigger(self, source: str = "default", label: str = "event") -> Path:
+        """
+        Start a clip for a detection event.
+
+        Returns the path the clip will be written to; the file appears once
+        the post-event footage is collected and encoded in the background.
+        """
+        now = time.time()
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = self.output_dir / f'clip_{label.lower()}_{timestamp}.mp4'
+
+        with self._lock:
+            frames = [f for f in self._buffers.get(source, ())
+                      if now - f[0] <= self.pre_seconds]
+            self._pending.append(
+                _PendingClip(path, source, frames, now + self.post_seconds))
+
+        self.logger.info(f"Clip recording scheduled: {path.name}")
+        return path
+
+    def _flush_expired(self, force: bool = False) -> None:
+        """Hand clips over to the encoder once their source went quiet"""
+        now = time.time()
+        with self._lock:
+            expired = [c for c in self._pending
+                       if force or now > c.end_time + 1.0]
+            for clip in expired:
+                self._pending.remove(clip)
+        for clip in expired:
+            self._jobs.put(clip)
+
+    def _frame_loop(self) -> None:
+        while True:
+            item = self._frames.get()
+            try:
+                if item is None:
+                    return
+                frame, source, timestamp = item
+                ret, buffer = cv2.imencode(
+                    '.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                if ret:
+                    self._append(source, buffer.tobytes(), timestamp)
+            except Exception as e:
+                self.logger.error(f"Clip frame encoding failed: {e}")
+            finally:
+                self._frames.task_done()
+
+    def drain(self) -> None:
+        """Wait until every queued raw frame is in the buffer"""
+        self._frames.join()
+
+    def _encode_loop(self) -> None:
+        while self._running or not self._jobs.empty():
+            try:
+                clip = self._jobs.get(timeout=0.5)
+            except queue.Empty:
+                self._flush_expired()
+                continue
+            if clip is None:
+                continue
+            try:
+                self._write_clip(clip)
+            except Exception as e:
+                self.logger.error(f"Clip encoding failed for {clip.path.name}: {e}")
+
+    def _write_clip(self, clip: _PendingClip) -> None:
+        if not clip.frames:
+            self.logger.warning(f"No frames buffered for clip {clip.path.name}")
+            return
+
+        duration = clip.frames[-1][0] - clip.frames[0][0]
+        fps = (len(clip.frames) - 1) / duration if duration > 0 else 15.0
+
+        writer = None
+        size = None
+        try:
+            for _, data in clip.frames:
+                frame = cv2.imdecode(
+                    np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if frame is None:
+                    continue
+                if writer is None:
+                    size = (frame.shape[1], frame.shape[0])
+                    writer = cv2.VideoWriter(
+                        str(clip.path), cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+                elif (frame.shape[1], frame.shape[0]) != size:
+                    frame = cv2.resize(frame, size)
+                writer.write(frame)
+        finally:
+            if writer is not None:
+                writer.release()
+
+        self.logger.info(
+            f"Clip saved: {clip.path.name} ({len(clip.frames)} frames, {fps:.1f} fps)")
+
+    def close(self) -> None:
+        """Encode any pending clips and stop the encoder threads"""
+        self._frames.put(None)
+        self._frame_worker.join(timeout=5)
+        self._flush_expired(force=True)
+        self._running = False
+        self._jobs.put(None)
+        self._worker.join(timeout=30)
@@ -3,30 +3,29 @@ from dotenv import load_dotenv
 import logging
 from pathlib import Path
 
+try:
+    from .logging_setup import configure_logging
+except ImportError:  # Running as a script from src/
+    from logging_setup import configure_logging
+
 PROJECT_ROOT = Path(__file__).parent.parent
 ENV = PROJECT_ROOT / '.env'
 load_dotenv(ENV, override=True)
 
 
 def setup_logging():
-    log_dir = PROJECT_ROOT / 'logs'
-    log_dir.mkdir(exist_ok=True)
-
-    logging.basicConfig(
-        filename=log_dir / 'fire_detection.log',
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+    """Queued, rotated logging to logs/fire_detection.log (see logging_setup.configure_logging)"""
+    return configure_logging(
+        Config.LOG_FILE,
+        level=getattr(logging, Config.LOG_LEVEL.upper(), logging.INFO),
+        json_lines=Config.LOG_FORMAT == 'json',
+        rotate=Config.LOG_ROTATE,
+        max_bytes=Config.LOG_MAX_MB * 1024 * 1024,
+        when=Config.LOG_ROTATE_WHEN,
+        backups=Config.LOG_BACKUPS,
+        debug_sample_interval=Config.LOG_DEBUG_SAMPLE_SECONDS
     )
 
-    # Also log to console
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(formatter)
-    logging.getLogger().addHandler(console_handler)
-
 # Environment variables configuration
 
 
@@ -39,7 +38,84 @@ class Config:
     VIDEO_SOURCE = PROJECT_ROOT / 'data' / 'gen_fire.mp4'
     DETECTED_FIRES_DIR = PROJECT_ROOT / 'detected_fires'
 
-    ALERT_COOLDOWN = 45  # Seconds between alerts
+    ALERT_COOLDOWN = 45  # Minimum seconds between digests of one incident
+
+    # Alert aggregation across cameras (see alert_aggregator.py)
+    INCIDENT_WINDOW = 120  # Seconds without detections that close an incident
+    BEST_FRAME_WINDOW_MS = 400  # Delay of an opening alert while its best frame is picked
+    ALERT_RATE_LIMITS = {  # Per channel token buckets
+        'whatsapp': {'rate': 1 / 60, 'capacity': 3},
+        'telegram': {'rate': 1 / 30, 'capacity': 5},
+    }
+
+    # Telegram subscriber bot (see subscriber_service.py): 'in-process' runs it inside
+    # the detector, 'external' reads the store of a separate `python src/bot.py`
+    TELEGRAM_SUBSCRIBERS = os.getenv('TELEGRAM_SUBSCRIBERS', 'in-process')
+    TELEGRAM_WEBHOOK_URL = os.getenv('TELEGRAM_WEBHOOK_URL', '')  # Empty: long polling
+    TELEGRAM_WEBHOOK_PORT = int(os.getenv('TELEGRAM_WEBHOOK_PORT', 8443))
+    TELEGRAM_WEBHOOK_SECRET = os.getenv('TELEGRAM_WEBHOOK_SECRET', '')
+    TELEGRAM_STORE_DIR = PROJECT_ROOT / 'src'  # Directory of the subscriber store (sysdata.bin)
+
+    # Provider API endpoints, overridable to point alerts at local stand-ins (tests/fake_services)
+    TWILIO_API_BASE_URL = os.getenv('TWILIO_API_BASE_URL', '')  # Empty: Twilio's default
+    TELEGRAM_API_BASE_URL = os.getenv('TELEGRAM_API_BASE_URL', '')  # Empty: https://api.telegram.org/bot
+    IMGUR_API_URL = os.getenv('IMGUR_API_URL', 'https://api.imgur.com/3/image')
+    CALLMEBOT_API_URL = os.getenv('CALLMEBOT_API_URL', 'https://api.callmebot.com/whatsapp.php')
+    # GCS goes to an emulator when STORAGE_EMULATOR_HOST is set
+
+    # Outbound notification HTTP traffic
+    HTTP_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+    HTTP_MAX_RETRIES = 2
+    HTTP_POOL_MAXSIZE = 4  # Concurrent connections per host
+
+    # Durable notification outbox
+    OUTBOX_PATH = PROJECT_ROOT / 'outbox.db'
+    OUTBOX_WORKERS = 4
+    OUTBOX_QUEUE_SIZE = 100  # Deliveries held in memory, the rest wait on disk
+    OUTBOX_BACKPRESSURE = os.getenv('OUTBOX_BACKPRESSURE', 'spill')  # spill | block | drop
+    OUTBOX_MAX_ATTEMPTS = 6
+    OUTBOX_RETENTION = 7 * 24 * 3600  # Seconds delivered alerts and their images are kept
+
+    # Content-addressed image uploads (hash -> URL)
+    UPLOAD_CACHE_SIZE = 256
+    UPLOAD_CACHE_TTL = 24 * 3600  # Seconds a public URL is reused
+    SIGNED_URL_EXPIRY = 3600  # Seconds a Twilio temp_media URL stays valid
+
+    # Per-channel alert image profiles (see image_profiles.ImageProfile); the saved
+    # alert image keeps full quality, channels without a profile get it unchanged
+    IMAGE_PROFILES = {
+        'whatsapp': {'max_dim': 1024, 'quality': 85, 'min_quality': 40, 'max_bytes': 150 * 1024},
+        'telegram': {'max_dim': 1280, 'quality': 90, 'min_quality': 50, 'max_bytes': 300 * 1024},
+    }
+
+    # Live-tunable detector thresholds, ROI and cooldown (see runtime_config.py)
+    RUNTIME_CONFIG_FILE = PROJECT_ROOT / 'runtime_config.json'
+
+    # Pre/post-event clip recording
+    CLIPS_DIR = DETECTED_FIRES_DIR / 'clips'
+    CLIP_PRE_SECONDS = float(os.getenv('CLIP_PRE_SECONDS', 5))
+    CLIP_POST_SECONDS = float(os.getenv('CLIP_POST_SECONDS', 5))
+    CLIP_BUFFER_MAX_MB = int(os.getenv('CLIP_BUFFER_MAX_MB', 64))  # Per source
+
+    # Logging (see logging_setup.py): writes happen on a background thread
+    LOG_FILE = PROJECT_ROOT / 'logs' / 'fire_detection.log'
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # text | json (JSON lines with camera id and frame time)
+    LOG_ROTATE = os.getenv('LOG_ROTATE', 'size')  # size | time, rotated files are gzipped
+    LOG_MAX_MB = int(os.getenv('LOG_MAX_MB', 20))
+    LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')
+    LOG_BACKUPS = int(os.getenv('LOG_BACKUPS', 10))
+    LOG_DEBUG_SAMPLE_SECONDS = float(os.getenv('LOG_DEBUG_SAMPLE_SECONDS', 1.0))  # Per call site, 0 logs all
+
+    # Span tracing of pipeline stages (see tracing.py), dumped on SIGUSR1 or GET /api/trace
+    TRACE_ENABLED = os.getenv('TRACE_ENABLED', '1') == '1'
+    TRACE_CAPACITY = int(os.getenv('TRACE_CAPACITY', 100000))  # Spans kept in the ring buffer
+    TRACE_DIR = PROJECT_ROOT / 'logs' / 'traces'
+
+    # Dashboard alert gallery
+    THUMBNAILS_DIR = DETECTED_FIRES_DIR / '.thumbs'
+    THUMBNAIL_SIZE = 320
+    GALLERY_CACHE_MAX_AGE = 365 * 24 * 3600  # Alert images never change
 
     @classmethod
     def validate(cls):
@@ -54,6 +130,7 @@ class Config:
 
         # Create necessary directories
         cls.DETECTED_FIRES_DIR.mkdir(exist_ok=True)
+        cls.CLIPS_DIR.mkdir(exist_ok=True)
 
         if not cls.VIDEO_SOURCE.exists():
             raise FileNotFoundError(
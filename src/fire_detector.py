@@ -3,8 +3,23 @@ import numpy as np
 from ultralytics import YOLO
 import cvzone
 import logging
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    from .tracing import tracer
+except ImportError:  # Running as a script from src/
+    from tracing import tracer
+
+
+@dataclass(frozen=True)
+class DetectorSettings:
+    """Thresholds read once per frame, swapped as a whole on reconfiguration"""
+    iou_threshold: float = 0.2
+    min_confidence: float = 0.5
+    smoke_confidence: float = 0.75
+    roi: Optional[Tuple[float, float, float, float]] = None  # Normalised x1, y1, x2, y2
 
 
 class Detector:
@@ -14,7 +29,8 @@ class Detector:
         target_height: int = 640,
         iou_threshold: float = 0.2,
         min_confidence: float = 0.5,
-        smoke_confidence: float = 0.75
+        smoke_confidence: float = 0.75,
+        roi: Optional[Tuple[float, float, float, float]] = None
         ):
         """
         Initialize the FireDetector with a YOLO model.
@@ -24,16 +40,19 @@ class Detector:
             target_height (int): Target height for frame resizing
             iou_threshold (float): IOU threshold for non-maximum suppression
             min_confidence (float): Minimum confidence threshold for detections
+            smoke_confidence (float): Minimum confidence for smoke to count as a detection
+            roi (tuple): Optional normalised region of interest (x1, y1, x2, y2)
         """
         self.logger = logging.getLogger(__name__)
 
         try:
             self.model = YOLO(str(model_path))
             self.target_height = target_height
-            self.iou_threshold = iou_threshold
-            self.min_confidence = min_confidence
-            self.smoke_confidence = smoke_confidence
+            self.settings = DetectorSettings(
+                iou_threshold, min_confidence, smoke_confidence, roi)
             self.names = self.model.model.names
+            # Boxes of the last processed frame, in processed-frame coordinates
+            self.last_detections = []
 
             # Define colors for different classes
             self.colors = {
@@ -46,6 +65,36 @@ class Detector:
             self.logger.error(f"Failed to initialize fire detector: {e}")
             raise
 
+    @property
+    def iou_threshold(self) -> float:
+        return self.settings.iou_threshold
+
+    @property
+    def min_confidence(self) -> float:
+        return self.settings.min_confidence
+
+    @property
+    def smoke_confidence(self) -> float:
+        return self.settings.smoke_confidence
+
+    @property
+    def roi(self) -> Optional[Tuple[float, float, float, float]]:
+        return self.settings.roi
+
+    def update_settings(self, **changes) -> DetectorSettings:
+        """
+        Atomically replace detection thresholds on a running detector.
+
+        The new settings take effect from the next processed frame; a frame
+        already in flight keeps the settings it started with.
+
+        Returns:
+            DetectorSettings: The settings now in effect
+        """
+        self.settings = replace(self.settings, **changes)
+        self.logger.info(f"Detector settings updated: {self.settings}")
+        return self.settings
+
     def resize_frame(self, frame: np.ndarray) -> np.ndarray:
         """
         Resize frame maintaining aspect ratio.
@@ -144,54 +193,141 @@ class Detector:
         Returns:
             tuple: (processed_frame, detection: str)
         """
+        # Take one consistent snapshot of the thresholds for this frame
+        settings = self.settings
         try:
-            frame = self.resize_frame(frame)
-            results = self.model(
-                frame, iou=self.iou_threshold, conf=self.min_confidence)
+            with tracer.span('detector.resize', 'detector'):
+                frame = self.resize_frame(frame)
+            with tracer.span('detector.inference', 'detector'):
+                results = self.model(
+                    frame, iou=settings.iou_threshold, conf=settings.min_confidence)
             detection = None
-
-            if results and len(results[0].boxes) > 0:
-                boxes = results[0].boxes.xyxy.cpu().numpy().astype(int)
-                class_ids = results[0].boxes.cls.cpu().numpy().astype(int)
-                confidences = results[0].boxes.conf.cpu().numpy()
-
-                # Sort detections by confidence
-                sort_idx = np.argsort(-confidences)  # Descending order
-                boxes = boxes[sort_idx]
-                class_ids = class_ids[sort_idx]
-                confidences = confidences[sort_idx]
-
-                for box, class_id, confidence in zip(boxes, class_ids, confidences):
-                    class_name = self.names[class_id]
-
-                    # Update overall detection status
-                    if detection is None:  # Only update if not already set
-                        if "fire" == class_name.lower() and confidence >= self.min_confidence:
-                            detection = "Fire"
-                        elif "smoke" == class_name.lower() and confidence >= self.smoke_confidence:
-                            detection = "Smoke"
-
-                    self.draw_detection(frame, box, class_name, confidence)
-
-            # Add frame metadata
-            self._add_frame_info(frame, detection)
+            detections = []
+            with tracer.span('detector.draw', 'detector') as draw_span:
+                if results and len(results[0].boxes) > 0:
+                    boxes = results[0].boxes.xyxy.cpu().numpy().astype(int)
+                    class_ids = results[0].boxes.cls.cpu().numpy().astype(int)
+                    confidences = results[0].boxes.conf.cpu().numpy()
+
+                    # Sort detections by confidence
+                    sort_idx = np.argsort(-confidences)  # Descending order
+                    boxes = boxes[sort_idx]
+                    class_ids = class_ids[sort_idx]
+                    confidences = confidences[sort_idx]
+
+                    for box, class_id, confidence in zip(boxes, class_ids, confidences):
+                        class_name = self.names[class_id]
+
+                        if not self._in_roi(frame, box, settings.roi):
+                            continue
+
+                        # Update overall detection status
+                        if detection is None:  # Only update if not already set
+                            if "fire" == class_name.lower() and confidence >= settings.min_confidence:
+                                detection = "Fire"
+                            elif "smoke" == class_name.lower() and confidence >= settings.smoke_confidence:
+                                detection = "Smoke"
+
+                        detections.append({
+                            'class': class_name,
+                            'confidence': float(confidence),
+                            'box': tuple(int(v) for v in box),
+                        })
+                        self.draw_detection(frame, box, class_name, confidence)
+
+                # Replaced as a whole so readers never see a half-built list
+                self.last_detections = detections
+
+                # Add frame metadata
+                self._add_frame_info(frame, detection, settings)
+                draw_span.set(boxes=len(detections))
 
             return frame, detection
 
         except Exception as e:
             self.logger.error(f"Error processing frame: {e}")
+            self.last_detections = []
             return frame, None
 
-    def _add_frame_info(self, frame: np.ndarray, detection: Optional[str]) -> None:
+    def predict_batch(
+        self,
+        frames: Sequence[np.ndarray],
+        min_confidence: Optional[float] = None,
+        batch_size: int = 8
+    ) -> List[List[dict]]:
+        """
+        Raw detections for many frames, without drawing or alert logic.
+
+        Frames go to the model `batch_size` at a time, which amortises the
+        per-call overhead of single-frame inference. The ROI is not applied.
+
+        Args:
+            frames (list): BGR frames of any size
+            min_confidence (float): Confidence floor, defaults to the current setting
+            batch_size (int): Frames per model call
+
+        Returns:
+            list: Per frame, detections with class, class_id, confidence, box
+                (x1, y1, x2, y2 in frame pixels) and xywhn (normalised centre and size)
+        """
+        settings = self.settings
+        conf = settings.min_confidence if min_confidence is None else min_confidence
+        predictions = []
+        for start in range(0, len(frames), batch_size):
+            batch = list(frames[start:start + batch_size])
+            with tracer.span('detector.predict_batch', 'detector', frames=len(batch)):
+                results = self.model(batch, iou=settings.iou_threshold, conf=conf,
+                                     imgsz=self.target_height, verbose=False)
+            for result in results:
+                boxes = result.boxes
+                detections = []
+                for box, xywhn, class_id, confidence in zip(
+                        boxes.xyxy.cpu().numpy().astype(int), boxes.xywhn.cpu().numpy(),
+                        boxes.cls.cpu().numpy().astype(int), boxes.conf.cpu().numpy()):
+                    detections.append({
+                        'class': self.names[class_id],
+                        'class_id': int(class_id),
+                        'confidence': float(confidence),
+                        'box': tuple(int(v) for v in box),
+                        'xywhn': tuple(float(v) for v in xywhn),
+                    })
+                detections.sort(key=lambda d: -d['confidence'])
+                predictions.append(detections)
+        return predictions
+
+    @staticmethod
+    def _in_roi(frame: np.ndarray, box: np.ndarray, roi: Optional[Tuple[float, float, float, float]]) -> bool:
+        """Check whether the centre of a box lies inside the normalised ROI"""
+        if roi is None:
+            return True
+        height, width = frame.shape[:2]
+        center_x = (box[0] + box[2]) / 2 / width
+        center_y = (box[1] + box[3]) / 2 / height
+        return roi[0] <= center_x <= roi[2] and roi[1] <= center_y <= roi[3]
+
+    def _add_frame_info(
+        self,
+        frame: np.ndarray,
+        detection: Optional[str],
+        settings: Optional[DetectorSettings] = None
+    ) -> None:
         """
         Add frame information overlay.
 
         Args:
             frame (np.ndarray): Input frame
             detection (Optional[str]): Current detection status
+            settings (DetectorSettings): Settings the frame was processed with
         """
+        settings = settings or self.settings
         height, width = frame.shape[:2]
 
+        # Outline the region of interest when one is configured
+        if settings.roi is not None:
+            x1, y1, x2, y2 = settings.roi
+            cv2.rectangle(frame, (int(x1 * width), int(y1 * height)),
+                          (int(x2 * width), int(y2 * height)), (0, 255, 255), 1)
+
         # Add semi-transparent overlay at the bottom
         overlay_height = 40
         overlay = frame[height-overlay_height:height, 0:width].copy()
@@ -206,7 +342,7 @@ class Detector:
                     cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
 
         # Add confidence threshold info
-        conf_text = f"Conf: {self.min_confidence:.2f} | IOU: {self.iou_threshold:.2f}"
+        conf_text = f"Conf: {settings.min_confidence:.2f} | IOU: {settings.iou_threshold:.2f}"
         text_size = cv2.getTextSize(
             conf_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
         cv2.putText(frame, conf_text, (width - text_size[0] - 10, height-15),
@@ -0,0 +1,158 @@
+import cv2
+import logging
+import threading
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, Sequence
+
+
+def sharpness(frame: np.ndarray, boxes: Sequence[Sequence[int]] = (), max_side: int = 160) -> float:
+    """
+    Variance of the Laplacian over the detected region, a cheap focus measure.
+
+    The region is subsampled to at most `max_side` pixels so the cost stays
+    well under a millisecond regardless of the frame size.
+    """
+    region = frame
+    if len(boxes):
+        boxes = np.asarray(boxes, dtype=int).reshape(-1, 4)
+        height, width = frame.shape[:2]
+        x1, y1 = max(0, boxes[:, 0].min()), max(0, boxes[:, 1].min())
+        x2, y2 = min(width, boxes[:, 2].max()), min(height, boxes[:, 3].max())
+        if x2 > x1 and y2 > y1:
+            region = frame[y1:y2, x1:x2]
+    # Strided view instead of a resize: no copy, same measure across frames of a source
+    step = -(-max(region.shape[:2]) // max_side)
+    region = region[::step, ::step]
+    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if region.ndim == 3 else region
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+@dataclass
+class _Selection:
+    deadline: float
+    on_ready: Callable[[np.ndarray, float, list], None]
+    frame: np.ndarray
+    confidence: float
+    boxes: list
+    score: float
+    frames: int = 1
+
+
+class BestFrameSelector:
+    # Weights of the normalised score terms
+    CONFIDENCE_WEIGHT = 0.6
+    AREA_WEIGHT = 0.2
+    SHARPNESS_WEIGHT = 0.2
+    SHARPNESS_SCALE = 100.0  # Laplacian variance that scores 0.5
+
+    def __init__(self, window_ms: float = 400, clock: Callable[[], float] = time.monotonic):
+        """
+        Pick the best frame shortly after an alert triggers.
+
+        For `window_ms` after a trigger every frame from the same source is
+        scored on detection confidence, box area and sharpness; only the best
+        frame so far is kept. When the window ends the best frame is handed
+        over, driven by a timer so a stalled source cannot delay the alert.
+
+        Args:
+            window_ms (float): Selection window, the most an alert is delayed
+            clock (callable): Monotonic time source, replaceable in tests
+        """
+        self.logger = logging.getLogger(__name__)
+        self.window = window_ms / 1000
+        self.clock = clock
+        self._pending: Dict[str, _Selection] = {}
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="frame-selector", daemon=True)
+        self._thread.start()
+
+    def score(self, frame: np.ndarray, confidence: float, boxes: Sequence[Sequence[int]]) -> float:
+        """Weighted score in [0, 1] of confidence, box area and sharpness"""
+        height, width = frame.shape[:2]
+        area = sum(max(0, x2 - x1) * max(0, y2 - y1) for x1, y1, x2, y2 in boxes) / (height * width)
+        focus = sharpness(frame, boxes)
+        return (self.CONFIDENCE_WEIGHT * confidence
+                + self.AREA_WEIGHT * min(1.0, area)
+                + self.SHARPNESS_WEIGHT * focus / (focus + self.SHARPNESS_SCALE))
+
+    def begin(self, key: str, frame: np.ndarray, confidence: float, boxes: Sequence[Sequence[int]],
+              on_ready: Callable[[np.ndarray, float, list], None]) -> None:
+        """
+        Start a selection window for a source, seeded with the triggering frame.
+
+        Args:
+            key (str): Source the frames come from
+            frame (np.ndarray): Frame that triggered the alert
+            confidence (float): Its detection confidence
+            boxes (list): Its detection boxes
+            on_ready (callable): Receives (frame, confidence, boxes) of the best frame
+        """
+        if self.window <= 0:
+            on_ready(frame, confidence, list(boxes))
+            return
+        selection = _Selection(self.clock() + self.window, on_ready, frame.copy(), confidence,
+                               list(boxes), self.score(frame, confidence, boxes))
+        with self._cond:
+            previous = self._pending.pop(key, None)
+            self._pending[key] = selection
+            self._cond.notify()
+        if previous:
+            # A new trigger on the same source: do not hold back the older alert
+            self._deliver(previous)
+
+    def offer(self, key: str, frame: np.ndarray, confidence: float, boxes: Sequence[Sequence[int]]) -> None:
+        """Consider a frame; a no-op unless a window is open for this source"""
+        if key not in self._pending:
+            return
+        score = self.score(frame, confidence, boxes)
+        with self._cond:
+            selection = self._pending.get(key)
+            if selection is None or self.clock() >= selection.deadline:
+                return
+            selection.frames += 1
+            if score > selection.score:
+                selection.frame = frame.copy()
+                selection.confidence = confidence
+                selection.boxes = list(boxes)
+                selection.score = score
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    now = self.clock()
+                    due = [key for key, s in self._pending.items() if s.deadline <= now]
+                    if due:
+                        break
+                    timeout = min((s.deadline for s in self._pending.values()), default=now + 1) - now
+                    self._cond.wait(max(0.001, timeout))
+                if self._stopped:
+                    return
+                ready = [self._pending.pop(key) for key in due]
+            for selection in ready:
+                self._deliver(selection)
+
+    def _deliver(self, selection: _Selection) -> None:
+        self.logger.debug(f"Best of {selection.frames} frames selected (score {selection.score:.2f})")
+        try:
+            selection.on_ready(selection.frame, selection.confidence, selection.boxes)
+        except Exception as e:
+            self.logger.error(f"Delivering selected frame failed: {e}")
+
+    def flush(self) -> None:
+        """Hand over all open selections now"""
+        with self._cond:
+            ready = list(self._pending.values())
+            self._pending.clear()
+        for selection in ready:
+            self._deliver(selection)
+
+    def stop(self) -> None:
+        self.flush()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
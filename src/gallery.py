@@ -0,0 +1,153 @@
+import cv2
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ThumbnailGallery:
+    def __init__(
+        self,
+        image_dir: Path,
+        thumb_dir: Path,
+        thumb_size: int = 320,
+        scan_interval: float = 30.0,
+        pattern: str = 'alert_*.jpg'
+        ):
+        """
+        Maintain an on-disk thumbnail cache for alert images.
+
+        Args:
+            image_dir (Path): Directory holding full-size alert images
+            thumb_dir (Path): Directory for generated thumbnails and the index
+            thumb_size (int): Longest side of a thumbnail in pixels
+            scan_interval (float): Seconds between background rescans
+            pattern (str): Glob pattern of images to include
+        """
+        self.logger = logging.getLogger(__name__)
+        self.image_dir = Path(image_dir)
+        self.thumb_dir = Path(thumb_dir)
+        self.thumb_dir.mkdir(parents=True, exist_ok=True)
+        self.thumb_size = thumb_size
+        self.scan_interval = scan_interval
+        self.pattern = pattern
+        self.index_file = self.thumb_dir / 'index.json'
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, dict] = self._load_index()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            if self.index_file.exists():
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Failed to load thumbnail index: {e}")
+        return {}
+
+    def _save_index(self, index: Dict[str, dict]) -> None:
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_file, self.index_file)
+
+    def start(self) -> None:
+        """Start the background thumbnail generator"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="thumbnail-gallery", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def refresh(self) -> None:
+        """Ask the background thread to rescan now (e.g. after a new alert)"""
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.scan()
+            except Exception as e:
+                self.logger.error(f"Thumbnail scan failed: {e}")
+            self._wakeup.wait(self.scan_interval)
+            self._wakeup.clear()
+
+    def scan(self) -> int:
+        """Generate thumbnails for new or modified images, returns how many were built"""
+        with self._lock:
+            index = dict(self._index)
+
+        seen = set()
+        built = 0
+        for entry in os.scandir(self.image_dir):
+            if not entry.is_file() or not Path(entry.name).match(self.pattern):
+                continue
+            seen.add(entry.name)
+            stat = entry.stat()
+            cached = index.get(entry.name)
+            if cached and cached['mtime'] == stat.st_mtime_ns and \
+                    (self.thumb_dir / entry.name).exists():
+                continue
+
+            thumb = self._make_thumbnail(Path(entry.path))
+            if thumb is None:
+                continue
+            index[entry.name] = {
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'width': thumb[0],
+                'height': thumb[1],
+            }
+            built += 1
+
+        removed = set(index) - seen
+        for name in removed:
+            index.pop(name, None)
+            (self.thumb_dir / name).unlink(missing_ok=True)
+
+        if built or removed:
+            self._save_index(index)
+            self.logger.info(f"Thumbnail gallery updated: {built} built, {len(removed)} removed")
+        with self._lock:
+            self._index = index
+        return built
+
+    def _make_thumbnail(self, image_path: Path) -> Optional[tuple]:
+        image = cv2.imread(str(image_path))
+        if image is None:
+            self.logger.warning(f"Unreadable alert image: {image_path.name}")
+            return None
+        height, width = image.shape[:2]
+        scale = self.thumb_size / max(height, width)
+        if scale < 1:
+            image = cv2.resize(image, (int(width * scale), int(height * scale)),
+                               interpolation=cv2.INTER_AREA)
+        cv2.imwrite(str(self.thumb_dir / image_path.name), image,
+                    [cv2.IMWRITE_JPEG_QUALITY, 80])
+        return image.shape[1], image.shape[0]
+
+    def list(self, limit: int = 50, offset: int = 0) -> List[dict]:
+        """Return cached entries, newest first"""
+        with self._lock:
+            items = sorted(self._index.items(),
+                           key=lambda item: item[1]['mtime'], reverse=True)
+        return [dict(meta, name=name) for name, meta in items[offset:offset + limit]]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._index
@@ -0,0 +1,239 @@
+import argparse
+import csv
+import heapq
+import itertools
+import logging
+import os
+import re
+import shutil
+import tempfile
+import cv2
+import numpy as np
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .config import Config
+    from .fire_detector import Detector
+    from .image_hash import NearDuplicateIndex, dhash
+except ImportError:  # Running as a script from src/
+    from config import Config
+    from fire_detector import Detector
+    from image_hash import NearDuplicateIndex, dhash
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def iter_snapshots(directory: Path) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    (name, frame) of every image in a directory, oldest first.
+
+    Only for raw frames: alert snapshots in detected_fires/ are resized and
+    carry the detector's boxes, labels and status bar, which a model trained
+    on them would learn.
+    """
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                yield path.stem, frame
+
+
+def sample_video(path: Path, every: float = 1.0) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    (name, frame) of one frame per `every` seconds of a recorded video.
+
+    Skipped frames are grabbed but not decoded into images, which is most
+    of the cost of reading a video.
+    """
+    path = Path(path)
+    capture = cv2.VideoCapture(str(path))
+    try:
+        step = max(1, round((capture.get(cv2.CAP_PROP_FPS) or 25) * every))
+        for index in itertools.count():
+            if index % step:
+                if not capture.grab():
+                    break
+                continue
+            ok, frame = capture.read()
+            if not ok:
+                break
+            yield f"{path.stem}_f{index:06d}", frame
+    finally:
+        capture.release()
+
+
+@dataclass
+class Candidate:
+    uncertainty: float
+    name: str = field(compare=False)
+    path: Path = field(compare=False)  # Frame spooled to disk while the candidate is kept
+    detections: List[dict] = field(compare=False, default_factory=list)
+
+
+class HardExampleMiner:
+    def __init__(
+        self,
+        detector: Detector,
+        min_confidence: float = 0.1,
+        batch_size: int = 8,
+        hash_distance: int = 3,
+        limit: Optional[int] = 500
+        ):
+        """
+        Run the detector over production frames and keep the ones it is least
+        sure about, as pre-labelled training candidates.
+
+        Near-identical frames (consecutive video frames, repeated alerts of a
+        static scene) are dropped by perceptual hash before inference, so the
+        detector only sees distinct frames. A frame's uncertainty is that of
+        its most ambiguous box: 1 at the class's alert threshold, falling to
+        0 at confidence 0 or 1. Kept frames are spooled to a temporary
+        directory, removed by close(), so memory does not grow with `limit`.
+
+        Args:
+            detector (Detector): Detector providing predict_batch, names and settings
+            min_confidence (float): Confidence floor for boxes, well below the alert thresholds
+            batch_size (int): Frames per model call
+            hash_distance (int): dhash bits within which frames count as duplicates
+            limit (int): Candidates kept, most uncertain first; None keeps all
+        """
+        self.logger = logging.getLogger(__name__)
+        self.detector = detector
+        self.min_confidence = min_confidence
+        self.batch_size = batch_size
+        self.hashes = NearDuplicateIndex(hash_distance)
+        self.limit = limit
+        self._candidates: List[Tuple[float, int, Candidate]] = []
+        self._order = itertools.count()
+        self._spool = tempfile.TemporaryDirectory(prefix='hard_mining-')
+        self.stats = {'frames': 0, 'duplicates': 0, 'inferred': 0, 'with_detections': 0}
+
+    def threshold(self, class_name: str) -> float:
+        """Confidence at which the live detector alerts for a class"""
+        settings = self.detector.settings
+        return settings.smoke_confidence if class_name.lower() == 'smoke' else settings.min_confidence
+
+    def uncertainty(self, detections: List[dict]) -> float:
+        """Uncertainty of a frame from its detections, 0 if there are none"""
+        score = 0.0
+        for detection in detections:
+            threshold = self.threshold(detection['class'])
+            distance = abs(detection['confidence'] - threshold) / max(threshold, 1 - threshold)
+            score = max(score, 1 - distance)
+        return score
+
+    def add(self, frames: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """Dedupe, batch and score frames from one or more sources"""
+        batch = []
+        for name, frame in frames:
+            self.stats['frames'] += 1
+            if self.hashes.add(name, dhash(frame)) is not None:
+                self.stats['duplicates'] += 1
+                continue
+            batch.append((name, frame))
+            if len(batch) == self.batch_size:
+                self._score(batch)
+                batch = []
+        if batch:
+            self._score(batch)
+
+    def _score(self, batch: List[Tuple[str, np.ndarray]]) -> None:
+        predictions = self.detector.predict_batch(
+            [frame for _, frame in batch], min_confidence=self.min_confidence, batch_size=self.batch_size)
+        self.stats['inferred'] += len(batch)
+        for (name, frame), detections in zip(batch, predictions):
+            if not detections:
+                continue
+            self.stats['with_detections'] += 1
+            uncertainty, order = self.uncertainty(detections), next(self._order)
+            # Bounded min-heap: the least uncertain candidate is evicted first
+            full = self.limit is not None and len(self._candidates) >= self.limit
+            if full and uncertainty <= self._candidates[0][0]:
+                continue
+            path = Path(self._spool.name) / f"{order}.jpg"
+            cv2.imwrite(str(path), frame)
+            entry = (uncertainty, order, Candidate(uncertainty, name, path, detections))
+            if full:
+                heapq.heapreplace(self._candidates, entry)[2].path.unlink()
+            else:
+                heapq.heappush(self._candidates, entry)
+
+    def candidates(self) -> List[Candidate]:
+        """Kept candidates, most uncertain first"""
+        return [entry[2] for entry in sorted(self._candidates, key=lambda e: (-e[0], e[1]))]
+
+    def export(self, output_dir: Path, split: str = 'train') -> List[Path]:
+        """
+        Write candidates as a YOLO split (`<split>/images`, `<split>/labels`)
+        that clean_labels.py accepts, plus `candidates.csv` listing them by
+        rank. File names start with the rank so review goes in priority order.
+
+        Returns:
+            list: Written label files, most uncertain first
+        """
+        images_dir = Path(output_dir) / split / 'images'
+        labels_dir = Path(output_dir) / split / 'labels'
+        images_dir.mkdir(parents=True, exist_ok=True)
+        labels_dir.mkdir(parents=True, exist_ok=True)
+
+        written = []
+        with open(Path(output_dir) / 'candidates.csv', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['rank', 'file', 'source', 'uncertainty', 'detections'])
+            for rank, candidate in enumerate(self.candidates()):
+                stem = f"{rank:05d}_{re.sub(r'[^A-Za-z0-9_.-]', '_', candidate.name)}"
+                shutil.copyfile(candidate.path, images_dir / f"{stem}.jpg")
+                label = labels_dir / f"{stem}.txt"
+                label.write_text("".join(
+                    f"{d['class_id']} " + " ".join(f"{v:.6f}" for v in d['xywhn']) + "\n"
+                    for d in candidate.detections))
+                writer.writerow([rank, stem, candidate.name, f"{candidate.uncertainty:.4f}",
+                                 " ".join(f"{d['class']}:{d['confidence']:.2f}" for d in candidate.detections)])
+                written.append(label)
+
+        self.logger.info(f"Exported {len(written)} candidates to {output_dir} "
+                         f"({self.stats['frames']} frames, {self.stats['duplicates']} near-duplicates skipped, "
+                         f"{self.stats['inferred']} inferred)")
+        return written
+
+    def close(self) -> None:
+        """Remove the spooled frames"""
+        self._spool.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mine uncertain frames for retraining')
+    parser.add_argument('--model', default=str(Config.MODEL_PATH))
+    parser.add_argument('--snapshots', default='',
+                        help='Directory of raw (unannotated) frames to mine. Not the alert '
+                             'snapshots in detected_fires/: those are resized and have the '
+                             'detection boxes, labels and status bar drawn in')
+    parser.add_argument('--videos', nargs='*', default=[], help='Recorded videos to sample')
+    parser.add_argument('--every', type=float, default=1.0, help='Seconds between sampled video frames')
+    parser.add_argument('--output', default=str(Config.PROJECT_ROOT / 'data' / 'hard_examples'))
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--min-confidence', type=float, default=0.1)
+    args = parser.parse_args()
+    if not args.snapshots and not args.videos:
+        parser.error('nothing to mine: pass --videos and/or --snapshots')
+    if args.snapshots and not os.path.isdir(args.snapshots):
+        parser.error(f'--snapshots is not a directory: {args.snapshots}')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    miner = HardExampleMiner(Detector(Path(args.model)), min_confidence=args.min_confidence,
+                             batch_size=args.batch_size, limit=args.limit)
+    try:
+        if args.snapshots:
+            miner.add(iter_snapshots(args.snapshots))
+        for video in args.videos:
+            miner.add(sample_video(video, args.every))
+        miner.export(args.output)
+    finally:
+        miner.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+def _never_sent(error: Exception) -> bool:
+    """Whether a failed attempt died while connecting, before the server saw the request"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+        return False
+    reason = getattr(error.args[0], 'reason', error.args[0])  # urllib3 MaxRetryError
+    return isinstance(reason, NewConnectionError)
+
+
+class _HostMetrics:
+    """Request counters and a window of recent latencies for one host"""
+
+    def __init__(self, window: int):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.status = {}
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'status': dict(self.status),
+            'latency_ms': {
+                'avg': round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None,
+                'p50': percentile(0.50),
+                'p95': percentile(0.95),
+                'max': round(latencies[-1] * 1000, 1) if latencies else None,
+            },
+        }
+
+
+class HttpClient:
+    def __init__(
+        self,
+        timeout: tuple = (3.05, 10),
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        pool_connections: int = 8,
+        pool_maxsize: int = 4,
+        retry_statuses: tuple = (429, 502, 503, 504),
+        latency_window: int = 512
+        ):
+        """
+        Shared HTTP client for outbound notification traffic.
+
+        One requests.Session is shared by all threads, so connections to the
+        same host are pooled and kept alive instead of paying a TCP+TLS
+        handshake per alert.
+
+        Args:
+            timeout (tuple): Default (connect, read) timeout in seconds
+            max_retries (int): Retries after the first attempt
+            backoff_base (float): Base delay of the exponential backoff
+            backoff_max (float): Upper bound of a single backoff delay
+            pool_connections (int): Number of hosts whose pools are cached
+            pool_maxsize (int): Concurrent connections allowed per host
+            retry_statuses (tuple): Status codes that are retried
+            latency_window (int): Number of latency samples kept per host
+        """
+        self.logger = logging.getLogger(__name__)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.latency_window = latency_window
+
+        self.session = requests.Session()
+        # pool_block caps concurrent connections per host instead of opening extras
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._metrics: Dict[str, _HostMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _host_metrics(self, url: str) -> _HostMetrics:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._metrics:
+                self._metrics[host] = _HostMetrics(self.latency_window)
+            return self._metrics[host]
+
+    def record(self, url: str, elapsed: float, status: Optional[int] = None,
+               error: Optional[Exception] = None, retry: bool = False) -> None:
+        """Record the outcome of one attempt against a host"""
+        metrics = self._host_metrics(url)
+        with self._lock:
+            metrics.requests += 1
+            metrics.latencies.append(elapsed)
+            if retry:
+                metrics.retries += 1
+            if status is not None:
+                metrics.status[status] = metrics.status.get(status, 0) + 1
+            if error is not None or (status is not None and status >= 500):
+                metrics.errors += 1
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when given"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def request(self, method: str, url: str, retries: Optional[int] = None,
+                idempotent: Optional[bool] = None, retry_status: Optional[bool] = None,
+                **kwargs) -> requests.Response:
+        """
+        Send a request with pooling, timeouts and retries.
+
+        Idempotent requests are retried after any connection failure or
+        timeout and on retryable status codes. Others may already have been
+        acted on, so they are only retried when the connection could not be
+        established, or on a 429 that says when to come back (Retry-After).
+
+        Args:
+            idempotent (bool): Whether resending is safe, by default decided by
+                the method; pass False for GETs with side effects
+            retry_status (bool): Retry retryable status codes even if not
+                idempotent, defaults to `idempotent`
+
+        Returns:
+            requests.Response: The final response (which may still be an error status)
+        """
+        method = method.upper()
+        retries = self.max_retries if retries is None else retries
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        if retry_status is None:
+            retry_status = idempotent
+        kwargs.setdefault('timeout', self.timeout)
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.record(url, time.perf_counter() - start, error=e, retry=attempt > 0)
+                retryable = idempotent or _never_sent(e)
+                if attempt >= retries or not retryable:
+                    raise
+                delay = self._backoff(attempt)
+                self.logger.warning(
+                    f"{method} {urlsplit(url).netloc} failed ({type(e).__name__}), "
+                    f"retry {attempt + 1}/{retries} in {delay:.2f}s")
+            else:
+                self.record(url, time.perf_counter() - start,
+                            status=response.status_code, retry=attempt > 0)
+                retryable = response.status_code in self.retry_statuses and (
+                    retry_status or (response.status_code == 429 and 'Retry-After' in response.headers))
+                if not retryable or attempt >= retries:
+                    return response
+                delay = self._backoff(attempt, response)
+                self.logger.warning(
+                    f"{method} {urlsplit(url).netloc} returned HTTP {response.status_code}, "
+                    f"retry {attempt + 1}/{retries} in {delay:.2f}s")
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def metrics(self) -> dict:
+        """Per-host request counts, errors, retries and latency percentiles"""
+        with self._lock:
+            return {host: m.snapshot() for host, m in self._metrics.items()}
+
+    def close(self) -> None:
+        self.session.close()
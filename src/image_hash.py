@@ -0,0 +1,76 @@
+import cv2
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Tuple
+
+HASH_BITS = 64
+BANDS = 4  # Hashes within BANDS - 1 bits share at least one band exactly
+
+
+def dhash(image: np.ndarray, size: int = 8) -> int:
+    """
+    Difference hash: the sign of horizontal gradients on a (size+1) x size
+    thumbnail, as a size*size bit integer.
+
+    Robust to rescaling, recompression and small brightness changes, so
+    near-identical frames hash within a few bits of each other.
+
+    Args:
+        image (np.ndarray): BGR or grayscale image
+        size (int): Hash side, 8 gives a 64-bit hash
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    thumb = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (thumb[:, 1:] > thumb[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return (a ^ b).bit_count()
+
+
+class NearDuplicateIndex:
+    def __init__(self, max_distance: int = BANDS - 1):
+        """
+        Finds earlier hashes within `max_distance` bits of a new one.
+
+        Hashes are bucketed by each of their BANDS 16-bit bands. Two hashes
+        differing in fewer than BANDS bits must agree on a whole band, so
+        only bucket mates are compared instead of every hash seen so far.
+
+        Args:
+            max_distance (int): Largest Hamming distance counted as a duplicate, below BANDS
+        """
+        if not 0 <= max_distance < BANDS:
+            raise ValueError(f"max_distance must be between 0 and {BANDS - 1}")
+        self.max_distance = max_distance
+        self._band_bits = HASH_BITS // BANDS
+        self._buckets: List[Dict[int, List[Tuple[int, Hashable]]]] = [{} for _ in range(BANDS)]
+
+    def _bands(self, value: int):
+        mask = (1 << self._band_bits) - 1
+        for band in range(BANDS):
+            yield band, (value >> (band * self._band_bits)) & mask
+
+    def find(self, value: int) -> Optional[Hashable]:
+        """Key of the closest earlier hash within max_distance, None if there is none"""
+        best, best_distance = None, self.max_distance + 1
+        for band, part in self._bands(value):
+            for other, key in self._buckets[band].get(part, ()):
+                distance = hamming(value, other)
+                if distance < best_distance:
+                    best, best_distance = key, distance
+        return best
+
+    def add(self, key: Hashable, value: int) -> Optional[Hashable]:
+        """
+        Index a hash unless it duplicates an earlier one.
+
+        Returns:
+            The key of the earlier near-duplicate, or None if the hash was added
+        """
+        duplicate = self.find(value)
+        if duplicate is None:
+            for band, part in self._bands(value):
+                self._buckets[band].setdefault(part, []).append((value, key))
+        return duplicate
@@ -0,0 +1,161 @@
+import cv2
+import logging
+import threading
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """How an alert image is prepared for one channel"""
+    max_dim: Optional[int] = None  # Longest side in pixels, None keeps the frame size
+    quality: int = 85  # Starting (and highest) JPEG quality
+    min_quality: int = 40  # Lowest quality tried before downscaling further
+    max_bytes: Optional[int] = None  # Target upper bound of the encoded size
+    crop_to_boxes: bool = False  # Crop around the detected boxes
+    crop_margin: float = 0.5  # Margin around the boxes, relative to their size
+
+
+@dataclass(frozen=True)
+class OptimisedImage:
+    data: bytes
+    width: int
+    height: int
+    quality: int
+    encode_seconds: float
+
+
+def _encode(image: np.ndarray, quality: int) -> bytes:
+    ret, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ret:
+        raise ValueError("Failed to encode alert image")
+    return buffer.tobytes()
+
+
+def _resize(image: np.ndarray, max_dim: int) -> np.ndarray:
+    height, width = image.shape[:2]
+    scale = max_dim / max(height, width)
+    if scale >= 1:
+        return image
+    return cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                      interpolation=cv2.INTER_AREA)
+
+
+def crop_to_boxes(image: np.ndarray, boxes: Iterable[Sequence[int]], margin: float = 0.5) -> np.ndarray:
+    """Crop to the union of the boxes plus a margin, keeping the frame if there are none"""
+    boxes = np.asarray(list(boxes), dtype=float).reshape(-1, 4)
+    if not len(boxes):
+        return image
+    height, width = image.shape[:2]
+    x1, y1 = boxes[:, 0].min(), boxes[:, 1].min()
+    x2, y2 = boxes[:, 2].max(), boxes[:, 3].max()
+    pad_x, pad_y = (x2 - x1) * margin, (y2 - y1) * margin
+    x1, y1 = int(max(0, x1 - pad_x)), int(max(0, y1 - pad_y))
+    x2, y2 = int(min(width, x2 + pad_x)), int(min(height, y2 + pad_y))
+    if x2 <= x1 or y2 <= y1:
+        return image
+    return image[y1:y2, x1:x2]
+
+
+def optimise(image: np.ndarray, profile: ImageProfile, boxes: Iterable[Sequence[int]] = ()) -> OptimisedImage:
+    """
+    Encode an image for a channel profile.
+
+    The highest quality in [min_quality, quality] that fits max_bytes is found
+    by binary search (about log2(45) ≈ 6 encodes). If even min_quality is too
+    large the image is downscaled and searched again.
+
+    Args:
+        image (np.ndarray): Decoded BGR frame
+        profile (ImageProfile): Channel profile
+        boxes (iterable): Detection boxes [x1, y1, x2, y2] in image coordinates
+
+    Returns:
+        OptimisedImage: Encoded bytes and how they were produced
+    """
+    start = time.perf_counter()
+    if profile.crop_to_boxes:
+        image = crop_to_boxes(image, boxes, profile.crop_margin)
+    if profile.max_dim:
+        image = _resize(image, profile.max_dim)
+
+    while True:
+        best_quality, data = profile.quality, _encode(image, profile.quality)
+        if profile.max_bytes is None or len(data) <= profile.max_bytes:
+            break
+
+        low, high = profile.min_quality, profile.quality - 1
+        best_quality, data = None, None
+        while low <= high:
+            mid = (low + high) // 2
+            candidate = _encode(image, mid)
+            if len(candidate) <= profile.max_bytes:
+                best_quality, data = mid, candidate
+                low = mid + 1
+            else:
+                high = mid - 1
+        if data is not None:
+            break
+
+        height, width = image.shape[:2]
+        if max(height, width) <= 64:
+            # Cannot meet the target; send the smallest encode we have
+            best_quality, data = profile.min_quality, _encode(image, profile.min_quality)
+            break
+        image = _resize(image, int(max(height, width) * 0.75))
+
+    return OptimisedImage(data, image.shape[1], image.shape[0], best_quality,
+                          time.perf_counter() - start)
+
+
+class ImageStats:
+    def __init__(self):
+        """
+        Per-channel totals of bytes saved by image profiles.
+
+        Transfer time saved is estimated from the throughput observed on
+        that channel's own uploads.
+        """
+        self._lock = threading.Lock()
+        self._channels: Dict[str, dict] = {}
+
+    def _channel(self, channel: str) -> dict:
+        return self._channels.setdefault(channel, {
+            'images': 0, 'original_bytes': 0, 'sent_bytes': 0, 'encode_seconds': 0.0,
+            'upload_bytes': 0, 'upload_seconds': 0.0})
+
+    def record(self, channel: str, original_bytes: int, sent_bytes: int, encode_seconds: float) -> None:
+        with self._lock:
+            stats = self._channel(channel)
+            stats['images'] += 1
+            stats['original_bytes'] += original_bytes
+            stats['sent_bytes'] += sent_bytes
+            stats['encode_seconds'] += encode_seconds
+
+    def record_upload(self, channel: str, size: int, seconds: float) -> None:
+        with self._lock:
+            stats = self._channel(channel)
+            stats['upload_bytes'] += size
+            stats['upload_seconds'] += seconds
+
+    def report(self) -> dict:
+        report = {}
+        with self._lock:
+            for channel, stats in self._channels.items():
+                saved = stats['original_bytes'] - stats['sent_bytes']
+                throughput = stats['upload_bytes'] / stats['upload_seconds'] \
+                    if stats['upload_seconds'] else None
+                report[channel] = {
+                    'images': stats['images'],
+                    'original_bytes': stats['original_bytes'],
+                    'sent_bytes': stats['sent_bytes'],
+                    'bytes_saved': saved,
+                    'encode_seconds': round(stats['encode_seconds'], 3),
+                    'throughput_bps': round(throughput) if throughput else None,
+                    # Net of the time spent recompressing
+                    'seconds_saved': round(saved / throughput - stats['encode_seconds'], 3)
+                    if throughput else None,
+                }
+        return report
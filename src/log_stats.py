@@ -0,0 +1,258 @@
+import argparse
+import gzip
+import json
+import mmap
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .config import Config
+except ImportError:  # Running as a script from src/
+    from config import Config
+
+EVENTS = ('alert', 'detection', 'failure', 'startup')
+BUCKETS = {'minute': 16, 'hour': 13, 'day': 10}  # Length of the 'YYYY-MM-DD HH:MM' prefix kept
+CHUNK_SIZE = 16 * 1024 * 1024  # Decompressed bytes scanned at a time for gzip files
+
+# Failures are attributed to the channel named before the message's first colon
+# ("Telegram alert failed: ..."), else to the logger
+CHANNELS = re.compile(rb'telegram|whatsapp|twilio|imgur|gcs|callmebot|socket', re.I)
+
+# Only the line prefix differs between formats. Lines without an event do not
+# match at all, and matches capture only what is counted, so findall + Counter
+# aggregate in C and Python only sees the handful of distinct keys.
+# Alerts are "<class> <kind> alert queued (...)" from main.py and the dashboard;
+# older dashboards logged "<class> <kind> alert (...)", the legacy loop "Queueing alert".
+_EVENTS = (
+    rb'(?:(?P<fail>ERROR|CRITICAL){sep_fail}(?P<err>[^:\n"]{0,48})'
+    rb'|(?:WARNING|INFO){sep}(?:'
+    rb'(?P<start>\xf0\x9f\x9a\x80 Starting|Starting application)'
+    rb'|Detection status changed(?: to)?: (?!None\b)(?P<det>\w+)'
+    rb'|[^\n]*?(?P<alert>Fire|Smoke)\b[^\n]*?(?:alert queued|Queueing alert|alert \()))'
+)
+_TIME = {  # Time part of the bucket, the date is always captured
+    'minute': rb'(?P<hm>\d\d:\d\d):\d\d',
+    'hour': rb'(?P<hm>\d\d):\d\d:\d\d',
+    'day': rb'(?P<hm>)\d\d:\d\d:\d\d',
+}
+_TEXT = (rb'^(?P<day>\d{4}-\d\d-\d\d) {time} - (?P<logger>\S+) - '
+         + _EVENTS.replace(b'{sep_fail}', b' - ').replace(b'{sep}', b' - '))
+_JSON = (rb'^\{"ts": "(?P<day>\d{4}-\d\d-\d\d)T{time}[^"]*", "level": "'
+         + _EVENTS.replace(b'{sep_fail}', b'", "logger": "(?P<logger>[^"]*)", "msg": "')
+                  .replace(b'{sep}', b'", "logger": "[^"]*", "msg": "'))
+_FIELDS = ('day', 'hm', 'logger', 'fail', 'err', 'start', 'det', 'alert')
+
+
+@lru_cache(maxsize=None)
+def event_pattern(log_format: str, bucket: str) -> re.Pattern:
+    """Compiled event pattern for a log format ('text' or 'json') and bucket size"""
+    template = _JSON if log_format == 'json' else _TEXT
+    return re.compile(template.replace(b'{time}', _TIME[bucket]), re.M)
+
+
+def log_files(log_file: Path) -> List[Path]:
+    """Rotated files of a log, compressed or not, then the active one; oldest first"""
+    log_file = Path(log_file)
+
+    def age(path: Path):
+        suffix = path.name[len(log_file.name) + 1:].removesuffix('.gz')
+        # Size rotation numbers backups from the newest (1), time rotation dates them
+        return (-int(suffix), '') if suffix.isdigit() else (0, suffix)
+
+    rotated = sorted(log_file.parent.glob(log_file.name + '.*'), key=age)
+    return rotated + ([log_file] if log_file.exists() else [])
+
+
+def _format(path: Path) -> str:
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rb') as f:
+        return 'json' if f.read(1) == b'{' else 'text'
+
+
+def work_units(path: Path) -> List[Tuple[Path, int, int]]:
+    """
+    (path, start, end) byte ranges of about CHUNK_SIZE, each ending on a line
+    boundary, that can be scanned independently. A gzip file is one unit.
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    if path.suffix == '.gz' or size == 0:
+        return [(path, 0, size)]
+    units = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = 0
+        while start < size:
+            end = mapped.find(b'\n', min(start + CHUNK_SIZE, size) - 1) + 1 or size
+            units.append((path, start, end))
+            start = end
+    return units
+
+
+def _chunks(path: Path, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """
+    (buffer, pos, endpos) pieces of a unit that end on line boundaries.
+
+    Plain files are memory-mapped and scanned in place; gzip files are
+    decompressed CHUNK_SIZE bytes at a time, so memory stays constant.
+    """
+    if path.suffix == '.gz':
+        with gzip.open(path, 'rb') as f:
+            rest = b''
+            while True:
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    break
+                data = rest + data
+                cut = data.rfind(b'\n') + 1
+                rest = data[cut:]
+                yield data, 0, cut
+            if rest:
+                yield rest, 0, len(rest)
+        return
+    if end > start:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped, start, end
+
+
+def count_events(unit: Tuple[Path, int, int], bucket: str = 'hour') -> Tuple[Counter, int]:
+    """
+    Event counts of one work unit.
+
+    Returns:
+        tuple: Counter of (event, bucket, key) and the bytes scanned
+    """
+    path, start, end = unit
+    pattern = event_pattern(_format(path), bucket)
+    order = [pattern.groupindex[name] - 1 for name in _FIELDS]
+    counts, scanned = Counter(), 0
+    for buffer, pos, endpos in _chunks(path, start, end):
+        scanned += endpos - pos
+        for groups, count in Counter(pattern.findall(buffer, pos, endpos)).items():
+            day, hm, logger, fail, err, _, det, alert = (groups[i] for i in order)
+            key_bucket = (day + b' ' + hm).decode() if hm else day.decode()
+            if fail:
+                channel = CHANNELS.search(err)
+                key = channel[0].lower() if channel else logger.rsplit(b'.', 1)[-1]
+                counts['failure', key_bucket, key.decode()] += count
+            elif det:
+                counts['detection', key_bucket, det.decode()] += count
+            elif alert:
+                counts['alert', key_bucket, alert.decode()] += count
+            else:
+                counts['startup', key_bucket, 'start'] += count
+    return counts, scanned
+
+
+class LogStats:
+    def __init__(self, bucket: str = 'hour', since: Optional[str] = None, until: Optional[str] = None):
+        """
+        Event counts per time bucket from fire detection logs.
+
+        Files are scanned with one precompiled pattern that only matches
+        lines carrying an event, so uninteresting lines never reach Python.
+        Plain files are memory-mapped and split into line-aligned ranges,
+        gzip files streamed in chunks; ranges can be spread over processes.
+
+        Args:
+            bucket (str): minute, hour or day
+            since (str): First bucket counted, e.g. '2025-05-01' or '2025-05-01 08'
+            until (str): Last bucket counted
+        """
+        self.bucket = bucket
+        self.width = BUCKETS[bucket]
+        self.since = since
+        self.until = until
+        self.counts: Counter = Counter()  # (event, bucket, key) -> count
+        self.files = 0
+        self.bytes = 0
+
+    def _in_range(self, bucket: str) -> bool:
+        if self.since and bucket < self.since[:self.width]:
+            return False
+        return not (self.until and bucket > self.until[:self.width])
+
+    def add_files(self, paths: Iterable[Path], workers: int = 1) -> 'LogStats':
+        """
+        Count the events of log files: text or JSON lines, plain or gzipped.
+
+        Args:
+            paths (list): Log files
+            workers (int): Processes scanning ranges in parallel, 1 scans in this process
+        """
+        paths = [Path(p) for p in paths]
+        units = [unit for path in paths for unit in work_units(path)]
+        count = partial(count_events, bucket=self.bucket)
+        if workers > 1 and len(units) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(count, units))
+        else:
+            results = map(count, units)
+        for counts, scanned in results:
+            self.counts.update({k: n for k, n in counts.items() if self._in_range(k[1])})
+            self.bytes += scanned
+        self.files += len(paths)
+        return self
+
+    def table(self, event: str) -> Dict[str, Dict[str, int]]:
+        """bucket -> key -> count for one event, buckets in time order"""
+        rows: Dict[str, Dict[str, int]] = {}
+        for (name, bucket, key), count in sorted(self.counts.items()):
+            if name == event:
+                rows.setdefault(bucket, {})[key] = count
+        return rows
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        """event -> key -> count over all buckets"""
+        totals: Dict[str, Dict[str, int]] = {}
+        for (event, _, key), count in self.counts.items():
+            totals.setdefault(event, {})
+            totals[event][key] = totals[event].get(key, 0) + count
+        return totals
+
+
+def format_table(event: str, rows: Dict[str, Dict[str, int]]) -> str:
+    keys = sorted({key for row in rows.values() for key in row})
+    if not keys:
+        return f"{event}: no events"
+    first = max([len(event)] + [len(bucket) for bucket in rows])
+    widths = [max(len(key), 5) for key in keys]
+    lines = [f"{event:<{first}}  " + "  ".join(f"{k:>{w}}" for k, w in zip(keys, widths)) + "  total"]
+    for bucket, row in rows.items():
+        lines.append(f"{bucket:<{first}}  " + "  ".join(f"{row.get(k, 0):>{w}}" for k, w in zip(keys, widths))
+                     + f"  {sum(row.values()):>5}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Alert, detection, failure and startup counts per time bucket from the logs')
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='Log files (plain, .gz, text or JSON lines); default: the log and its rotations')
+    parser.add_argument('--bucket', choices=BUCKETS, default='hour')
+    parser.add_argument('--since', help="First bucket, e.g. '2025-05-01'")
+    parser.add_argument('--until', help="Last bucket, e.g. '2025-05-07 23'")
+    parser.add_argument('--event', choices=EVENTS, action='append', help='Only these events (repeatable)')
+    parser.add_argument('--json', action='store_true', help='Print tables as JSON')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Scanning processes')
+    args = parser.parse_args(argv)
+
+    stats = LogStats(args.bucket, args.since, args.until).add_files(
+        args.paths or log_files(Config.LOG_FILE), workers=args.workers)
+    events = args.event or EVENTS
+    if args.json:
+        json.dump({event: stats.table(event) for event in events}, sys.stdout, indent=2)
+        print()
+        return
+    for event in events:
+        print(format_table(event, stats.table(event)), end="\n\n")
+    print(f"{stats.files} files, {stats.bytes / 1e6:.1f} MB scanned")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import atexit
+import contextvars
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_context: contextvars.ContextVar = contextvars.ContextVar('log_context', default={})
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def set_log_context(**fields) -> None:
+    """
+    Attach fields (e.g. camera_id, frame_ts) to every record logged from the
+    current thread or task until they are replaced; None removes a field.
+    """
+    context = dict(_context.get())
+    for key, value in fields.items():
+        if value is None:
+            context.pop(key, None)
+        else:
+            context[key] = value
+    _context.set(context)
+
+
+def log_detection_change(logger: logging.Logger, detection: Optional[str]) -> None:
+    """Log a new detection status in the form log_stats counts; None when it clears"""
+    logger.info(f"Detection status changed: {detection or 'None'}")
+
+
+class ContextFilter(logging.Filter):
+    """Copies the log context onto records in the logging thread, before they are queued"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _context.get()
+        record.context = context
+        for key, value in context.items():
+            setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, interval: float = 1.0, level: int = logging.DEBUG, clock=time.monotonic):
+        """
+        Passes at most one record per call site and interval at or below `level`.
+
+        Per-frame debug logging stays on at a bounded rate; the next record
+        that passes says how many were dropped in between.
+
+        Args:
+            interval (float): Seconds between records of one call site, 0 disables sampling
+            level (int): Records above this level always pass
+            clock (callable): Monotonic time source, replaceable in tests
+        """
+        super().__init__()
+        self.interval = interval
+        self.level = level
+        self.clock = clock
+        self._sites: Dict[tuple, list] = {}  # (file, line) -> [next allowed time, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level or self.interval <= 0:
+            return True
+        now = self.clock()
+        with self._lock:
+            site = self._sites.setdefault((record.pathname, record.lineno), [0.0, 0])
+            if now < site[0]:
+                site[1] += 1
+                return False
+            dropped, site[0], site[1] = site[1], now + self.interval, 0
+        if dropped:
+            record.msg = f"{record.msg} (+{dropped} similar suppressed)"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, thread and log context"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        entry.update(getattr(record, 'context', {}))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues without ever blocking; records that find the queue full are counted and dropped"""
+
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _gzip_namer(name: str) -> str:
+    return name + '.gz'
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compress the closed log file into its backup name"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb', compresslevel=6) as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def rotating_file_handler(
+    path: Path,
+    rotate: str = 'size',
+    max_bytes: int = 20 * 1024 * 1024,
+    when: str = 'midnight',
+    backups: int = 10,
+    compress: bool = True
+    ) -> logging.Handler:
+    """
+    File handler rotating by size or time, gzip-compressing rotated files.
+
+    Args:
+        path (Path): Active log file
+        rotate (str): 'size' or 'time'
+        max_bytes (int): Size that triggers a rollover in 'size' mode
+        when (str): TimedRotatingFileHandler interval in 'time' mode
+        backups (int): Rotated files kept
+        compress (bool): Gzip rotated files (`<name>.1.gz`, `<name>.2024-05-01.gz`)
+    """
+    if rotate == 'time':
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=when, backupCount=backups, encoding='utf-8', delay=True)
+    elif rotate == 'size':
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True)
+    else:
+        raise ValueError(f"Unknown log rotation: {rotate}")
+    if compress:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+def configure_logging(
+    log_file: Path,
+    level: int = logging.INFO,
+    json_lines: bool = False,
+    rotate: str = 'size',
+    max_bytes: int = 20 * 1024 * 1024,
+    when: str = 'midnight',
+    backups: int = 10,
+    debug_sample_interval: float = 1.0,
+    console: bool = True,
+    queue_size: int = 10000
+    ) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue drained by a background listener.
+
+    Logging calls only format the message and enqueue it; file writes,
+    rotation, compression and console output happen on the listener thread.
+    When the queue is full records are dropped rather than blocking the
+    caller. Calling it again replaces the previous setup.
+
+    Args:
+        log_file (Path): Active log file, rotated files are kept next to it
+        level (int): Root logger level
+        json_lines (bool): Write JSON lines instead of the text format
+        rotate (str): 'size' or 'time' based rotation
+        max_bytes (int): Rollover size in 'size' mode
+        when (str): Rollover interval in 'time' mode
+        backups (int): Rotated files kept
+        debug_sample_interval (float): Seconds between DEBUG records of one call site, 0 logs all
+        console (bool): Also log to stderr
+        queue_size (int): Records buffered before new ones are dropped
+
+    Returns:
+        QueueListener: The running listener, stopped at exit
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+
+    file_handler = rotating_file_handler(log_file, rotate, max_bytes, when, backups)
+    file_handler.setFormatter(JsonFormatter() if json_lines else logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console_handler)
+
+    records = queue.Queue(queue_size)
+    _queue_handler = DroppingQueueHandler(records)
+    _queue_handler.addFilter(SamplingFilter(debug_sample_interval))
+    _queue_handler.addFilter(ContextFilter())
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    return _listener
+
+
+def add_queued_handler(handler: logging.Handler) -> None:
+    """Run a handler on the listener thread instead of the logging thread"""
+    if _listener is None:
+        logging.getLogger().addHandler(handler)
+        return
+    _listener.handlers = (*_listener.handlers, handler)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and detach the queue handler"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()  # Drains the queue first
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
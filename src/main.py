@@ -3,10 +3,17 @@ import logging
 import sys
 import os
 import argparse
+from dataclasses import replace
 from pathlib import Path
 from config import Config, setup_logging
+from logging_setup import log_detection_change, set_log_context
+from tracing import tracer
 from fire_detector import Detector
 from notification_service import NotificationService
+from clip_recorder import ClipRecorder
+from runtime_config import RuntimeConfig, RuntimeSettings
+from alert_aggregator import AlertAggregator
+from frame_selector import BestFrameSelector
 import time
 
 def main():
@@ -34,6 +41,9 @@ def main():
     setup_logging()
     logger = logging.getLogger(__name__)
     logger.info("🚀 Starting Fire Detection System")
+    tracer.configure(enabled=Config.TRACE_ENABLED, capacity=Config.TRACE_CAPACITY)
+    if tracer.install_signal_handler(Config.TRACE_DIR):
+        logger.info(f"Send SIGUSR1 (kill -USR1 {os.getpid()}) to dump a trace to {Config.TRACE_DIR}")
 
     try:
         # Validate configuration
@@ -48,6 +58,62 @@ def main():
         detector = Detector(Config.MODEL_PATH, iou_threshold=0.20)
         logger.info(f"Loaded detection model: {Config.MODEL_PATH.name}")
 
+        # Thresholds and cooldown can be tuned live by editing the runtime config file
+        runtime_config = RuntimeConfig(
+            RuntimeSettings(
+                min_confidence=detector.min_confidence,
+                smoke_confidence=detector.smoke_confidence,
+                iou_threshold=detector.iou_threshold,
+                roi=detector.roi,
+                alert_cooldown=Config.ALERT_COOLDOWN
+            ),
+            config_file=Config.RUNTIME_CONFIG_FILE
+        )
+        runtime_config.subscribe(
+            lambda settings: detector.update_settings(**settings.detector_settings()))
+        runtime_config.start_watching()
+
+        # Rolling buffer for pre/post-event clips
+        clip_recorder = ClipRecorder(
+            Config.CLIPS_DIR,
+            pre_seconds=Config.CLIP_PRE_SECONDS,
+            post_seconds=Config.CLIP_POST_SECONDS,
+            max_buffer_bytes=Config.CLIP_BUFFER_MAX_MB * 1024 * 1024
+        )
+        source_id = str(Config.VIDEO_SOURCE)
+
+        # Holds opening alerts briefly so the best frame of the moment is sent
+        selector = BestFrameSelector(Config.BEST_FRAME_WINDOW_MS)
+
+        def deliver_alert(alert, clip_path=None):
+            logger.warning(f"🐦‍🔥 {alert.detection} {alert.kind} alert queued ({alert.summary})")
+            notification_service.send_alert(
+                alert.frame, alert.detection, clip_path=clip_path, boxes=alert.boxes,
+                details=alert.summary, channels=alert.channels)
+
+        def send_incident_alert(alert):
+            if alert.kind not in ('first', 'escalation'):
+                # Digests already carry the best frame of the incident
+                deliver_alert(alert)
+                return
+            # Clips only for alerts that open or escalate an incident, digests reuse them
+            clip_path = clip_recorder.trigger(alert.camera_id, alert.detection)
+            selector.begin(
+                alert.camera_id, alert.frame, alert.confidence, alert.boxes,
+                lambda frame, confidence, boxes: deliver_alert(
+                    replace(alert, frame=frame, confidence=confidence, boxes=boxes), clip_path))
+
+        # Groups detections into incidents and rate-limits alerts per channel
+        aggregator = AlertAggregator(
+            send_incident_alert,
+            lambda: notification_service.channels,
+            window=Config.INCIDENT_WINDOW,
+            digest_interval=runtime_config.current.alert_cooldown,
+            rate_limits=Config.ALERT_RATE_LIMITS
+        ).start()
+        runtime_config.subscribe(
+            lambda settings: setattr(aggregator, 'digest_interval', settings.alert_cooldown))
+
         # Video processing setup
         if isinstance(Config.VIDEO_SOURCE, int):
             cap = cv2.VideoCapture(Config.VIDEO_SOURCE)  # For webcam
@@ -59,35 +125,43 @@ def main():
             sys.exit(1)
         logger.info(f"Processing video source: {Config.VIDEO_SOURCE}")
 
-        # State management
-        alert_cooldown = Config.ALERT_COOLDOWN  # Seconds between alerts
-        last_alert_time = 0
-
-        next_detection_to_report = "any"  # "Fire" or "Smoke"
         # Main processing loop
+        detection_status = None
         while True:
-            ret, frame = cap.read()
+            with tracer.span('capture', 'main'):
+                ret, frame = cap.read()
             if not ret:
                 logger.info("✅ Video processing completed")
                 break
+            set_log_context(camera_id=source_id, frame_ts=round(time.time(), 3))
 
             # Detection pipeline
-            processed_frame, detection = detector.process_frame(frame)
+            with tracer.span('process_frame', 'main'):
+                processed_frame, detection = detector.process_frame(frame)
+            logger.debug(f"Frame processed: {detection or 'no detection'}, "
+                         f"{len(detector.last_detections)} boxes")  # Sampled, see Config.LOG_DEBUG_SAMPLE_SECONDS
+            if detection != detection_status:
+                detection_status = detection
+                log_detection_change(logger, detection)
+            with tracer.span('clip.add_frame', 'main'):
+                clip_recorder.add_frame(processed_frame, source=source_id)
 
-            # Alert logic with cooldown
+            # The aggregator decides whether this detection becomes an alert
             if detection:
-                current_time = time.time()
-                if (next_detection_to_report == "any" or detection == next_detection_to_report) \
-                        and (current_time - last_alert_time) > alert_cooldown:
-                    logger.warning(f"🐦‍🔥 {detection} Detected! Queueing alert")
-                    notification_service.send_alert(processed_frame, detection)
-                    last_alert_time = current_time
-                    next_detection_to_report = "Smoke" if detection == "Fire" else "Fire"
+                with tracer.span('alert.report', 'main', detection=detection):
+                    detections = detector.last_detections
+                    confidence = max((d['confidence'] for d in detections
+                                      if d['class'].lower() == detection.lower()), default=0.0)
+                    boxes = [d['box'] for d in detections]
+                    selector.offer(source_id, processed_frame, confidence, boxes)
+                    aggregator.report(source_id, detection, processed_frame, confidence, boxes=boxes)
 
             # Display output if not in headless mode
             if not args.headless:
-                cv2.imshow("Fire Detection System", processed_frame)
-                if cv2.waitKey(1) & 0xFF == ord("q"):
+                with tracer.span('display', 'main'):
+                    cv2.imshow("Fire Detection System", processed_frame)
+                    key = cv2.waitKey(1)
+                if key & 0xFF == ord("q"):
                     logger.info("🛑 User initiated shutdown")
                     break
 
@@ -98,6 +172,15 @@ def main():
         # Cleanup resources
         if 'cap' in locals():
             cap.release()
+        # The selector first: a held opening alert must go out before the final digest
+        if 'selector' in locals():
+            selector.stop()
+        if 'aggregator' in locals():
+            aggregator.stop()
+        if 'clip_recorder' in locals():
+            clip_recorder.close()
+        if 'runtime_config' in locals():
+            runtime_config.stop()
         cv2.destroyAllWindows()
         logger.info("🛑 System shutdown complete")
 
@@ -1,26 +1,44 @@
 # notification_service.py
-from concurrent.futures import ThreadPoolExecutor
-from cryptography.fernet import Fernet
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError, wait
+from collections import OrderedDict
 import json
 import os
 import requests
 import cv2
+import numpy as np
 import time
 import logging
 import asyncio
+import threading
 import telegram
+from telegram.request import HTTPXRequest
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
-from filelock import FileLock
 from io import BytesIO
 from twilio.rest import Client  # For Twilio WhatsApp
+from twilio.http.http_client import TwilioHttpClient
 
 # Add GCS imports
 from google.cloud import storage
+from google.auth.credentials import AnonymousCredentials
 from google.oauth2 import service_account
-import uuid
+
+try:
+    from .http_client import HttpClient
+    from .outbox import Outbox, OutboxFull
+    from .upload_cache import UploadCache, content_hash
+    from .image_profiles import ImageProfile, ImageStats, optimise
+    from .subscriber_service import SubscriberService, SubscriberStore
+    from .tracing import tracer
+except ImportError:  # Running as a script from src/ (see src/main.py)
+    from http_client import HttpClient
+    from outbox import Outbox, OutboxFull
+    from upload_cache import UploadCache, content_hash
+    from image_profiles import ImageProfile, ImageStats, optimise
+    from subscriber_service import SubscriberService, SubscriberStore
+    from tracing import tracer
 
 # Setup environment and logging
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -28,17 +46,109 @@ ENV = PROJECT_ROOT / '.env'
 load_dotenv(ENV, override=True)
 logger = logging.getLogger(__name__)
 
+# Upper bound for one Telegram delivery, below Outbox.close's join timeout
+TELEGRAM_DELIVERY_TIMEOUT = 8.0
+
+
+class PooledTwilioHttpClient(TwilioHttpClient):
+    """Twilio transport that reuses the shared HTTP session and reports its metrics"""
+
+    def __init__(self, http: HttpClient):
+        super().__init__(pool_connections=True, timeout=http.timeout[1])
+        self.http = http
+        self.session = http.session
+
+    def request(self, method, url, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception as e:
+            self.http.record(url, time.perf_counter() - start, error=e)
+            raise
+        self.http.record(url, time.perf_counter() - start, status=response.status_code)
+        return response
+
 
 class NotificationService:
     def __init__(self, config):
         """Initialize notification services"""
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        # Blocking channel work (Twilio, CallMeBot, uploads) runs here
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Alert images are persisted off the detection thread, in order
+        self.disk_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-writer")
+        self.on_alert_saved = []  # Callbacks receiving the saved image path
+        # Pooled keep-alive connections for all outbound HTTP notification traffic
+        self.http = HttpClient(
+            timeout=getattr(config, 'HTTP_TIMEOUT', (3.05, 10)),
+            max_retries=getattr(config, 'HTTP_MAX_RETRIES', 2),
+            pool_maxsize=getattr(config, 'HTTP_POOL_MAXSIZE', 4)
+        )
         self.config = config
-        # Create new event loop for this instance
+        # Content hash -> URL, so identical images are uploaded once
+        self.upload_cache = UploadCache(
+            max_entries=getattr(config, 'UPLOAD_CACHE_SIZE', 256),
+            ttl=getattr(config, 'UPLOAD_CACHE_TTL', 24 * 3600)
+        )
+        # Per-channel resize/recompress so uploads stay small on slow uplinks
+        self.image_profiles = {
+            channel: ImageProfile(**profile)
+            for channel, profile in getattr(config, 'IMAGE_PROFILES', {}).items()
+        }
+        self.image_stats = ImageStats()
+        self._channel_images = OrderedDict()  # (channel, content hash) -> optimised bytes
+        self._channel_images_lock = threading.Lock()
+        # One long-lived event loop on a dedicated thread owns all async channel work
         self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
+        self.loop_thread = threading.Thread(
+            target=self._run_loop, name="notification-loop", daemon=True)
+        self.loop_thread.start()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
         self._init_services()
         self._init_gcs()
+        self._init_outbox()
+
+    def _init_outbox(self):
+        """Open the durable outbox; alerts left over from a previous run are replayed"""
+        self.outbox = Outbox(
+            getattr(self.config, 'OUTBOX_PATH', PROJECT_ROOT / 'outbox.db'),
+            handlers={
+                'whatsapp': self._deliver_whatsapp,
+                'telegram': self._deliver_telegram,
+            },
+            workers=getattr(self.config, 'OUTBOX_WORKERS', 4),
+            queue_size=getattr(self.config, 'OUTBOX_QUEUE_SIZE', 100),
+            backpressure=getattr(self.config, 'OUTBOX_BACKPRESSURE', 'spill'),
+            max_attempts=getattr(self.config, 'OUTBOX_MAX_ATTEMPTS', 6),
+            retention=getattr(self.config, 'OUTBOX_RETENTION', 7 * 24 * 3600)
+        ).start()
+
+    @property
+    def channels(self) -> list:
+        """Names of the channels alerts are currently delivered to"""
+        channels = []
+        if self.whatsapp_enabled:
+            channels.append('whatsapp')
+        if getattr(self, 'telegram_bot', None):
+            channels.append('telegram')
+        return channels
+
+    def _run_loop(self):
+        """Body of the dispatcher thread"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _submit(self, coro) -> Future:
+        """Schedule a coroutine on the dispatcher loop from any thread"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard_pending)
+        return future
+
+    def _discard_pending(self, future: Future):
+        with self._pending_lock:
+            self._pending.discard(future)
 
     def _init_gcs(self):
         """Initialize Google Cloud Storage client"""
@@ -46,7 +156,17 @@ class NotificationService:
             # Get GCS credentials from env
             gcs_key_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
             bucket_name = os.getenv('GCS_BUCKET_NAME')
-            
+
+            # Local emulator (e.g. fake-gcs-server); the client reads the host from the env
+            if os.getenv('STORAGE_EMULATOR_HOST') and bucket_name:
+                self.storage_client = storage.Client(
+                    project=os.getenv('GCS_PROJECT', 'local'), credentials=AnonymousCredentials())
+                self.bucket = self.storage_client.bucket(bucket_name)
+                self.gcs_enabled = True
+                self.gcs_bucket_name = bucket_name
+                logger.info(f"GCS emulator at {os.getenv('STORAGE_EMULATOR_HOST')} with bucket: {bucket_name}")
+                return
+
             if not gcs_key_path or not bucket_name:
                 logger.warning("GCS credentials or bucket name missing, GCS storage disabled")
                 self.gcs_enabled = False
@@ -77,7 +197,10 @@ class NotificationService:
         
         if all([twilio_sid, twilio_token, twilio_number, receiver]):
             try:
-                self.twilio_client = Client(twilio_sid, twilio_token)
+                self.twilio_client = Client(
+                    twilio_sid, twilio_token, http_client=PooledTwilioHttpClient(self.http))
+                if api_base_url := getattr(self.config, 'TWILIO_API_BASE_URL', ''):
+                    self.twilio_client.api.base_url = api_base_url.rstrip('/')
                 # Format numbers for WhatsApp API (whatsapp: prefix)
                 if not twilio_number.startswith('whatsapp:'):
                     self.twilio_whatsapp_number = f"whatsapp:{twilio_number}"
@@ -108,7 +231,8 @@ class NotificationService:
         if all([os.getenv("CALLMEBOT_API_KEY"), os.getenv("RECEIVER_WHATSAPP_NUMBER")]) and not self.use_twilio:
             self.whatsapp_enabled = True
             self.use_callmebot = True
-            self.base_url = "https://api.callmebot.com/whatsapp.php"
+            self.base_url = getattr(
+                self.config, 'CALLMEBOT_API_URL', "https://api.callmebot.com/whatsapp.php")
             logger.info("CallMeBot WhatsApp service initialized (legacy fallback)")
         elif not self.use_twilio:
             self.whatsapp_enabled = False
@@ -118,11 +242,26 @@ class NotificationService:
         # Telegram initialization
         if token := os.getenv("TELEGRAM_TOKEN"):
             try:
+                telegram_base_url = getattr(self.config, 'TELEGRAM_API_BASE_URL', '') or None
                 self.telegram_bot = FlareGuardBot(
-                    token, os.getenv("TELEGRAM_CHAT_ID"))
-                # Run all async initialization together
-                if not self.loop.is_running():
-                    self.loop.run_until_complete(self._init_telegram())
+                    token, os.getenv("TELEGRAM_CHAT_ID"), base_url=telegram_base_url,
+                    storage_dir=getattr(self.config, 'TELEGRAM_STORE_DIR', None))
+                self.telegram_bot.on_upload = lambda size, seconds: \
+                    self.image_stats.record_upload('telegram', size, seconds)
+                # The only consumer of bot updates unless a standalone bot.py runs
+                if getattr(self.config, 'TELEGRAM_SUBSCRIBERS', 'in-process') == 'in-process':
+                    self.subscriber_service = SubscriberService(
+                        token,
+                        self.telegram_bot.store,
+                        base_url=telegram_base_url,
+                        webhook_url=getattr(self.config, 'TELEGRAM_WEBHOOK_URL', '') or None,
+                        webhook_port=getattr(self.config, 'TELEGRAM_WEBHOOK_PORT', 8443),
+                        webhook_secret=getattr(self.config, 'TELEGRAM_WEBHOOK_SECRET', '') or None
+                    )
+                # Runs on the dispatcher loop without holding up startup
+                self._submit(self._init_telegram()).add_done_callback(
+                    lambda f: f.exception() and logger.error(
+                        f"Telegram initialization failed: {f.exception()}"))
             except Exception as e:
                 logger.error(f"Telegram setup failed: {e}")
                 self.telegram_bot = None
@@ -132,33 +271,103 @@ class NotificationService:
     async def _init_telegram(self):
         """Async initialization for Telegram"""
         await self.telegram_bot.initialize()
+        if getattr(self, 'subscriber_service', None):
+            await self.subscriber_service.start()
         logger.info("Telegram service initialized")
 
+    @staticmethod
+    @tracer.traced('notify.encode_frame', 'notify')
+    def encode_frame(frame) -> bytes:
+        """JPEG-encode a frame once; the bytes are shared by every channel"""
+        ret, buffer = cv2.imencode('.jpg', frame)
+        if not ret:
+            raise ValueError("Failed to encode alert frame")
+        return buffer.tobytes()
+
+    def _alert_image_path(self) -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        return self.config.DETECTED_FIRES_DIR / f'alert_{timestamp}.jpg'
+
     def save_frame(self, frame) -> Path:
         """Save detection frame with timestamp"""
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
-        filename = self.config.DETECTED_FIRES_DIR / f'alert_{timestamp}.jpg'
-        cv2.imwrite(str(filename), frame)
+        filename = self._alert_image_path()
+        with open(filename, 'wb') as f:
+            f.write(self.encode_frame(frame))
         return filename
 
-    def upload_to_gcs(self, image_path: Path) -> str:
-        """Upload image to Google Cloud Storage"""
+    def _persist_alert(self, image_path: Path, image_data: bytes, detection: str, clip_path: Path = None):
+        """Background writer: store the encoded alert image and its record"""
+        with open(image_path, 'wb') as f:
+            f.write(image_data)
+        self.save_alert_record(image_path, detection, clip_path)
+        for callback in self.on_alert_saved:
+            callback(image_path)
+        return image_path
+
+    @staticmethod
+    def _read_image(image) -> bytes:
+        """Accept encoded bytes or a path to an image file"""
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return bytes(image)
+        with open(image, 'rb') as f:
+            return f.read()
+
+    def channel_image(self, channel: str, image_data: bytes, boxes=None) -> bytes:
+        """
+        Bytes to send on a channel, prepared with that channel's image profile.
+
+        Results are memoised per content so a delivery and its retries
+        share one optimisation.
+
+        Args:
+            channel (str): Channel name, a key of Config.IMAGE_PROFILES
+            image_data (bytes): Full-quality alert JPEG
+            boxes (list): Detection boxes [x1, y1, x2, y2] for profiles that crop
+        """
+        profile = self.image_profiles.get(channel)
+        if profile is None:
+            return image_data
+        key = (channel, content_hash(image_data))
+        with self._channel_images_lock:
+            if key in self._channel_images:
+                self._channel_images.move_to_end(key)
+                return self._channel_images[key]
+
+        frame = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            logger.warning(f"Alert image could not be decoded, sending original to {channel}")
+            return image_data
+        result = optimise(frame, profile, boxes or ())
+        # Never send more than the original
+        data = result.data if len(result.data) < len(image_data) else image_data
+
+        with self._channel_images_lock:
+            if key not in self._channel_images:
+                self.image_stats.record(channel, len(image_data), len(data), result.encode_seconds)
+                self._channel_images[key] = data
+                while len(self._channel_images) > 32:
+                    self._channel_images.popitem(last=False)
+        logger.debug(f"{channel} image {len(image_data)} -> {len(data)} bytes "
+                     f"(q={result.quality}, {result.width}x{result.height})")
+        return data
+
+    def upload_to_gcs(self, image_data: bytes, digest: str = None) -> str:
+        """Upload image to Google Cloud Storage under its content hash"""
         if not self.gcs_enabled:
             logger.warning("GCS upload skipped: GCS not enabled")
             return None
             
         try:
-            # Create a unique blob name with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            blob_name = f"fire_alerts/{timestamp}_{unique_id}.jpg"
-            
-            # Create a new blob and upload the file
+            image_data = self._read_image(image_data)
+            # Content-addressed name: the same image always maps to the same blob
+            blob_name = f"fire_alerts/{digest or content_hash(image_data)}.jpg"
             blob = self.bucket.blob(blob_name)
-            blob.upload_from_filename(str(image_path))
-            
-            # Make the blob publicly accessible (optional, based on your security needs)
-            blob.make_public()
+
+            # A previous run may already have uploaded this image
+            if not blob.exists():
+                blob.upload_from_string(image_data, content_type='image/jpeg')
+                # Make the blob publicly accessible (optional, based on your security needs)
+                blob.make_public()
             
             # Get the public URL
             image_url = blob.public_url
@@ -169,42 +378,47 @@ class NotificationService:
             logger.error(f"GCS upload error: {str(e)}")
             return None
 
-    def upload_image(self, image_path: Path) -> str:
-        """Upload image, using GCS with Imgur fallback"""
+    @tracer.traced('notify.upload_image', 'notify')
+    def upload_image(self, image) -> str:
+        """Upload image bytes (or an image file), reusing the URL of identical content"""
+        try:
+            image_data = self._read_image(image)
+        except OSError as e:
+            logger.error(f"Image could not be read: {e}")
+            return None
+        return self.upload_cache.get_or_upload(image_data, self._upload_uncached)
+
+    def _upload_uncached(self, image_data: bytes, digest: str) -> str:
+        """Upload using GCS with Imgur fallback"""
+        start = time.perf_counter()
         # First try GCS if enabled
         if hasattr(self, 'gcs_enabled') and self.gcs_enabled:
-            image_url = self.upload_to_gcs(image_path)
+            image_url = self.upload_to_gcs(image_data, digest)
             if image_url:
+                self.image_stats.record_upload('whatsapp', len(image_data), time.perf_counter() - start)
                 return image_url
             logger.warning("GCS upload failed, falling back to Imgur")
+            start = time.perf_counter()
         
         # Fallback to Imgur
         try:
-            # Ensure the file exists
-            if not image_path.exists():
-                logger.error(f"Image path does not exist: {image_path}")
-                return None
-                
-            # Open file properly for uploading
-            with open(image_path, 'rb') as image_file:
-                # Read the file content
-                image_data = image_file.read()
-                
-                # Send the image data to Imgur
-                response = requests.post(
-                    'https://api.imgur.com/3/image',
-                    headers={
-                        'Authorization': f'Client-ID {self.config.IMGUR_CLIENT_ID}'
-                    },
-                    files={'image': ('image.jpg', image_data, 'image/jpeg')},
-                    timeout=10
-                )
-                
+            # Send the image data to Imgur
+            response = self.http.post(
+                getattr(self.config, 'IMGUR_API_URL', 'https://api.imgur.com/3/image'),
+                headers={
+                    'Authorization': f'Client-ID {self.config.IMGUR_CLIENT_ID}'
+                },
+                files={'image': ('image.jpg', image_data, 'image/jpeg')},
+                timeout=10,
+                retry_status=True  # A repeated upload is harmless
+            )
+
             response.raise_for_status()
             data = response.json().get('data', {})
             if 'link' not in data:
                 logger.error("Imgur response missing 'link'")
                 return None
+            self.image_stats.record_upload('whatsapp', len(image_data), time.perf_counter() - start)
             return data['link']
         except requests.exceptions.HTTPError as e:
             try:
@@ -217,37 +431,90 @@ class NotificationService:
             logger.error(f"Image upload failed: {str(e)}")
             return None
 
-    def send_alert(self, frame, detection: str = "Fire") -> bool:
-        """Non-blocking alert dispatch"""
-        image_path = self.save_frame(frame)
-
-        # Submit to background thread
-        future = self.executor.submit(
-            self._send_alerts_async,
-            image_path,
-            detection
-        )
-
-        # Error logging callback
-        future.add_done_callback(
+    def save_alert_record(self, image_path: Path, detection: str, clip_path: Path = None) -> Path:
+        """Store alert metadata next to the saved frame"""
+        record_path = image_path.with_suffix('.json')
+        record = {
+            'detection': detection,
+            'timestamp': datetime.now().isoformat(),
+            'image': image_path.name,
+            'clip': str(clip_path) if clip_path else None,
+        }
+        with open(record_path, 'w') as f:
+            json.dump(record, f)
+        return record_path
+
+    @tracer.traced('notify.send_alert', 'notify')
+    def send_alert(self, frame, detection: str = "Fire", clip_path: Path = None, boxes=None,
+                   details: str = None, channels: list = None) -> bool:
+        """
+        Non-blocking alert dispatch.
+
+        Args:
+            frame (np.ndarray): Processed frame to send
+            detection (str): Detected class
+            clip_path (Path): Clip being recorded for this alert
+            boxes (list): Detection boxes in frame coordinates, used by cropping image profiles
+            details (str): Extra line for the message, e.g. an incident summary
+            channels (list): Channels to deliver to, defaults to all available
+        """
+        channels = self.channels if channels is None else [c for c in channels if c in self.channels]
+        # Encode once; every channel and uploader shares these bytes
+        image_data = self.encode_frame(frame)
+        image_path = self._alert_image_path()
+        self.disk_writer.submit(
+            self._persist_alert, image_path, image_data, detection, clip_path
+        ).add_done_callback(
             lambda f: f.exception() and logger.error(
-                f"Alert error: {f.exception()}")
+                f"Saving alert image failed: {f.exception()}")
         )
+        if clip_path:
+            logger.info(f"Alert clip will be written to {clip_path}")
+        boxes = [[int(v) for v in box] for box in boxes] if boxes is not None else []
 
-        return True  # Immediate success assumption
-
-    def _send_alerts_async(self, image_path, detection):
-        """Background alert processing"""
-        if self.whatsapp_enabled:
-            self._send_whatsapp_alert(image_path, detection)
-        if hasattr(self, 'telegram_bot') and self.telegram_bot:
-            self._send_telegram_alert(image_path, detection)
+        # Persist before delivery so the alert survives crashes and outages
+        try:
+            self.outbox.enqueue(
+                detection, image_data, channels,
+                payload={'clip': str(clip_path) if clip_path else None, 'boxes': boxes,
+                         'details': details})
+        except OutboxFull as e:
+            logger.error(str(e))
+            return False
 
-    def _send_whatsapp_alert(self, image_path, detection):
+        return True  # Delivery continues in the background
+
+    @tracer.traced('notify.deliver_whatsapp', 'notify')
+    def _deliver_whatsapp(self, alert: dict) -> bool:
+        """Outbox handler for the WhatsApp channel"""
+        image_data = self.channel_image('whatsapp', alert['image'], alert.get('boxes'))
+        return bool(self._send_whatsapp_alert(image_data, alert['detection'], alert.get('details')))
+
+    @tracer.traced('notify.deliver_telegram', 'notify')
+    def _deliver_telegram(self, alert: dict) -> bool:
+        """
+        Outbox handler for Telegram. Runs on an outbox worker thread and blocks
+        while the send runs on the dispatcher loop. Chats that failed
+        transiently are kept in the delivery's progress, so a retry only sends
+        to those.
+        """
+        image_data = self.channel_image('telegram', alert['image'], alert.get('boxes'))
+        progress = alert['progress']
+        future = self._submit(self._send_telegram_alert(
+            image_data, alert['detection'], alert.get('details'), progress.get('chats')))
+        try:
+            failed = future.result(timeout=TELEGRAM_DELIVERY_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()  # The outbox retries the whole delivery later
+            raise
+        progress['chats'] = failed
+        return not failed
+
+    def _send_whatsapp_alert(self, image_data: bytes, detection, details: str = None):
         """Handle WhatsApp notification with multiple fallback options"""
         try:
             # Upload the image
-            image_url = self.upload_image(image_path)
+            image_url = self.upload_image(image_data)
             
             # Prepare the message (with or without image URL)
             if image_url:
@@ -256,6 +523,8 @@ class NotificationService:
             else:
                 message = f"🚨 {detection} Detected! (Image attachment failed)"
                 logger.warning("Image upload failed - will try direct sending if available")
+            if details:
+                message += f"\n{details}"
             
             # Choose the appropriate method based on available services
             if hasattr(self, 'use_twilio') and self.use_twilio:
@@ -270,23 +539,15 @@ class NotificationService:
                     
                     # Try to add media if we have a direct image path and cloud upload failed
                     if not image_url and hasattr(self, 'gcs_enabled') and self.gcs_enabled:
-                        try:
-                            # Create a temporary signed URL if image_url is not available
-                            blob = self.bucket.blob(f"temp_media/{datetime.now().strftime('%Y%m%d-%H%M%S')}.jpg")
-                            blob.upload_from_filename(str(image_path))
-                            
-                            # Generate a signed URL that expires in 1 hour
-                            signed_url = blob.generate_signed_url(
-                                version="v4",
-                                expiration=datetime.timedelta(hours=1),
-                                method="GET"
-                            )
-                            
+                        # Create a temporary signed URL if image_url is not available
+                        expiry = getattr(self.config, 'SIGNED_URL_EXPIRY', 3600)
+                        signed_url = self.upload_cache.get_or_upload(
+                            image_data, self._upload_signed, namespace='signed',
+                            ttl=expiry * 0.8)  # Stop handing out URLs shortly before they expire
+                        if signed_url:
                             # Add media URL to message
                             message_params['media_url'] = [signed_url]
                             logger.info(f"Using temporary signed URL for media: {signed_url}")
-                        except Exception as media_error:
-                            logger.error(f"Media URL generation failed: {str(media_error)}")
                     
                     # Send the message
                     message_response = self.twilio_client.messages.create(**message_params)
@@ -312,20 +573,41 @@ class NotificationService:
             logger.error(f"WhatsApp alert failed: {str(e)}")
             return False
 
-    def _send_telegram_alert(self, image_path, detection):
-        """Handle Telegram notification with proper loop management"""
+    def _upload_signed(self, image_data: bytes, digest: str) -> str:
+        """Upload to temp_media/ under the content hash and sign a GET URL"""
         try:
-            if not self.loop.is_running():
-                asyncio.set_event_loop(self.loop)
-                return self.loop.run_until_complete(
-                    self.telegram_bot.send_alert(
-                        image_path=image_path,
-                        caption=f"🚨 {detection} Detected!"
-                    )
-                )
+            blob = self.bucket.blob(f"temp_media/{digest}.jpg")
+            if not blob.exists():
+                blob.upload_from_string(image_data, content_type='image/jpeg')
+            return blob.generate_signed_url(
+                version="v4",
+                expiration=timedelta(seconds=getattr(self.config, 'SIGNED_URL_EXPIRY', 3600)),
+                method="GET"
+            )
+        except Exception as media_error:
+            logger.error(f"Media URL generation failed: {str(media_error)}")
+            return None
+
+    async def _send_telegram_alert(self, image_data: bytes, detection, details: str = None,
+                                   chat_ids: list = None) -> list:
+        """
+        Handle Telegram notification on the dispatcher loop.
+
+        Returns:
+            list: Chats to retry, empty when nothing is left to send
+        """
+        caption = f"🚨 {detection} Detected!"
+        if details:
+            caption += f"\n{details}"
+        try:
+            return await self.telegram_bot.deliver(
+                image=image_data,
+                caption=caption,
+                chat_ids=chat_ids
+            )
         except Exception as e:
             logger.error(f"Telegram alert failed: {str(e)}")
-            return False
+            return sorted(self.telegram_bot.chat_ids if chat_ids is None else chat_ids)
 
     def send_test_message(self):
         """Verify system connectivity"""
@@ -341,13 +623,31 @@ class NotificationService:
         if hasattr(self, 'telegram_bot') and self.telegram_bot:
             try:
                 test_image = Path(PROJECT_ROOT, 'data', "test_image.png")
-                success |= self.loop.run_until_complete(
-                    self.telegram_bot.send_test_alert(test_image))
+                success |= self._submit(
+                    self.telegram_bot.send_test_alert(test_image)).result()
             except Exception as e:
                 logger.error(f"Telegram test failed: {e}")
                 
         return success
 
+    def http_metrics(self) -> dict:
+        """Latency and error metrics of outbound notification HTTP traffic"""
+        return self.http.metrics()
+
+    def outbox_metrics(self, limit: int = 50) -> dict:
+        """Outbox delivery counts, queue depth and the most recent dead letters"""
+        return dict(self.outbox.stats(), dead_letters=self.outbox.dead_letters(limit))
+
+    def retry_dead_letters(self) -> int:
+        """Requeue every dead-lettered delivery, returns how many"""
+        count = self.outbox.retry_dead()
+        logger.info(f"Requeued {count} dead-lettered alert deliveries")
+        return count
+
+    def image_metrics(self) -> dict:
+        """Bytes and estimated upload time saved by the per-channel image profiles"""
+        return self.image_stats.report()
+
     def _send_test_twilio_message(self, message):
         """Send a test message through Twilio"""
         try:
@@ -371,7 +671,8 @@ class NotificationService:
                 f"text={encoded_msg}&" \
                 f"apikey={os.getenv('CALLMEBOT_API_KEY')}"
 
-            response = requests.get(url, timeout=15)
+            # The GET itself sends the message: a read timeout must not resend it
+            response = self.http.get(url, timeout=15, idempotent=False)
             if response.status_code == 200:
                 logger.info("WhatsApp alert delivered via CallMeBot")
                 return True
@@ -385,14 +686,31 @@ class NotificationService:
     def cleanup(self):
         """Proper cleanup of resources"""
         try:
+            loop_open = hasattr(self, 'loop') and not self.loop.is_closed()
+            if hasattr(self, 'outbox'):
+                # Take no new deliveries; undelivered alerts stay in the outbox for the next run
+                self.outbox.stop()
+            if loop_open:
+                # Give in-flight sends a moment, then cancel them so the outbox workers return
+                with self._pending_lock:
+                    pending = list(self._pending)
+                _, not_done = wait(pending, timeout=5)
+                for future in not_done:
+                    future.cancel()
+            if hasattr(self, 'outbox'):
+                self.outbox.close()
+            if loop_open:
+                self.disk_writer.shutdown(wait=True)
+                if getattr(self, 'subscriber_service', None):
+                    self._submit(self.subscriber_service.stop()).result(timeout=15)
+                if getattr(self, 'telegram_bot', None):
+                    self._submit(self.telegram_bot.shutdown()).result(timeout=10)
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.loop_thread.join(timeout=5)
+                if not self.loop.is_running():
+                    self.loop.close()
             self.executor.shutdown(wait=True)
-            if hasattr(self, 'loop') and not self.loop.is_closed():
-                # Cancel all pending tasks
-                for task in asyncio.all_tasks(self.loop):
-                    task.cancel()
-                # Run loop one final time to complete cancellation
-                self.loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(self.loop), return_exceptions=True))
-                self.loop.close()
+            self.http.close()
         except Exception as e:
             logger.error(f"Cleanup error: {str(e)}")
 
@@ -401,116 +719,105 @@ class NotificationService:
         self.cleanup()
 
 
-class FlareGuardBot:
-    def __init__(self, token: str, default_chat_id: str = None):
-        self.logger = logging.getLogger(__name__)
-        self.token = token
-        self.default_chat_id = default_chat_id
-        self.bot = telegram.Bot(token=self.token)
-        self._init_crypto()
-        self.storage_file = Path(__file__).parent / "sysdata.bin"
-        self.update_file = Path(__file__).parent / "last_update.bin" 
-        self.chat_ids = self._load_chat_ids()
+class AsyncRateLimiter:
+    """Token bucket shared by coroutines running on one event loop"""
 
-    async def initialize(self):
-        """Async initialization sequence"""
-        await self._update_chat_ids()
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
 
-    def _init_crypto(self):
-        """Initialize encryption system"""
-        key = os.getenv("ENCRYPTION_KEY")
-        if not key:
-            raise ValueError("ENCRYPTION_KEY environment variable required")
-        self.cipher_suite = Fernet(key.encode())
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
-    def _load_chat_ids(self):
-        """Load encrypted chat IDs from secure storage with file locking"""
-        try:
-            if self.storage_file.exists():
-                with FileLock(str(self.storage_file) + ".lock"):
-                    self.storage_file.chmod(0o600)
-                    with open(self.storage_file, "rb") as f:
-                        encrypted_data = f.read()
-                        decrypted = self.cipher_suite.decrypt(encrypted_data)
-                        ids = json.loads(decrypted)
-                        if not all(isinstance(i, int) for i in ids):
-                            raise ValueError("Invalid chat ID format")
-                        return list(set(ids))  # Remove duplicates
-            return []
-        except Exception as e:
-            self.logger.error(f"Failed to load chat IDs: {e}")
-            return []
 
-    def _save_chat_ids(self):
-        """Securely store chat IDs with encryption and file locking"""
-        try:
-            with FileLock(str(self.storage_file) + ".lock"):
-                encrypted = self.cipher_suite.encrypt(
-                    json.dumps(list(set(self.chat_ids))).encode()
-                )
-                with open(self.storage_file, "wb") as f:
-                    f.write(encrypted)
-                self.storage_file.chmod(0o600)
-        except Exception as e:
-            self.logger.error(f"Failed to save chat IDs: {e}")
+class FlareGuardBot:
+    # Telegram allows roughly 30 messages per second overall and one per second per chat
+    GLOBAL_RATE = 30
+    PER_CHAT_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        token: str,
+        default_chat_id: str = None,
+        base_url: str = None,
+        max_concurrency: int = 16,
+        storage_dir: Path = None,
+        store: SubscriberStore = None
+    ):
+        """
+        Alert sender for Telegram. Subscribers are registered by the
+        SubscriberService, which is the only consumer of bot updates.
+
+        Args:
+            token (str): Bot token
+            default_chat_id (str): Chat used by older setups
+            base_url (str): Bot API base URL (e.g. a local stand-in)
+            max_concurrency (int): Concurrent sends of one fan-out
+            storage_dir (Path): Directory of the subscriber store, if no store is given
+            store (SubscriberStore): Subscriber store shared with the SubscriberService
+        """
+        self.logger = logging.getLogger(__name__)
+        self.token = token
+        self.default_chat_id = default_chat_id
+        self.max_concurrency = max_concurrency
+        # One HTTP session with enough pooled connections for the fan-out
+        request = HTTPXRequest(connection_pool_size=max_concurrency + 2)
+        self.bot = telegram.Bot(
+            token=self.token,
+            base_url=base_url or "https://api.telegram.org/bot",
+            request=request
+        )
+        self._initialized = False
+        self.on_upload = None  # Called with (bytes, seconds) after each photo upload
+        self._rate_limiter = None
+        self._last_sent = {}
+        self.store = store or SubscriberStore.from_env(storage_dir or Path(__file__).parent)
 
-    def _get_last_update_id(self):
-        """Get the encrypted ID of the last processed update"""
-        try:
-            if self.update_file.exists():
-                with FileLock(str(self.update_file) + ".lock"):
-                    self.update_file.chmod(0o600)
-                    with open(self.update_file, "rb") as f:
-                        encrypted_data = f.read()
-                        decrypted = self.cipher_suite.decrypt(encrypted_data)
-                        return int(decrypted.decode())
-        except Exception as e:
-            self.logger.error(f"Failed to read last update ID: {e}")
-        return 0
+    @property
+    def chat_ids(self) -> frozenset:
+        """Subscribed chat IDs"""
+        return self.store.ids()
 
-    def _save_last_update_id(self, update_id: int):
-        """Save the encrypted ID of the last processed update"""
-        try:
-            with FileLock(str(self.update_file) + ".lock"):
-                encrypted = self.cipher_suite.encrypt(str(update_id).encode())
-                with open(self.update_file, "wb") as f:
-                    f.write(encrypted)
-                self.update_file.chmod(0o600)
-        except Exception as e:
-            self.logger.error(f"Failed to save last update ID: {e}")
+    @chat_ids.setter
+    def chat_ids(self, chat_ids):
+        self.store.replace(chat_ids)
 
-    async def _update_chat_ids(self):
-        """Discover and store new chat IDs securely with offset handling"""
-        try:
-            offset = self._get_last_update_id()
-            updates = await self.bot.get_updates(offset=offset + 1, timeout=30)
-
-            new_ids = []
-            for update in updates:
-                if update.message and update.message.chat_id:
-                    chat_id = update.message.chat_id
-                    if chat_id not in self.chat_ids:
-                        new_ids.append(chat_id)
-                        self.chat_ids.append(chat_id)
-                        self.logger.info(f"New chat ID registered: {chat_id}")
-
-                # Update the offset to the latest processed update
-                if update.update_id >= offset:
-                    offset = update.update_id
-                    self._save_last_update_id(offset)
-
-            if new_ids:
-                self._save_chat_ids()
-                self.logger.info(f"Saved {len(new_ids)} new chat IDs")
-        except Exception as e:
-            self.logger.error(f"Chat ID update failed: {e}")
+    async def initialize(self):
+        """Async initialization sequence"""
+        await self._ensure_session()
+
+    async def _ensure_session(self):
+        """Open the persistent bot session once, on the loop that will use it"""
+        if not self._initialized:
+            await self.bot.initialize()
+            # Capacity of one spaces sends evenly instead of bursting
+            self._rate_limiter = AsyncRateLimiter(self.GLOBAL_RATE, capacity=1)
+            self._initialized = True
+
+    async def shutdown(self):
+        """Write pending store changes and close the persistent bot session"""
+        self.store.flush()
+        if self._initialized:
+            await self.bot.shutdown()
+            self._initialized = False
 
     async def _verify_chat_id(self, chat_id: int) -> bool:
         """Verify if a chat ID is still valid"""
         try:
             await self.bot.send_chat_action(chat_id=chat_id, action="typing")
             return True
-        except telegram.error.Unauthorized:
+        except telegram.error.Forbidden:
             return False
         except Exception:
             # For other errors, assume the chat is still valid
@@ -518,86 +825,158 @@ class FlareGuardBot:
 
     async def cleanup_invalid_chats(self):
         """Remove invalid chat IDs from storage"""
+        await self._ensure_session()
         invalid_ids = []
-        for chat_id in self.chat_ids:
+        for chat_id in list(self.chat_ids):
             if not await self._verify_chat_id(chat_id):
                 invalid_ids.append(chat_id)
                 self.logger.info(f"Removing invalid chat ID: {chat_id}")
 
         if invalid_ids:
-            self.chat_ids = [
-                id for id in self.chat_ids if id not in invalid_ids]
-            self._save_chat_ids()
-
-    async def send_alert(self, image_path: Path, caption: str) -> bool:
-        """Send alert to all registered chats with retry logic and invalid chat cleanup"""
-        if not image_path.exists():
-            self.logger.error(f"Alert image missing: {image_path}")
-            return False
-
-        overall_success = False
-        failed_chats = []
+            self.store.remove(invalid_ids)
+
+    async def send_alert(self, image, caption: str) -> bool:
+        """Send alert to all registered chats; True unless a chat failed and is worth retrying"""
+        return not await self.deliver(image, caption)
+
+    async def deliver(self, image, caption: str, chat_ids: list = None) -> list:
+        """
+        Send alert to registered chats concurrently, uploading the photo only once.
+
+        Args:
+            image (bytes | Path): JPEG data or file
+            caption (str): Message caption
+            chat_ids (list): Only these chats (those left by an earlier attempt), all subscribers if None
+
+        Returns:
+            list: Chats that failed transiently; unsubscribed and invalid chats are not retried
+        """
+        subscribers = self.chat_ids
+        targets = sorted(subscribers if chat_ids is None else subscribers & set(chat_ids))
+        if isinstance(image, (bytes, bytearray)):
+            image_data = bytes(image)
+        elif not Path(image).exists():
+            self.logger.error(f"Alert image missing: {image}")
+            return targets
+        else:
+            # Read image data once
+            with open(image, 'rb') as f:
+                image_data = f.read()
+        if not targets:
+            self.logger.info("Telegram alert skipped: no subscribed chats")
+            return []
 
-        # Read image data once
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
+        await self._ensure_session()
+        pending = list(targets)
+        delivered = set()
+        invalid_chats = []
 
         try:
-            for chat_id in self.chat_ids:
-                sent = False
-                for attempt in range(3):
-                    try:
-                        # Create new BytesIO for each send attempt
-                        photo = BytesIO(image_data)
-                        photo.name = 'image.jpg'  # Telegram requires a name
-
-                        async with self.bot:  # Create new session for each chat
-                            await self.bot.send_photo(
-                                chat_id=chat_id,
-                                photo=photo,
-                                caption=caption,
-                                parse_mode='Markdown',
-                                pool_timeout=20
-                            )
-                        self.logger.info(
-                            f"Alert sent to Telegram chat {chat_id}")
-                        sent = True
-                        overall_success = True
-                        break
-                    except telegram.error.Unauthorized:
-                        self.logger.warning(f"Unauthorized for chat {chat_id}")
-                        failed_chats.append(chat_id)
-                        break
-                    except telegram.error.TimedOut:
-                        await asyncio.sleep(2 ** attempt)
-                        self.logger.warning(
-                            f"Timeout sending to {chat_id}, retry {attempt+1}/3")
-                    except telegram.error.NetworkError:
-                        await asyncio.sleep(5)
-                        self.logger.warning(
-                            f"Network error with {chat_id}, retry {attempt+1}/3")
-                    except Exception as e:
-                        self.logger.error(
-                            f"Failed to send to {chat_id}: {str(e)}")
-                        if attempt == 2:  # Only add to failed chats after all retries
-                            failed_chats.append(chat_id)
-                        break
-
-                if not sent:
-                    failed_chats.append(chat_id)
-
-            # Clean up invalid chats after sending alerts
-            if failed_chats:
-                self.chat_ids = [
-                    id for id in self.chat_ids if id not in failed_chats]
-                self._save_chat_ids()
+            # Upload to the first reachable chat, then reuse Telegram's file_id
+            file_id = None
+            while pending and file_id is None:
+                chat_id = pending.pop(0)
+                start = time.perf_counter()
+                message, invalid = await self._send_to_chat(chat_id, image_data, caption)
+                if invalid:
+                    invalid_chats.append(chat_id)
+                if message is not None:
+                    delivered.add(chat_id)
+                    if message.photo:
+                        file_id = message.photo[-1].file_id
+                        if self.on_upload:
+                            self.on_upload(len(image_data), time.perf_counter() - start)
+
+            if pending:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+
+                async def send(chat_id):
+                    async with semaphore:
+                        return await self._send_to_chat(chat_id, file_id or image_data, caption)
+
+                results = await asyncio.gather(*(send(chat_id) for chat_id in pending))
+                for chat_id, (message, invalid) in zip(pending, results):
+                    if message is not None:
+                        delivered.add(chat_id)
+                    if invalid:
+                        invalid_chats.append(chat_id)
+
+            # Clean up chats that blocked the bot or no longer exist
+            if invalid_chats:
+                self.store.remove(invalid_chats)
                 self.logger.info(
-                    f"Removed {len(failed_chats)} invalid chat IDs")
+                    f"Removed {len(invalid_chats)} invalid chat IDs")
 
         except Exception as e:
             self.logger.error(f"Telegram error: {str(e)}")
 
-        return overall_success
+        self.logger.info(f"Telegram alert delivered to {len(delivered)}/{len(targets)} chats")
+        return [c for c in targets if c not in delivered and c not in invalid_chats]
+
+    async def _send_to_chat(self, chat_id: int, photo, caption: str):
+        """
+        Send one photo with retries and rate limiting.
+
+        Returns:
+            tuple: (sent message or None, whether the chat is permanently invalid)
+        """
+        attempt = 0
+        rate_limited = 0
+        while attempt < 3:
+            # Respect the per-chat limit, then the global one
+            wait_for = self._last_sent.get(chat_id, 0) + self.PER_CHAT_INTERVAL - time.monotonic()
+            if wait_for > 0:
+                await asyncio.sleep(wait_for)
+            await self._rate_limiter.acquire()
+            self._last_sent[chat_id] = time.monotonic()
+
+            try:
+                if isinstance(photo, bytes):
+                    # Create new BytesIO for each send attempt
+                    photo_file = BytesIO(photo)
+                    photo_file.name = 'image.jpg'  # Telegram requires a name
+                else:
+                    photo_file = photo
+                message = await self.bot.send_photo(
+                    chat_id=chat_id,
+                    photo=photo_file,
+                    caption=caption,
+                    parse_mode='Markdown',
+                    pool_timeout=20
+                )
+                self.logger.debug(f"Alert sent to Telegram chat {chat_id}")
+                return message, False
+            except telegram.error.RetryAfter as e:
+                # Waiting out a rate limit does not use up a retry
+                rate_limited += 1
+                if rate_limited > 5:
+                    break
+                delay = e.retry_after
+                delay = delay.total_seconds() if hasattr(delay, 'total_seconds') else delay
+                self.logger.warning(
+                    f"Rate limited by Telegram for {chat_id}, waiting {delay}s")
+                await asyncio.sleep(delay)
+                continue
+            except telegram.error.Forbidden:
+                self.logger.warning(f"Unauthorized for chat {chat_id}")
+                return None, True
+            except telegram.error.BadRequest as e:
+                self.logger.error(f"Failed to send to {chat_id}: {str(e)}")
+                return None, "chat not found" in str(e).lower()
+            except telegram.error.TimedOut:
+                await asyncio.sleep(2 ** attempt)
+                self.logger.warning(
+                    f"Timeout sending to {chat_id}, retry {attempt+1}/3")
+            except telegram.error.NetworkError:
+                await asyncio.sleep(5)
+                self.logger.warning(
+                    f"Network error with {chat_id}, retry {attempt+1}/3")
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to send to {chat_id}: {str(e)}")
+                return None, False
+            attempt += 1
+        return None, False
 
     async def send_test_alert(self, test_image: Path):
         """Special method for test alerts"""
@@ -0,0 +1,335 @@
+import json
+import logging
+import queue
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+
+PENDING = 'pending'
+SENT = 'sent'
+DEAD = 'dead'
+
+BACKPRESSURE_POLICIES = ('spill', 'block', 'drop')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    detection TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    image BLOB,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_id INTEGER NOT NULL REFERENCES alerts(id) ON DELETE CASCADE,
+    channel TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    progress TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (state, next_attempt_at);
+"""
+
+
+class OutboxFull(Exception):
+    """Raised when the outbox rejects an alert under the `drop` policy"""
+
+
+class Outbox:
+    def __init__(
+        self,
+        db_path: Path,
+        handlers: Dict[str, Callable[[dict], bool]],
+        workers: int = 4,
+        queue_size: int = 100,
+        backpressure: str = 'spill',
+        max_attempts: int = 6,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        poll_interval: float = 0.5,
+        retention: Optional[float] = 7 * 24 * 3600,
+        purge_interval: float = 3600.0
+        ):
+        """
+        Durable notification outbox backed by SQLite.
+
+        Every alert is written to disk with one delivery row per channel
+        before anything is sent, so alerts survive crashes and network
+        outages and are replayed on the next start.
+
+        Args:
+            db_path (Path): SQLite database file
+            handlers (dict): Channel name mapped to a callable that delivers an
+                alert dict and returns True on success. What a failed attempt
+                already did can be recorded in the alert's 'progress' dict,
+                which the next attempt of that delivery receives again
+            workers (int): Delivery threads
+            queue_size (int): Bound of the in-memory delivery queue
+            backpressure (str): What to do when the queue is full:
+                'spill' keeps the delivery on disk only and picks it up later,
+                'block' waits for room, 'drop' rejects new alerts
+            max_attempts (int): Attempts before a delivery is dead-lettered
+            base_delay (float): First retry delay in seconds
+            max_delay (float): Upper bound of the retry delay
+            poll_interval (float): Seconds between scans for due retries
+            retention (float): Seconds fully delivered alerts (and their images)
+                are kept before the scheduler purges them, None keeps them forever
+            purge_interval (float): Seconds between purges
+        """
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {backpressure}")
+
+        self.logger = logging.getLogger(__name__)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.handlers = handlers
+        self.backpressure = backpressure
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.purge_interval = purge_interval
+
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+        columns = {row['name'] for row in self._db.execute("PRAGMA table_info(deliveries)")}
+        if 'progress' not in columns:  # Outboxes created before partial deliveries were tracked
+            self._db.execute("ALTER TABLE deliveries ADD COLUMN progress TEXT")
+        self._db_lock = threading.Lock()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._queued = set()  # Delivery ids in the queue or being delivered
+        self._queued_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+
+        self._threads = [threading.Thread(
+            target=self._schedule, name="outbox-scheduler", daemon=True)]
+        self._threads += [threading.Thread(
+            target=self._work, name=f"outbox-worker-{i}", daemon=True) for i in range(workers)]
+
+    def start(self) -> 'Outbox':
+        """Start delivery; deliveries left pending by a previous run are replayed"""
+        with self._db_lock:
+            pending = self._db.execute(
+                "SELECT COUNT(*) FROM deliveries WHERE state = ?", (PENDING,)).fetchone()[0]
+        if pending:
+            self.logger.info(f"Replaying {pending} pending alert deliveries")
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def enqueue(self, detection: str, image: Optional[bytes], channels: Iterable[str],
+                payload: Optional[dict] = None, timeout: float = 5.0) -> int:
+        """
+        Persist an alert and queue its deliveries.
+
+        Returns:
+            int: The alert id
+        """
+        channels = [c for c in channels if c in self.handlers]
+        if self.backpressure == 'drop' and self._queue.qsize() + len(channels) > self._queue.maxsize:
+            raise OutboxFull(f"Outbox queue full, alert dropped: {detection}")
+
+        now = time.time()
+        with self._db_lock, self._db:
+            alert_id = self._db.execute(
+                "INSERT INTO alerts (detection, payload, image, created_at) VALUES (?, ?, ?, ?)",
+                (detection, json.dumps(payload or {}), image, now)).lastrowid
+            delivery_ids = [self._db.execute(
+                "INSERT INTO deliveries (alert_id, channel, state, next_attempt_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (alert_id, channel, PENDING, now, now)).lastrowid for channel in channels]
+
+        for delivery_id in delivery_ids:
+            self._offer(delivery_id, block=self.backpressure == 'block', timeout=timeout)
+        return alert_id
+
+    def _offer(self, delivery_id: int, block: bool = False, timeout: float = None) -> bool:
+        """Put a delivery in the memory queue; if it does not fit it stays on disk"""
+        with self._queued_lock:
+            if delivery_id in self._queued:
+                return True
+            self._queued.add(delivery_id)
+        try:
+            self._queue.put(delivery_id, block=block, timeout=timeout)
+            return True
+        except queue.Full:
+            with self._queued_lock:
+                self._queued.discard(delivery_id)
+            return False
+
+    def _schedule(self) -> None:
+        """Move due deliveries from disk into the memory queue as room allows"""
+        next_purge = time.monotonic()
+        while not self._stopped.is_set():
+            if self.retention is not None and time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + self.purge_interval
+                try:
+                    purged = self.purge(self.retention)
+                    if purged:
+                        self.logger.info(f"Purged {purged} delivered alerts from the outbox")
+                except sqlite3.Error as e:
+                    self.logger.error(f"Outbox purge failed: {e}")
+            free = self._queue.maxsize - self._queue.qsize()
+            if free > 0:
+                with self._db_lock:
+                    rows = self._db.execute(
+                        "SELECT id FROM deliveries WHERE state = ? AND next_attempt_at <= ? "
+                        "ORDER BY next_attempt_at LIMIT ?",
+                        (PENDING, time.time(), free + len(self._queued))).fetchall()
+                for row in rows:
+                    with self._queued_lock:
+                        if row['id'] in self._queued:
+                            continue
+                    if not self._offer(row['id']):
+                        break
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _work(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                delivery_id = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._deliver(delivery_id)
+            except Exception as e:
+                self.logger.error(f"Outbox delivery {delivery_id} crashed: {e}")
+            finally:
+                with self._queued_lock:
+                    self._queued.discard(delivery_id)
+
+    def _deliver(self, delivery_id: int) -> None:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT d.id, d.channel, d.state, d.attempts, d.progress, a.id AS alert_id, a.detection, "
+                "a.payload, a.image, a.created_at FROM deliveries d JOIN alerts a ON a.id = d.alert_id "
+                "WHERE d.id = ?", (delivery_id,)).fetchone()
+        if row is None or row['state'] != PENDING:
+            return
+
+        alert = {
+            'id': row['alert_id'],
+            'detection': row['detection'],
+            'image': row['image'],
+            'created_at': row['created_at'],
+            'attempt': row['attempts'] + 1,
+            **json.loads(row['payload']),
+            'progress': json.loads(row['progress'] or '{}'),
+        }
+
+        error = None
+        try:
+            delivered = self.handlers[row['channel']](alert)
+        except Exception as e:
+            delivered, error = False, str(e)
+
+        now = time.time()
+        attempts = row['attempts'] + 1
+        with self._db_lock, self._db:
+            if delivered:
+                self._db.execute(
+                    "UPDATE deliveries SET state = ?, attempts = ?, updated_at = ? WHERE id = ?",
+                    (SENT, attempts, now, delivery_id))
+            elif attempts >= self.max_attempts:
+                self._db.execute(
+                    "UPDATE deliveries SET state = ?, attempts = ?, last_error = ?, progress = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (DEAD, attempts, error, json.dumps(alert['progress']), now, delivery_id))
+            else:
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+                delay *= random.uniform(0.8, 1.2)
+                self._db.execute(
+                    "UPDATE deliveries SET attempts = ?, next_attempt_at = ?, last_error = ?, progress = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (attempts, now + delay, error, json.dumps(alert['progress']), now, delivery_id))
+
+        if delivered:
+            self.logger.debug(f"Alert {alert['id']} delivered via {row['channel']}")
+        elif attempts >= self.max_attempts:
+            self.logger.error(
+                f"Alert {alert['id']} dead-lettered for {row['channel']} after {attempts} attempts")
+        else:
+            self.logger.warning(
+                f"Alert {alert['id']} delivery via {row['channel']} failed, attempt {attempts}/{self.max_attempts}")
+
+    def stats(self) -> dict:
+        """Delivery counts per channel and state plus the current queue depth"""
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT channel, state, COUNT(*) AS n FROM deliveries GROUP BY channel, state").fetchall()
+        stats = {'queue_depth': self._queue.qsize(), 'channels': {}}
+        for row in rows:
+            stats['channels'].setdefault(row['channel'], {})[row['state']] = row['n']
+        return stats
+
+    def dead_letters(self, limit: int = 50) -> list:
+        """Most recent deliveries that gave up"""
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT d.id, d.alert_id, d.channel, d.attempts, d.last_error, d.updated_at, a.detection "
+                "FROM deliveries d JOIN alerts a ON a.id = d.alert_id WHERE d.state = ? "
+                "ORDER BY d.updated_at DESC LIMIT ?", (DEAD, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def retry_dead(self) -> int:
+        """Move dead-lettered deliveries back to pending"""
+        with self._db_lock, self._db:
+            count = self._db.execute(
+                "UPDATE deliveries SET state = ?, attempts = 0, next_attempt_at = ? WHERE state = ?",
+                (PENDING, time.time(), DEAD)).rowcount
+        self._wakeup.set()
+        return count
+
+    def purge(self, older_than: float = 7 * 24 * 3600) -> int:
+        """Delete alerts whose deliveries all succeeded and are older than `older_than` seconds"""
+        cutoff = time.time() - older_than
+        with self._db_lock, self._db:
+            return self._db.execute(
+                "DELETE FROM alerts WHERE created_at < ? AND NOT EXISTS ("
+                "SELECT 1 FROM deliveries d WHERE d.alert_id = alerts.id AND d.state != ?)",
+                (cutoff, SENT)).rowcount
+
+    def wait_idle(self, timeout: float = 30.0) -> bool:
+        """Block until no delivery is due or in flight (used by tests and benchmarks)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._db_lock:
+                due = self._db.execute(
+                    "SELECT COUNT(*) FROM deliveries WHERE state = ? AND next_attempt_at <= ?",
+                    (PENDING, time.time())).fetchone()[0]
+            with self._queued_lock:
+                busy = bool(self._queued)
+            if not due and not busy:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def stop(self) -> None:
+        """Stop taking deliveries off the queue; the ones in progress run to completion"""
+        self._stopped.set()
+        self._wakeup.set()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop delivery threads; undelivered alerts stay on disk for the next run"""
+        self.stop()
+        deadline = time.time() + timeout
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout=max(0.0, deadline - time.time()))
+        with self._db_lock:
+            self._db.close()
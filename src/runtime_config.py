@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, asdict, fields, replace
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+
+class ConfigVersionError(ValueError):
+    """Raised when an update was based on an outdated settings version"""
+
+
+@dataclass(frozen=True)
+class RuntimeSettings:
+    """Settings that can be changed while the pipeline is running"""
+    min_confidence: float = 0.5
+    smoke_confidence: float = 0.75
+    iou_threshold: float = 0.2
+    roi: Optional[Tuple[float, float, float, float]] = None
+    alert_cooldown: float = 45
+    version: int = 0
+
+    def validate(self) -> None:
+        """Raise ValueError if any setting is out of range"""
+        for name in ('min_confidence', 'smoke_confidence', 'iou_threshold', 'alert_cooldown'):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{name} must be a number")
+
+        for name in ('min_confidence', 'smoke_confidence'):
+            if not 0 < getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be in (0, 1]")
+        if not 0 <= self.iou_threshold <= 1:
+            raise ValueError("iou_threshold must be in [0, 1]")
+        if self.alert_cooldown < 0:
+            raise ValueError("alert_cooldown must not be negative")
+
+        if self.roi is not None:
+            if len(self.roi) != 4 or not all(
+                    isinstance(v, (int, float)) and 0 <= v <= 1 for v in self.roi):
+                raise ValueError("roi must be four normalised values [x1, y1, x2, y2]")
+            x1, y1, x2, y2 = self.roi
+            if x1 >= x2 or y1 >= y2:
+                raise ValueError("roi must satisfy x1 < x2 and y1 < y2")
+
+    def detector_settings(self) -> dict:
+        """Subset of the settings consumed by Detector.update_settings"""
+        return {
+            'min_confidence': self.min_confidence,
+            'smoke_confidence': self.smoke_confidence,
+            'iou_threshold': self.iou_threshold,
+            'roi': self.roi,
+        }
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class RuntimeConfig:
+    def __init__(
+        self,
+        initial: RuntimeSettings,
+        config_file: Optional[Path] = None,
+        poll_interval: float = 1.0
+        ):
+        """
+        Versioned holder for live-tunable settings.
+
+        Readers take `current` once per frame; writers build a complete new
+        settings object and swap the reference, so a frame never sees a mix
+        of old and new values.
+
+        Args:
+            initial (RuntimeSettings): Settings used at startup
+            config_file (Path): Optional JSON file that is watched for changes
+            poll_interval (float): Seconds between checks of the config file
+        """
+        self.logger = logging.getLogger(__name__)
+        initial.validate()
+        self._current = initial
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[RuntimeSettings], None]] = []
+        self.config_file = Path(config_file) if config_file else None
+        self.poll_interval = poll_interval
+        self._file_mtime = None
+        self._stopped = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def current(self) -> RuntimeSettings:
+        return self._current
+
+    def subscribe(self, listener: Callable[[RuntimeSettings], None]) -> None:
+        """Register a callback invoked with the new settings after each change"""
+        self._listeners.append(listener)
+
+    def update(self, changes: dict, expected_version: Optional[int] = None,
+               persist: bool = True) -> RuntimeSettings:
+        """
+        Validate and apply a partial update.
+
+        Args:
+            changes (dict): Setting names mapped to new values
+            expected_version (int): Reject the update if settings moved on since this version
+            persist (bool): Write the new settings to the config file
+
+        Returns:
+            RuntimeSettings: The settings now in effect
+        """
+        allowed = {f.name for f in fields(RuntimeSettings)} - {'version'}
+        unknown = set(changes) - allowed
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        if 'roi' in changes and changes['roi'] is not None:
+            changes = dict(changes, roi=tuple(changes['roi']))
+
+        with self._lock:
+            current = self._current
+            if expected_version is not None and expected_version != current.version:
+                raise ConfigVersionError(
+                    f"Settings version is {current.version}, not {expected_version}")
+            updated = replace(current, **changes, version=current.version + 1)
+            updated.validate()
+            self._current = updated
+            if persist and self.config_file:
+                self._write_file(updated)
+
+        self.logger.info(f"Runtime settings updated to version {updated.version}: {changes}")
+        for listener in self._listeners:
+            try:
+                listener(updated)
+            except Exception as e:
+                self.logger.error(f"Settings listener failed: {e}")
+        return updated
+
+    def _write_file(self, settings: RuntimeSettings) -> None:
+        tmp_file = self.config_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(settings.to_dict(), f, indent=2)
+        os.replace(tmp_file, self.config_file)
+        # Remember our own write so the watcher does not apply it again
+        self._file_mtime = self.config_file.stat().st_mtime_ns
+
+    def start_watching(self) -> None:
+        """Poll the config file in a background thread and apply edits"""
+        if not self.config_file or (self._watcher and self._watcher.is_alive()):
+            return
+        # Settings tuned in a previous run take effect before the first frame
+        self.check_file()
+        self._watcher = threading.Thread(
+            target=self._watch, name="runtime-config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.poll_interval):
+            self.check_file()
+
+    def check_file(self) -> bool:
+        """Apply the config file if it changed since the last check"""
+        try:
+            mtime = self.config_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._file_mtime:
+            return False
+        self._file_mtime = mtime
+
+        try:
+            with open(self.config_file, 'r') as f:
+                data = json.load(f)
+            data.pop('version', None)
+            if data.get('roi') is not None:
+                data['roi'] = tuple(data['roi'])
+            changes = {k: v for k, v in data.items() if getattr(self._current, k, None) != v}
+            if changes:
+                self.update(changes, persist=False)
+            return True
+        except Exception as e:
+            self.logger.error(f"Rejected runtime config file {self.config_file.name}: {e}")
+            return False
@@ -0,0 +1,302 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import FrozenSet, Iterable, Optional
+from urllib.parse import urlsplit
+
+from cryptography.fernet import Fernet
+from filelock import FileLock
+from telegram import Update
+from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes, TypeHandler
+
+try:
+    from .bot import start_command, help_command, button_handler
+except ImportError:  # Running as a script from src/ (see src/bot.py)
+    from bot import start_command, help_command, button_handler
+
+
+ALLOWED_UPDATES = ["message", "callback_query"]
+
+
+class SubscriberStore:
+    def __init__(self, storage_file: Path, cipher: Fernet, save_delay: float = 2.0):
+        """
+        Encrypted set of subscribed Telegram chat IDs.
+
+        The set lives in memory; changes are batched into one debounced,
+        atomic encrypted write. When another process (a standalone bot)
+        rewrites the file, the next lookup picks the change up, so the file
+        doubles as the IPC channel between the bot and the detector.
+
+        Args:
+            storage_file (Path): Encrypted store, readable by older versions' format too
+            cipher (Fernet): Cipher built from ENCRYPTION_KEY
+            save_delay (float): Seconds changes are collected before they are written
+        """
+        self.logger = logging.getLogger(__name__)
+        self.storage_file = Path(storage_file)
+        self.cipher = cipher
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._mtime = None
+        self._ids: FrozenSet[int] = frozenset()
+        # Unsaved changes, replayed onto the file if another process wrote it meanwhile
+        self._added, self._removed, self._replaced = set(), set(), False
+        self._reload()
+
+    @classmethod
+    def from_env(cls, storage_dir: Path, **kwargs) -> 'SubscriberStore':
+        """Open `sysdata.bin` in storage_dir with the ENCRYPTION_KEY cipher"""
+        key = os.getenv("ENCRYPTION_KEY")
+        if not key:
+            raise ValueError("ENCRYPTION_KEY environment variable required")
+        return cls(Path(storage_dir) / "sysdata.bin", Fernet(key.encode()), **kwargs)
+
+    def _stat(self):
+        try:
+            return self.storage_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _reload(self) -> None:
+        mtime = self._stat()
+        if mtime is None:
+            self._mtime = None
+            return
+        try:
+            with FileLock(str(self.storage_file) + ".lock"):
+                self._ids = self._read()
+        except Exception as e:
+            self.logger.error(f"Failed to load chat IDs: {e}")
+        self._mtime = mtime
+
+    def _read(self) -> FrozenSet[int]:
+        """IDs in the file, the caller holds the file lock"""
+        with open(self.storage_file, "rb") as f:
+            encrypted_data = f.read()
+        data = json.loads(self.cipher.decrypt(encrypted_data))
+        ids = data if isinstance(data, list) else data["chat_ids"]
+        if not all(isinstance(i, int) for i in ids):
+            raise ValueError("Invalid chat ID format")
+        return frozenset(ids)
+
+    def ids(self) -> FrozenSet[int]:
+        """Current subscribers; a stat call per lookup keeps other processes' changes visible"""
+        with self._lock:
+            if self._timer is None and self._stat() != self._mtime:
+                self._reload()
+            return self._ids
+
+    def add(self, chat_id: int) -> bool:
+        """Subscribe a chat, returns False if it already was"""
+        with self._lock:
+            if chat_id in self.ids():
+                return False
+            self._ids = self._ids | {chat_id}
+            self._added.add(chat_id)
+            self._removed.discard(chat_id)
+            self._schedule_save()
+        self.logger.info(f"New chat ID registered: {chat_id}")
+        return True
+
+    def remove(self, chat_ids: Iterable[int]) -> int:
+        """Unsubscribe chats, returns how many were removed"""
+        chat_ids = set(chat_ids)
+        with self._lock:
+            removed = len(self.ids() & chat_ids)
+            if removed:
+                self._ids = self._ids - chat_ids
+                self._added -= chat_ids
+                self._removed |= chat_ids
+                self._schedule_save()
+        return removed
+
+    def replace(self, chat_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._ids = frozenset(chat_ids)
+            self._added, self._removed, self._replaced = set(), set(), True
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes now"""
+        with self._lock:
+            if self._timer is None:
+                return
+            self._timer.cancel()
+            self._timer = None
+            try:
+                tmp_file = self.storage_file.with_suffix(".tmp")
+                with FileLock(str(self.storage_file) + ".lock"):
+                    # Another process (src/bot.py) may have written since the last
+                    # lookup: apply our changes to its set instead of overwriting it
+                    if not self._replaced and self._stat() not in (None, self._mtime):
+                        self._ids = (self._read() - self._removed) | self._added
+                    encrypted = self.cipher.encrypt(json.dumps({"chat_ids": sorted(self._ids)}).encode())
+                    with open(tmp_file, "wb") as f:
+                        f.write(encrypted)
+                    tmp_file.chmod(0o600)
+                    os.replace(tmp_file, self.storage_file)
+                self._mtime = self._stat()
+                self._added, self._removed, self._replaced = set(), set(), False
+            except Exception as e:
+                self.logger.error(f"Failed to save chat IDs: {e}")
+
+    def __len__(self) -> int:
+        return len(self.ids())
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self.ids()
+
+
+class SubscriberService:
+    def __init__(
+        self,
+        token: str,
+        store: SubscriberStore,
+        base_url: Optional[str] = None,
+        webhook_url: Optional[str] = None,
+        webhook_listen: str = '0.0.0.0',
+        webhook_port: int = 8443,
+        webhook_secret: Optional[str] = None
+        ):
+        """
+        The single Telegram update consumer: answers /start and /help and
+        registers subscribers.
+
+        Only one process may poll a bot token, so the detector either runs
+        this service in-process or reads the store written by the standalone
+        bot (src/bot.py), never both.
+
+        Args:
+            token (str): Bot token
+            store (SubscriberStore): Subscriber store shared with the alert sender
+            base_url (str): Bot API base URL (e.g. a local stand-in)
+            webhook_url (str): Public HTTPS URL for webhook mode, long polling if unset
+            webhook_listen (str): Interface the webhook receiver binds
+            webhook_port (int): Port the webhook receiver binds, 0 picks a free one
+            webhook_secret (str): Expected X-Telegram-Bot-Api-Secret-Token header
+        """
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.webhook_url = webhook_url
+        self.webhook_listen = webhook_listen
+        self.webhook_port = webhook_port
+        self.webhook_secret = webhook_secret
+        self._server: Optional[ThreadingHTTPServer] = None
+
+        builder = Application.builder().token(token)
+        if base_url:
+            builder = builder.base_url(base_url)
+        if webhook_url:
+            # Updates arrive through our receiver instead of the polling updater
+            builder = builder.updater(None)
+        self.application = builder.build()
+        self.application.add_handler(TypeHandler(Update, self._register), group=-1)
+        self.application.add_handlers([
+            CommandHandler("start", start_command),
+            CommandHandler("help", help_command),
+            CommandHandler("stop", self._unsubscribe),
+            CallbackQueryHandler(button_handler),
+        ])
+
+    async def _register(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Subscribe every chat that messages the bot (runs before the command handlers)"""
+        message = update.message
+        if message and message.chat_id and not (message.text or '').startswith('/stop'):
+            self.store.add(message.chat_id)
+
+    async def _unsubscribe(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /stop command"""
+        if update.message:
+            self.store.remove([update.message.chat_id])
+            await update.message.reply_text("🔕 You will no longer receive alerts. Send /start to resubscribe.")
+
+    @property
+    def webhook_address(self) -> Optional[tuple]:
+        """(host, port) the webhook receiver is bound to"""
+        return self._server.server_address if self._server else None
+
+    async def start(self) -> None:
+        """Start consuming updates on the running event loop"""
+        await self.application.initialize()
+        await self.application.start()
+        if self.webhook_url:
+            self._start_webhook_server(asyncio.get_running_loop())
+            await self.application.bot.set_webhook(
+                self.webhook_url, secret_token=self.webhook_secret or None,
+                allowed_updates=ALLOWED_UPDATES)
+            self.logger.info(f"Subscriber service receiving webhooks on port {self.webhook_address[1]}")
+        else:
+            await self.application.updater.start_polling(allowed_updates=ALLOWED_UPDATES)
+            self.logger.info("Subscriber service polling for updates")
+
+    async def stop(self) -> None:
+        if self._server:
+            await asyncio.get_running_loop().run_in_executor(None, self._server.shutdown)
+            self._server.server_close()
+            self._server = None
+        if self.application.updater and self.application.updater.running:
+            await self.application.updater.stop()
+        if self.application.running:
+            await self.application.stop()
+        await self.application.shutdown()
+        self.store.flush()
+
+    def run(self) -> None:
+        """Serve until interrupted (standalone bot process)"""
+        async def serve():
+            await self.start()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await self.stop()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+
+    def _start_webhook_server(self, loop: asyncio.AbstractEventLoop) -> None:
+        service = self
+        path = urlsplit(self.webhook_url).path or '/'
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path != path:
+                    return self._reply(404)
+                if service.webhook_secret and \
+                        self.headers.get('X-Telegram-Bot-Api-Secret-Token') != service.webhook_secret:
+                    return self._reply(403)
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    update = Update.de_json(json.loads(self.rfile.read(length)), service.application.bot)
+                    asyncio.run_coroutine_threadsafe(
+                        service.application.update_queue.put(update), loop).result(timeout=5)
+                except Exception as e:
+                    service.logger.error(f"Rejected webhook update: {e}")
+                    return self._reply(400)
+                self._reply(200)
+
+            def _reply(self, status):
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.webhook_listen, self.webhook_port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever,
+                         name="telegram-webhook", daemon=True).start()
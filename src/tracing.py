@@ -0,0 +1,174 @@
+import functools
+import itertools
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, cat: str, args: Optional[dict]):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def set(self, **args) -> None:
+        """Attach arguments known only inside the span (e.g. the number of boxes)"""
+        self.args = {**(self.args or {}), **args}
+
+    def __enter__(self) -> '_Span':
+        self.start = self.tracer.clock()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.tracer.record(self.name, self.cat, self.start, self.tracer.clock(), self.args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **args) -> None:
+        pass
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        enabled: bool = True,
+        clock: Callable[[], int] = time.perf_counter_ns
+        ):
+        """
+        Span recorder with a fixed-size ring buffer.
+
+        Recording a span is a slot assignment in a preallocated list, without
+        locks or allocation beyond the span tuple; when the ring is full the
+        oldest spans are overwritten. The buffer is exported on demand as
+        Chrome trace JSON, which chrome://tracing and ui.perfetto.dev show
+        as per-thread timelines.
+
+        Args:
+            capacity (int): Spans kept
+            enabled (bool): False turns span() into a shared no-op
+            clock (callable): Nanosecond monotonic clock, replaceable in tests
+        """
+        self.logger = logging.getLogger(__name__)
+        self.clock = clock
+        self.enabled = enabled
+        self._threads: Dict[int, str] = {}
+        self._reset(capacity)
+
+    def _reset(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._ring: List[Optional[tuple]] = [None] * capacity
+        self._next = itertools.count()  # next() is atomic under the GIL
+
+    def configure(self, enabled: Optional[bool] = None, capacity: Optional[int] = None) -> None:
+        """Switch recording on or off, or resize the ring (which clears it)"""
+        if enabled is not None:
+            self.enabled = enabled
+        if capacity is not None and capacity != self.capacity:
+            self._reset(capacity)
+
+    def span(self, name: str, cat: str = 'app', **args):
+        """Context manager timing a block: `with tracer.span('detector.inference'):`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args or None)
+
+    def traced(self, name: Optional[str] = None, cat: str = 'app'):
+        """Decorator recording a span per call, named after the function by default"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = self.clock()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, cat, start, self.clock())
+            return wrapper
+        return decorator
+
+    def record(self, name: str, cat: str, start_ns: int, end_ns: int, args: Optional[dict] = None) -> None:
+        """Store a finished span of the calling thread"""
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._ring[next(self._next) % self.capacity] = (name, cat, tid, start_ns, end_ns, args)
+
+    def spans(self) -> List[tuple]:
+        """Buffered spans (name, cat, tid, start_ns, end_ns, args), oldest first"""
+        return sorted((s for s in list(self._ring) if s is not None), key=lambda s: s[3])
+
+    def clear(self) -> None:
+        self._reset(self.capacity)
+
+    def chrome_trace(self) -> dict:
+        """Buffered spans as a Chrome trace event document"""
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in list(self._threads.items())]  # record() may add threads meanwhile
+        for name, cat, tid, start, end, args in self.spans():
+            event = {'name': name, 'cat': cat, 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': start / 1000, 'dur': (end - start) / 1000}
+            if args:
+                event['args'] = args
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, directory: Path) -> Path:
+        """Write the buffer to `<directory>/trace-<time>.json`"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"trace-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.json"
+        trace = self.chrome_trace()
+        with open(path, 'w') as f:
+            json.dump(trace, f, default=str)
+        spans = sum(event['ph'] == 'X' for event in trace['traceEvents'])
+        self.logger.info(f"Trace with {spans} spans written to {path}")
+        return path
+
+    def install_signal_handler(
+        self,
+        directory: Path,
+        signum: Optional[int] = getattr(signal, 'SIGUSR1', None)
+        ) -> bool:
+        """
+        Dump the buffer whenever the process receives `signum` (SIGUSR1), e.g.
+        `kill -USR1 <pid>`. The handler only starts a thread that writes the
+        dump, so the interrupted code never waits on the tracer's lock or I/O.
+
+        Returns:
+            bool: False where the signal does not exist (Windows) or when not
+                called from the main thread, which alone may install handlers
+        """
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signum, lambda *_: threading.Thread(
+            target=self.dump, args=(directory,), name='trace-dump', daemon=True).start())
+        return True
+
+
+# Process-wide tracer shared by the detector, notification service and entry points
+tracer = Tracer()
@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+
+def content_hash(data: bytes) -> str:
+    """Hex SHA-256 of the image bytes, used as cache key and blob name"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class UploadCache:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 24 * 3600,
+        clock: Callable[[], float] = time.monotonic
+        ):
+        """
+        LRU/TTL map from image content hash to uploaded URL.
+
+        Identical images (re-sent alerts, retries from the outbox, the same
+        frame going to several channels) reuse one upload. Concurrent
+        requests for the same content wait for the upload already in flight
+        instead of starting another one.
+
+        Args:
+            max_entries (int): URLs kept before the least recently used is evicted
+            ttl (float): Default seconds a URL stays valid
+            clock (callable): Monotonic time source, replaceable in tests
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (url, expires_at)
+        self._in_flight = {}  # key -> Future of the running upload
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached URL for a key, or None if missing or expired"""
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        url, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return url
+
+    def put(self, key: str, url: str, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, url, ttl)
+
+    def _store(self, key: str, url: str, ttl: Optional[float]) -> None:
+        self._entries[key] = (url, self.clock() + (self.ttl if ttl is None else ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_upload(self, data: bytes, upload: Callable[[bytes, str], Optional[str]],
+                      namespace: str = 'public', ttl: Optional[float] = None) -> Optional[str]:
+        """
+        Return the URL for `data`, uploading it only if no valid URL is cached.
+
+        Args:
+            data (bytes): Encoded image
+            upload (callable): Called with (data, content hash), returns a URL or None
+            namespace (str): Separates kinds of URLs for the same content (e.g. public, signed)
+            ttl (float): Validity of a new URL, defaults to the cache TTL
+
+        Returns:
+            str: The URL, or None if the upload failed (failures are not cached)
+        """
+        digest = content_hash(data)
+        key = f"{namespace}:{digest}"
+        with self._lock:
+            url = self._lookup(key)
+            if url is not None:
+                self.hits += 1
+                return url
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            # Same content is already being uploaded by another thread
+            return future.result()
+
+        url = None
+        try:
+            url = upload(data, digest)
+        except Exception as e:
+            self.logger.error(f"Upload of {digest[:12]} failed: {e}")
+        finally:
+            with self._lock:
+                if url:
+                    self._store(key, url, ttl)
+                del self._in_flight[key]
+            future.set_result(url)
+        return url
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,97 @@
+import argparse
+import os
+import re
+import time
+import cv2
+import numpy as np
+from src.config import Config
+from src.notification_service import NotificationService
+from tests.fake_services import FakeProviders
+
+TAG = re.compile(r'bench-alert-(\d+)')
+
+
+def percentiles(latencies):
+    if not latencies:
+        return "no deliveries"
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return f"p50 {p50:.0f} ms | p95 {p95:.0f} ms | p99 {p99:.0f} ms | max {max(latencies) * 1000:.0f} ms"
+
+
+def delivery_times(requests, field, fan_out=1):
+    """Alert number -> time its last delivery of the fan-out was accepted"""
+    times, counts = {}, {}
+    for entry in requests:
+        match = TAG.search(entry.get(field) or '')
+        if match:
+            alert = int(match[1])
+            counts[alert] = counts.get(alert, 0) + 1
+            times[alert] = max(times.get(alert, 0), entry['time'])
+    return {alert: t for alert, t in times.items() if counts[alert] >= fan_out}
+
+
+def run_benchmark(alerts: int, rate: float, chats: int, whatsapp: str, latency: float,
+                  failure_rate: float, rate_limit: float, timeout: float):
+    with FakeProviders(latency=latency, failure_rate=failure_rate, rate_limit=rate_limit,
+                       chat_ids=range(1000, 1000 + chats)) as providers:
+        os.environ.update(providers.environ(whatsapp=whatsapp))
+        service = NotificationService(providers.config(Config))
+
+        base = (np.random.default_rng(0).random((720, 1280, 3)) * 255).astype(np.uint8)
+        detected = {}
+        start = time.monotonic()
+        for i in range(alerts):
+            # Each alert gets its own frame, like a storm across cameras would
+            frame = cv2.putText(base.copy(), str(i), (100, 400), cv2.FONT_HERSHEY_SIMPLEX,
+                                8, (255, 255, 255), 20)
+            detected[i] = time.monotonic()
+            service.send_alert(frame, 'Fire', details=f'bench-alert-{i}')
+            time.sleep(max(0.0, start + (i + 1) / rate - time.monotonic()))
+
+        whatsapp_fake = providers.twilio if whatsapp == 'twilio' else providers.callmebot
+        field = 'body' if whatsapp == 'twilio' else 'text'
+
+        def delivered():
+            return (delivery_times(whatsapp_fake.messages(), field),
+                    delivery_times(providers.telegram.sent_messages(), 'caption', chats))
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            whatsapp_times, telegram_times = delivered()
+            if len(whatsapp_times) == alerts and len(telegram_times) == alerts:
+                break
+            time.sleep(0.1)
+        elapsed = time.monotonic() - start
+        service.cleanup()
+
+    print(f"Alerts: {alerts} at {rate:.0f}/s | WhatsApp via {whatsapp} | Telegram chats: {chats} | "
+          f"Latency: {latency * 1000:.0f} ms | Failure rate: {failure_rate:.0%} | "
+          f"Rate limit: {rate_limit or 'none'}")
+    for channel, times in (('WhatsApp', whatsapp_times), ('Telegram', telegram_times)):
+        latencies = [t - detected[i] for i, t in times.items()]
+        print(f"{channel}: {len(times)}/{alerts} delivered | {percentiles(latencies)}")
+    print(f"All settled after {elapsed:.2f}s")
+    print(f"HTTP: {service.http_metrics()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Detection-to-delivery latency of alert storms against local fake providers')
+    parser.add_argument('--alerts', type=int, default=50)
+    parser.add_argument('--rate', type=float, default=10, help='Alerts per second')
+    parser.add_argument('--chats', type=int, default=5, help='Telegram subscribers')
+    parser.add_argument('--whatsapp', choices=['twilio', 'callmebot'], default='twilio')
+    parser.add_argument('--latency', type=float, default=0.05, help='Provider latency in seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--rate-limit', type=float, default=0, help='Requests per second per provider')
+    parser.add_argument('--timeout', type=float, default=120, help='Seconds to wait for deliveries')
+    args = parser.parse_args()
+    run_benchmark(args.alerts, args.rate, args.chats, args.whatsapp, args.latency,
+                  args.failure_rate, args.rate_limit, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
+
+
+# correct way to run the code is python -m tests.bench_alert_latency
@@ -0,0 +1,102 @@
+import argparse
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from tests.clean_labels import YOLODatasetPreprocessor
+from tests.clean_labels_dummy_data import generate_synthetic_dataset
+
+
+def dataset_digest(root: Path) -> str:
+    """Hash of every label file's name and content"""
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob('*.txt')):
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def run_benchmark(files_per_split: int, worker_counts, chunksize: int, engines, boxes):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = Path(tmp_dir) / 'source'
+        generate_synthetic_dataset(source, files_per_split, boxes_per_file=boxes)
+        print(f"Dataset: {files_per_split * 3} label files of {boxes[0]}-{boxes[1]} boxes | CPUs: {os.cpu_count()}")
+
+        baseline = None
+        runs = [(engine, workers) for engine in engines for workers in worker_counts]
+        for engine, workers in runs:
+            dataset = Path(tmp_dir) / f'{engine}_{workers}'
+            shutil.copytree(source, dataset)
+            preprocessor = YOLODatasetPreprocessor(str(dataset), incremental=False)
+            preprocessor.logger.setLevel(logging.ERROR)  # Per-label warnings would dominate the timing
+
+            start = time.perf_counter()
+            stats = preprocessor.process_labels(
+                workers=workers, chunksize=chunksize, vectorised=engine == 'numpy')
+            elapsed = time.perf_counter() - start
+
+            digest = dataset_digest(dataset)
+            if baseline is None:
+                baseline = (elapsed, digest, stats)
+            identical = digest == baseline[1] and stats == baseline[2]
+            files = sum(s['files'] for s in stats.values())
+            print(f"{engine:6s} | Workers: {workers:2d} | {elapsed:.2f}s | {files / elapsed:.0f} files/s | "
+                  f"speedup {baseline[0] / elapsed:.2f}x | identical to first run: {identical}")
+            shutil.rmtree(dataset)
+        print(f"Stats: {baseline[2]}")
+
+
+def run_incremental_benchmark(files_per_split: int, churn: float):
+    """Full validate/clean/validate pass, then a re-run after changing a fraction of the labels"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset = Path(tmp_dir) / 'dataset'
+        generate_synthetic_dataset(dataset, files_per_split)
+        labels = sorted(dataset.rglob('labels/*.txt'))
+        print(f"Dataset: {len(labels)} label files | churn: {churn:.1%}")
+
+        def run(label, force=False):
+            preprocessor = YOLODatasetPreprocessor(str(dataset))
+            preprocessor.logger.setLevel(logging.ERROR)
+            start = time.perf_counter()
+            preprocessor.validate_dataset(force=force)
+            stats = preprocessor.process_labels(workers=1, force=force)
+            preprocessor.validate_dataset(force=force)
+            elapsed = time.perf_counter() - start
+            preprocessor.manifest.close()
+            cleaned = sum(s['files'] for s in stats.values())
+            print(f"{label:<22} | {elapsed:.2f}s | cleaned {cleaned} files")
+
+        run('First run (full)')
+        run('Re-run, no changes')
+        changed = labels[::max(1, int(1 / churn))] if churn else []
+        for path in changed:
+            with open(path, 'a') as f:
+                f.write("0 0.5 0.5 0.2 0.2\n")
+        run(f'Re-run, {len(changed)} changed')
+        run('Forced full pass', force=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Label cleaning throughput by parser and worker count')
+    parser.add_argument('--files', type=int, default=5000, help='Label files per split')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunksize', type=int, default=64)
+    parser.add_argument('--engines', nargs='+', choices=['python', 'numpy'], default=['python', 'numpy'])
+    parser.add_argument('--boxes', type=int, nargs=2, default=[1, 8], help='Range of boxes per file')
+    parser.add_argument('--churn', type=float, default=None,
+                        help='Benchmark incremental re-runs with this fraction of labels changed instead')
+    args = parser.parse_args()
+    if args.churn is not None:
+        run_incremental_benchmark(args.files, args.churn)
+    else:
+        run_benchmark(args.files, args.workers, args.chunksize, args.engines, args.boxes)
+
+
+if __name__ == '__main__':
+    main()
+
+
+# correct way to run the code is python -m tests.bench_clean_labels
@@ -0,0 +1,70 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from tests.fake_services import FakeWebhook
+from src.http_client import HttpClient
+from src.outbox import Outbox
+
+
+def run_benchmark(alerts: int, workers: int, queue_size: int, latency: float,
+                  failure_rate: float, backpressure: str):
+    http = HttpClient(max_retries=0, pool_maxsize=workers)
+    image = b'\xff\xd8' + bytes(60 * 1024)  # Typical alert JPEG size
+
+    with FakeWebhook(latency=latency, failure_rate=failure_rate) as whatsapp, \
+            FakeWebhook(latency=latency, failure_rate=failure_rate) as telegram, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+
+        def handler(service):
+            def deliver(alert):
+                response = http.post(f"{service.url}/send", data={'alert': alert['id']},
+                                     files={'image': ('alert.jpg', alert['image'], 'image/jpeg')})
+                return response.status_code == 200
+            return deliver
+
+        outbox = Outbox(Path(tmp_dir) / 'outbox.db',
+                        {'whatsapp': handler(whatsapp), 'telegram': handler(telegram)},
+                        workers=workers, queue_size=queue_size, backpressure=backpressure,
+                        base_delay=0.05, max_delay=0.5, poll_interval=0.05).start()
+
+        start = time.monotonic()
+        for _ in range(alerts):
+            outbox.enqueue('Fire', image, ['whatsapp', 'telegram'])
+        enqueued = time.monotonic() - start
+        # Failed deliveries come back after their backoff, so wait until all settle
+        while True:
+            outbox.wait_idle(timeout=120)
+            stats = outbox.stats()
+            if all(set(states) <= {'sent', 'dead'} for states in stats['channels'].values()):
+                break
+            time.sleep(0.05)
+        elapsed = time.monotonic() - start
+        outbox.close()
+
+    deliveries = alerts * 2
+    print(f"Alerts: {alerts} | Workers: {workers} | Queue: {queue_size} ({backpressure}) | "
+          f"Latency: {latency * 1000:.0f} ms | Failure rate: {failure_rate:.0%}")
+    print(f"Enqueue: {alerts / enqueued:.0f} alerts/s ({enqueued * 1000 / alerts:.2f} ms each)")
+    print(f"Delivery: {deliveries / elapsed:.0f} deliveries/s, all settled after {elapsed:.2f}s")
+    print(f"Outcome: {stats['channels']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Outbox throughput benchmark against local fake channels')
+    parser.add_argument('--alerts', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--queue-size', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.02, help='Fake channel latency in seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.1)
+    parser.add_argument('--backpressure', choices=['spill', 'block'], default='spill')
+    args = parser.parse_args()
+    run_benchmark(args.alerts, args.workers, args.queue_size, args.latency,
+                  args.failure_rate, args.backpressure)
+
+
+if __name__ == '__main__':
+    main()
+
+
+# correct way to run the code is python -m tests.bench_outbox
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from cryptography.fernet import Fernet
+from tests import PROJECT_ROOT
+from tests.fake_services import FakeTelegramAPI
+from src.notification_service import FlareGuardBot
+
+
+async def run_benchmark(chats: int, concurrency: int, latency: float):
+    # Throwaway key: the benchmark keeps its subscriber store in a temp dir
+    os.environ["ENCRYPTION_KEY"] = Fernet.generate_key().decode()
+    image_path = PROJECT_ROOT / 'data' / 'test_image.png'
+
+    with FakeTelegramAPI(latency=latency, per_chat_interval=1.0, global_rate=30) as api, \
+            tempfile.TemporaryDirectory() as storage_dir:
+        bot = FlareGuardBot(api.token, base_url=api.base_url,
+                            max_concurrency=concurrency, storage_dir=Path(storage_dir))
+        bot.chat_ids = set(range(1, chats + 1))
+        await bot._ensure_session()
+
+        start = time.monotonic()
+        await bot.send_alert(image_path, "🔧 Benchmark")
+        elapsed = time.monotonic() - start
+        await bot.shutdown()
+
+        delivery = sorted(r['time'] - start for r in api.sent_messages())
+        print(f"Chats: {chats} | Concurrency: {concurrency} | API latency: {latency * 1000:.0f} ms")
+        print(f"Delivered: {len(delivery)} | Photo uploads: {api.uploads}")
+        print(f"Total time: {elapsed:.2f}s")
+        if delivery:
+            print(f"Delivery p50: {statistics.median(delivery):.2f}s | "
+                  f"p95: {delivery[int(len(delivery) * 0.95) - 1]:.2f}s | "
+                  f"last: {delivery[-1]:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Telegram fan-out benchmark against a local fake API')
+    parser.add_argument('--chats', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.05, help='Fake API latency in seconds')
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.chats, args.concurrency, args.latency))
+
+
+if __name__ == '__main__':
+    main()
+
+
+# correct way to run the code is python -m tests.bench_telegram_fanout
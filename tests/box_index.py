@@ -0,0 +1,287 @@
+import argparse
+import logging
+import os
+import time
+import numpy as np
+from tests import TEST_DATA_DIR
+
+INDEX_NAME = '.box_index.npz'
+SPLITS = ('train', 'valid', 'test')
+FIELDS = ('cx', 'cy', 'w', 'h')
+
+
+def parse_label_text(text):
+    """
+    Boxes of one label file as (class ids, N x 4 cx/cy/w/h), polygons reduced
+    to their bounding box; malformed rows are counted and skipped.
+    """
+    classes, boxes, skipped = [], [], 0
+    for line in text.splitlines():
+        parts = line.split()
+        try:
+            if len(parts) == 5:
+                box = [float(v) for v in parts[1:]]
+            elif len(parts) >= 7 and len(parts) % 2 == 1:
+                coords = [float(v) for v in parts[1:]]
+                xs, ys = coords[0::2], coords[1::2]
+                w, h = max(xs) - min(xs), max(ys) - min(ys)
+                box = [min(xs) + w / 2, min(ys) + h / 2, w, h]
+            else:
+                skipped += bool(parts)
+                continue
+            classes.append(int(parts[0]))
+            boxes.append(box)
+        except ValueError:
+            skipped += 1
+    return classes, boxes, skipped
+
+
+class BoxIndex:
+    def __init__(self, dataset_path, names=None):
+        """
+        Columnar index of every box in a YOLO dataset.
+
+        One array per column (image, class, cx, cy, w, h) plus a per-image
+        table with each label file's split, size/mtime and malformed rows, so
+        statistics and filters are NumPy operations instead of label rescans,
+        and updates only re-read changed files.
+
+        Args:
+            dataset_path (str): Dataset root holding the split directories
+            names (dict): Class id -> name used in reports
+        """
+        self.dataset_path = dataset_path
+        self.names = names or {}
+        self.logger = logging.getLogger(__name__)
+        # Per image
+        self.image_names = np.array([], dtype=str)
+        self.image_split = np.array([], dtype=np.int8)
+        self.image_size = np.array([], dtype=np.int64)
+        self.image_mtime = np.array([], dtype=np.int64)
+        self.image_skipped = np.array([], dtype=np.int32)  # Malformed rows
+        # Per box
+        self.image = np.array([], dtype=np.int32)
+        self.cls = np.array([], dtype=np.int16)
+        self.boxes = np.zeros((0, 4), dtype=np.float32)
+
+    @property
+    def path(self):
+        return os.path.join(self.dataset_path, INDEX_NAME)
+
+    @property
+    def skipped(self):
+        """Malformed rows in the indexed label files"""
+        return int(self.image_skipped.sum())
+
+    def __len__(self):
+        return len(self.cls)
+
+    # Building
+
+    @classmethod
+    def open(cls, dataset_path, names=None, update=True):
+        """Load the saved index (if any) and bring it up to date with the labels"""
+        index = cls(dataset_path, names)
+        if os.path.exists(index.path):
+            with np.load(index.path) as data:
+                # Indexes saved without per-image skipped counts are rebuilt from the labels
+                if 'image_skipped' in data.files:
+                    index.image_names = data['image_names']
+                    index.image_split = data['image_split']
+                    index.image_size = data['image_size']
+                    index.image_mtime = data['image_mtime']
+                    index.image_skipped = data['image_skipped']
+                    index.image = data['image']
+                    index.cls = data['cls']
+                    index.boxes = data['boxes']
+        if update:
+            index.update()
+        return index
+
+    def _scan(self):
+        """(split id, relative path, size, mtime_ns) of every label file"""
+        for split_id, split in enumerate(SPLITS):
+            labels_dir = os.path.join(self.dataset_path, split, 'labels')
+            if not os.path.isdir(labels_dir):
+                continue
+            with os.scandir(labels_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.txt'):
+                        stat = entry.stat()
+                        yield split_id, f"{split}/labels/{entry.name}", stat.st_size, stat.st_mtime_ns
+
+    def update(self):
+        """
+        Re-read new and changed label files and drop deleted ones.
+
+        Returns:
+            int: Label files parsed
+        """
+        start = time.perf_counter()
+        scanned = sorted(self._scan(), key=lambda entry: entry[1])
+        known = {name: i for i, name in enumerate(self.image_names.tolist())}
+        keep_images = np.zeros(len(self.image_names), dtype=bool)
+        changed = []
+        for split_id, name, size, mtime in scanned:
+            i = known.get(name)
+            if i is not None and self.image_size[i] == size and self.image_mtime[i] == mtime:
+                keep_images[i] = True
+            else:
+                changed.append((split_id, name, size, mtime))
+        if not changed and keep_images.all():
+            return 0
+
+        # Unchanged images keep their boxes; ids are renumbered densely
+        new_id = np.cumsum(keep_images) - 1
+        keep_boxes = keep_images[self.image]
+        image_ids = [new_id[self.image[keep_boxes]]]
+        classes = [self.cls[keep_boxes]]
+        boxes = [self.boxes[keep_boxes]]
+
+        first_new = int(keep_images.sum())
+        new_classes, new_boxes, new_images, new_skipped = [], [], [], []
+        for offset, (_, name, _, _) in enumerate(changed):
+            with open(os.path.join(self.dataset_path, name)) as f:
+                file_classes, file_boxes, skipped = parse_label_text(f.read())
+            new_skipped.append(skipped)
+            new_classes.extend(file_classes)
+            new_boxes.extend(file_boxes)
+            new_images.extend([first_new + offset] * len(file_classes))
+        image_ids.append(np.array(new_images, dtype=np.int32))
+        classes.append(np.array(new_classes, dtype=np.int16))
+        boxes.append(np.array(new_boxes, dtype=np.float32).reshape(-1, 4))
+
+        self.image = np.concatenate(image_ids).astype(np.int32)
+        self.cls = np.concatenate(classes)
+        self.boxes = np.concatenate(boxes)
+        self.image_names = np.concatenate([self.image_names[keep_images], [c[1] for c in changed]])
+        self.image_split = np.concatenate([self.image_split[keep_images],
+                                           np.array([c[0] for c in changed], dtype=np.int8)])
+        self.image_size = np.concatenate([self.image_size[keep_images],
+                                          np.array([c[2] for c in changed], dtype=np.int64)])
+        self.image_mtime = np.concatenate([self.image_mtime[keep_images],
+                                           np.array([c[3] for c in changed], dtype=np.int64)])
+        self.image_skipped = np.concatenate([self.image_skipped[keep_images],
+                                             np.array(new_skipped, dtype=np.int32)])
+        self.logger.info(f"Box index updated: {len(changed)} label files parsed, "
+                         f"{len(keep_images) - first_new} removed or replaced, "
+                         f"{len(self)} boxes in {time.perf_counter() - start:.2f}s")
+        return len(changed)
+
+    def save(self):
+        """Write the index next to the dataset's splits"""
+        tmp = self.path + '.tmp.npz'
+        np.savez(tmp, image_names=self.image_names, image_split=self.image_split,
+                 image_size=self.image_size, image_mtime=self.image_mtime, image_skipped=self.image_skipped,
+                 image=self.image, cls=self.cls, boxes=self.boxes)
+        os.replace(tmp, self.path)
+
+    # Queries
+
+    def column(self, field):
+        """A box column by name: cx, cy, w, h, area, class or split"""
+        if field in FIELDS:
+            return self.boxes[:, FIELDS.index(field)]
+        if field == 'area':
+            return self.boxes[:, 2] * self.boxes[:, 3]
+        if field == 'class':
+            return self.cls
+        if field == 'split':
+            return self.image_split[self.image]
+        raise KeyError(field)
+
+    def select(self, split=None, classes=None, min_area=None, max_area=None, **ranges):
+        """
+        Boolean mask over boxes matching every condition.
+
+        Args:
+            split (str): Only boxes of this split
+            classes (int or list): Only these class ids
+            min_area (float): Minimum w * h, as a fraction of the image
+            max_area (float): Maximum w * h, as a fraction of the image
+            **ranges: (low, high) bounds per column, e.g. w=(0.0, 0.05)
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if split is not None:
+            mask &= self.column('split') == SPLITS.index(split)
+        if classes is not None:
+            mask &= np.isin(self.cls, np.atleast_1d(classes))
+        if min_area is not None:
+            mask &= self.column('area') >= min_area
+        if max_area is not None:
+            mask &= self.column('area') < max_area
+        for field, (low, high) in ranges.items():
+            values = self.column(field)
+            mask &= (values >= low) & (values <= high)
+        return mask
+
+    def boxes_per_image(self, mask=None):
+        """Number of (selected) boxes of every image, indexed by image id"""
+        image = self.image if mask is None else self.image[mask]
+        return np.bincount(image, minlength=len(self.image_names))
+
+    def images(self, mask=None, min_boxes=1):
+        """Label files with at least `min_boxes` selected boxes"""
+        counts = self.boxes_per_image(mask)
+        return self.image_names[counts >= min_boxes].tolist()
+
+    def histogram(self, field, bins=10, mask=None, range=None):
+        """(counts, bin edges) of a column over the (selected) boxes"""
+        values = self.column(field)
+        return np.histogram(values if mask is None else values[mask], bins=bins, range=range)
+
+    def class_balance(self):
+        """Box count per split and class name"""
+        split = self.column('split')
+        balance = {}
+        for split_id, split_name in enumerate(SPLITS):
+            counts = np.bincount(self.cls[split == split_id])
+            if len(counts):
+                balance[split_name] = {self.names.get(c, c): int(n) for c, n in enumerate(counts) if n}
+        return balance
+
+    def summary(self):
+        """Per split image and box counts, class balance and box size statistics"""
+        report = {}
+        balance = self.class_balance()
+        split = self.column('split')
+        area = self.column('area')
+        counts = self.boxes_per_image()
+        for split_id, split_name in enumerate(SPLITS):
+            images = self.image_split == split_id
+            if not images.any():
+                continue
+            in_split = split == split_id
+            report[split_name] = {
+                'images': int(images.sum()),
+                'empty_images': int((counts[images] == 0).sum()),
+                'boxes': int(in_split.sum()),
+                'max_boxes_per_image': int(counts[images].max()),
+                'mean_area': float(area[in_split].mean()) if in_split.any() else 0.0,
+                'classes': balance.get(split_name, {}),
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or update the box index of a YOLO dataset and report on it')
+    parser.add_argument('dataset', nargs='?', default=str(TEST_DATA_DIR))
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the saved index')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
+    if args.rebuild and os.path.exists(os.path.join(args.dataset, INDEX_NAME)):
+        os.remove(os.path.join(args.dataset, INDEX_NAME))
+    index = BoxIndex.open(args.dataset)
+    index.save()
+    for split, stats in index.summary().items():
+        print(f"{split}: {stats}")
+    if index.skipped:
+        print(f"Skipped malformed rows: {index.skipped}")
+
+
+if __name__ == '__main__':
+    main()
+
+
+# correct way to run the code is python -m tests.box_index
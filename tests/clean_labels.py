@@ -1,13 +1,264 @@
 import os
-import shutil
+import re
 import numpy as np
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from tests import TEST_DATA_DIR
+from tests.dataset_manifest import DatasetManifest
+from tests.dataset_snapshots import SnapshotStore
+from tests.image_integrity import check_images, image_files
+
+MANIFEST_NAME = '.preprocess_manifest.db'
+
+
+def is_valid_bbox(bbox_coords):
+    """Validate YOLO bbox coordinates"""
+    return (len(bbox_coords) == 4 and
+            all(0 <= coord <= 1 for coord in bbox_coords))
+
+
+@dataclass
+class LabelFileResult:
+    processed: int = 0  # Labels converted, dropped or deduplicated
+    duplicates: int = 0
+    messages: list = field(default_factory=list)  # (level, message) to log
+
+
+def clean_lines(lines, label_file, result):
+    """
+    Validate and convert labels one line at a time, the reference implementation.
+
+    Returns:
+        tuple: Cleaned lines and, per line, its (class, cx, cy, w, h) values
+    """
+    cleaned_lines = []
+    keys = []
+
+    for line in lines:
+        parts = line.strip().split()
+
+        # Validate basic label structure
+        if len(parts) < 5:
+            result.messages.append((logging.WARNING, f"Invalid label in {label_file}: {line.strip()}"))
+            result.processed += 1
+            continue
+
+        try:
+            class_idx = int(parts[0])
+            coords = list(map(float, parts[1:]))
+
+            # Standard YOLO bbox
+            if is_valid_bbox(coords):
+                cleaned_lines.append(line)
+                keys.append((class_idx, *coords))
+                continue
+
+            # Polygon conversion attempt
+            if len(coords) >= 6 and len(coords) % 2 == 0:
+                x_coords = coords[0::2]
+                y_coords = coords[1::2]
+
+                x_min, x_max = min(x_coords), max(x_coords)
+                y_min, y_max = min(y_coords), max(y_coords)
+
+                width = round(x_max - x_min, 5)
+                height = round(y_max - y_min, 5)
+
+                center_x = round(x_min + width / 2, 5)
+                center_y = round(y_min + height / 2, 5)
+
+                new_bbox = [center_x, center_y, width, height]
+
+                if is_valid_bbox(new_bbox):
+                    cleaned_lines.append(
+                        f"{class_idx} {new_bbox[0]} {new_bbox[1]} {new_bbox[2]} {new_bbox[3]}\n")
+                    keys.append((class_idx, *new_bbox))
+                    result.processed += 1
+                else:
+                    result.messages.append((logging.WARNING, f"Invalid converted bbox in {label_file}"))
+            else:
+                result.messages.append(
+                    (logging.WARNING, f"Unprocessable label in {label_file}: {line.strip()}"))
+
+        except (ValueError, IndexError) as e:
+            result.messages.append(
+                (logging.ERROR, f"Error processing label in {label_file}: {line.strip()} - {e}"))
+
+    return cleaned_lines, keys
+
+
+# Below this many lines NumPy's per-call overhead outweighs the per-line savings
+VECTORISE_MIN_LINES = 64
+# Files made only of these characters are plain decimal numbers; anything
+# else (nan, inf, digit separators, words) takes the line-by-line path
+NUMERIC_TEXT = re.compile(r'[0-9eE+\-.\s]*')
+# A first token int() would reject, e.g. "1.0" or "1e0"
+NON_INTEGER_CLASS = re.compile(r'^[ \t\f\v]*[^\s]*[.eE]', re.MULTILINE)
+
+
+def clean_lines_vectorised(lines, label_file, result):
+    """
+    Same output as clean_lines, with parsing, range checks and polygon
+    bounds computed on whole-file arrays.
+
+    Returns None, leaving result untouched, when the file holds anything
+    the array parser could read differently from Python's int/float; the
+    caller then uses clean_lines.
+    """
+    text = ''.join(lines)
+    if not NUMERIC_TEXT.fullmatch(text) or NON_INTEGER_CLASS.search(text):
+        return None
+    counts = np.fromiter((len(line.split()) for line in lines), dtype=np.int64, count=len(lines))
+    try:
+        # The whole ragged file as one flat array; rows are located by their token counts
+        values = np.fromstring(text, sep=' ')
+    except ValueError:
+        return None
+    if len(values) != counts.sum():  # e.g. "0.5-0.3" read as two numbers
+        return None
+    labelled = counts >= 5
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+    # Rows of exactly one box: class and four coordinates within [0, 1]
+    boxes = np.flatnonzero(counts == 5)
+    box_values = values[starts[boxes, None] + np.arange(5)]
+    box_valid = np.zeros(len(lines), dtype=bool)
+    box_valid[boxes] = ((box_values[:, 1:] >= 0) & (box_values[:, 1:] <= 1)).all(axis=1)
+    row_values = np.zeros((len(lines), 5))
+    row_values[boxes] = box_values
+
+    # Polygons: class and an even number (>= 6) of coordinates, bounds per row via reduceat
+    polygons = np.flatnonzero((counts >= 7) & (counts % 2 == 1))
+    converted = np.zeros(len(lines), dtype=bool)
+    converted_valid = np.zeros(len(lines), dtype=bool)
+    if len(polygons):
+        points = (counts[polygons] - 1) // 2
+        first_point = np.concatenate(([0], np.cumsum(points)[:-1]))
+        point_index = np.arange(points.sum()) - np.repeat(first_point, points)
+        x_index = np.repeat(starts[polygons] + 1, points) + 2 * point_index
+        xs, ys = values[x_index], values[x_index + 1]
+        x_min, x_max = np.minimum.reduceat(xs, first_point), np.maximum.reduceat(xs, first_point)
+        y_min, y_max = np.minimum.reduceat(ys, first_point), np.maximum.reduceat(ys, first_point)
+        # Python's round() (correctly rounded, unlike np.round) keeps the text identical to clean_lines
+        width = np.array([round(w, 5) for w in (x_max - x_min).tolist()])
+        height = np.array([round(h, 5) for h in (y_max - y_min).tolist()])
+        center_x = np.array([round(c, 5) for c in (x_min + width / 2).tolist()])
+        center_y = np.array([round(c, 5) for c in (y_min + height / 2).tolist()])
+        bbox = np.stack([center_x, center_y, width, height], axis=1)
+        converted[polygons] = True
+        converted_valid[polygons] = ((bbox >= 0) & (bbox <= 1)).all(axis=1)
+        row_values[polygons, 0] = values[starts[polygons]]
+        row_values[polygons, 1:] = bbox
+
+    # Python-level work only for the rows that are converted or reported
+    keep = box_valid | (converted & converted_valid)
+    cleaned = np.array(lines, dtype=object)
+    for index in np.flatnonzero(~box_valid).tolist():
+        line = lines[index]
+        if not labelled[index]:
+            result.messages.append((logging.WARNING, f"Invalid label in {label_file}: {line.strip()}"))
+            result.processed += 1
+        elif keep[index]:
+            cx, cy, w, h = row_values[index, 1:].tolist()
+            cleaned[index] = f"{int(line.split(None, 1)[0])} {cx} {cy} {w} {h}\n"
+            result.processed += 1
+        elif converted[index]:
+            result.messages.append((logging.WARNING, f"Invalid converted bbox in {label_file}"))
+        else:
+            result.messages.append(
+                (logging.WARNING, f"Unprocessable label in {label_file}: {line.strip()}"))
+
+    return cleaned[keep].tolist(), row_values[keep]
+
+
+def unique_rows(keys):
+    """
+    Indices of the first occurrence of each distinct label row, in order.
+
+    Rows compare by value, so "0 0.5 ..." and "0 0.50 ..." are duplicates.
+    """
+    if isinstance(keys, np.ndarray):
+        if len(keys) < 2:
+            return list(range(len(keys)))
+        # A stable sort puts each row's first occurrence at the head of its run of equal rows
+        order = np.lexsort(keys.T[::-1])
+        ordered = keys[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+        return np.sort(order[first]).tolist()
+    first = {}
+    for index, key in enumerate(keys):
+        first.setdefault(key, index)
+    return list(first.values())
+
+
+def clean_label_file(label_path, vectorised=True, snapshot=None):
+    """
+    Clean one label file in place.
+
+    Module level so a process pool can run it; log messages are returned
+    rather than emitted so the parent logs them in file order.
+
+    Args:
+        label_path (str): Label file to clean
+        vectorised (bool): Use the NumPy fast path for files large enough to benefit
+        snapshot (Snapshot): Snapshot that must keep the original of a rewritten file
+    """
+    label_file = os.path.basename(label_path)
+    result = LabelFileResult()
+
+    with open(label_path, 'r') as f:
+        lines = f.readlines()
+
+    cleaned = None
+    if vectorised and len(lines) >= VECTORISE_MIN_LINES:
+        cleaned = clean_lines_vectorised(lines, label_file, result)
+    cleaned_lines, keys = cleaned or clean_lines(lines, label_file, result)
+
+    # Drop repeated labels, keeping the first occurrence in place
+    unique = unique_rows(keys)
+    if len(unique) != len(cleaned_lines):
+        result.messages.append((logging.WARNING, f"Duplicates detected in {label_file}: "
+                                f"{len(lines) - len(unique)} duplicates"))
+        result.duplicates = len(cleaned_lines) - len(unique)
+        result.processed += result.duplicates
+        cleaned_lines = [cleaned_lines[i] for i in unique]
+
+    # Only write if changes were detected
+    if result.processed:
+        if snapshot is not None:
+            snapshot.preserve(label_path)
+        with open(label_path, 'w') as f:
+            f.writelines(cleaned_lines)
+        result.messages.append((logging.INFO, f"Processed {label_file}: {result.processed} labels"))
+
+    return result
+
 
 class YOLODatasetPreprocessor:
-    def __init__(self, dataset_path):
+    def __init__(self, dataset_path, incremental=True, manifest_path=None, snapshot_dir=None,
+                 keep_snapshots=5):
+        """
+        Args:
+            dataset_path (str): Dataset root holding the split directories
+            incremental (bool): Keep a manifest so re-runs only look at new or changed files
+            manifest_path (str): Manifest location, defaults to a hidden file in the dataset root
+            snapshot_dir (str): Where backups go, defaults to `<dataset>.snapshots` next to the dataset
+            keep_snapshots (int): Backups retained
+        """
         self.dataset_path = dataset_path
         self.splits = ['train', 'valid', 'test']
+        self.manifest = DatasetManifest(
+            manifest_path or os.path.join(dataset_path, MANIFEST_NAME), dataset_path
+        ) if incremental else None
+        self.snapshots = SnapshotStore(
+            snapshot_dir or os.path.abspath(dataset_path).rstrip(os.sep) + '.snapshots',
+            keep=keep_snapshots,
+            exclude=(MANIFEST_NAME, MANIFEST_NAME + '-journal')
+        )
+        self.snapshot = None  # Latest backup, kept intact while labels are rewritten
 
         # Configure logging
         log_filename = f'logs/dataset_preprocessing.log'
@@ -23,14 +274,10 @@ class YOLODatasetPreprocessor:
 
     def is_valid_bbox(self, bbox_coords):
         """Validate YOLO bbox coordinates"""
-        return (len(bbox_coords) == 4 and
-                all(0 <= coord <= 1 for coord in bbox_coords))
-
-    def process_labels(self):
-        """Robust label processing with strict validation"""
-        total_processed_files = 0
-        total_converted_labels = 0
+        return is_valid_bbox(bbox_coords)
 
+    def label_files(self):
+        """(split, label path) of every label file, in a stable order"""
         for split in self.splits:
             labels_dir = os.path.join(self.dataset_path, split, 'labels')
 
@@ -39,90 +286,96 @@ class YOLODatasetPreprocessor:
                     f"Labels directory not found for split {split}")
                 continue
 
-            for label_file in os.listdir(labels_dir):
-                label_path = os.path.join(labels_dir, label_file)
+            for label_file in sorted(os.listdir(labels_dir)):
+                yield split, os.path.join(labels_dir, label_file)
+
+    def process_labels(self, workers=None, chunksize=64, vectorised=True, force=False):
+        """
+        Robust label processing with strict validation.
+
+        Files are sharded across a process pool and results streamed back in
+        file order, so logs, statistics and rewritten files are identical to
+        a serial run.
+
+        Args:
+            workers (int): Worker processes, defaults to the CPU count; 1 runs serially
+            chunksize (int): Files handed to a worker at a time
+            vectorised (bool): Parse with the NumPy fast path, False for line-by-line only
+            force (bool): Clean every file, even those the manifest knows are clean
+
+        Returns:
+            dict: Per split counts of files cleaned, files skipped as unchanged,
+                processed files, converted labels and duplicates
+        """
+        workers = workers or os.cpu_count() or 1
+        tasks = list(self.label_files())
+        stats = {split: {'files': 0, 'unchanged': 0, 'processed_files': 0, 'converted_labels': 0,
+                         'duplicates': 0} for split in dict.fromkeys(split for split, _ in tasks)}
+        if self.manifest is not None:
+            for split in stats:
+                self.manifest.prune(os.path.join(self.dataset_path, split, 'labels'),
+                                    [path for s, path in tasks if s == split])
+            if not force:
+                # Cleaning is idempotent, so files cleaned before and unchanged since are skipped
+                pending = [(split, path) for split, path in tasks
+                           if not (self.manifest.lookup(path) or {}).get('cleaned')]
+                for split, _ in tasks:
+                    stats[split]['unchanged'] += 1
+                for split, _ in pending:
+                    stats[split]['unchanged'] -= 1
+                self.logger.info(f"Cleaning {len(pending)} new or changed of {len(tasks)} label files")
+                tasks = pending
+        paths = [path for _, path in tasks]
+        clean = partial(clean_label_file, vectorised=vectorised, snapshot=self.snapshot)
+
+        if workers > 1 and len(tasks) > chunksize:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                self._merge_results(stats, tasks, executor.map(clean, paths, chunksize=chunksize))
+        else:
+            self._merge_results(stats, tasks, map(clean, paths))
 
-                with open(label_path, 'r') as f:
-                    lines = f.readlines()
-
-                cleaned_lines = []
-                processed_count = 0
-
-                for line in lines:
-                    parts = line.strip().split()
-
-                    # Validate basic label structure
-                    if len(parts) < 5:
-                        self.logger.warning(f"Invalid label in {label_file}: {line.strip()}")
-                        processed_count+=1
-                        continue
-
-                    try:
-                        class_idx = int(parts[0])
-                        coords = list(map(float, parts[1:]))
-
-                        # Standard YOLO bbox
-                        if self.is_valid_bbox(coords):
-                            cleaned_lines.append(line)
-                            continue
-
-                        # Polygon conversion attempt
-                        if len(coords) >= 6 and len(coords) % 2 == 0:
-                            x_coords = coords[0::2]
-                            y_coords = coords[1::2]
-
-                            x_min, x_max = min(x_coords), max(x_coords)
-                            y_min, y_max = min(y_coords), max(y_coords)
-
-                            width = round(x_max - x_min, 5)
-                            height = round(y_max - y_min, 5)
-
-                            center_x = round(x_min + width / 2, 5)
-                            center_y = round(y_min + height / 2, 5)
-
-                            new_bbox = [center_x, center_y, width, height]
-
-                            if self.is_valid_bbox(new_bbox):
-                                new_line = f"{class_idx} {new_bbox[0]} {
-                                    new_bbox[1]} {new_bbox[2]} {new_bbox[3]}\n"
-                                cleaned_lines.append(new_line)
-                                processed_count += 1
-                            else:
-                                self.logger.warning(
-                                    f"Invalid converted bbox in {label_file}")
-                        else:
-                            self.logger.warning(f"Unprocessable label in {
-                                                label_file}: {line.strip()}")
-
-                    except (ValueError, IndexError) as e:
-                        self.logger.error(f"Error processing label in {
-                                          label_file}: {line.strip()} - {e}")
-
-                # Only write if changes were detected
-                if len(set(cleaned_lines)) != len(cleaned_lines):
-                    self.logger.warning(f"Duplicates detected in {label_file}: {
-                                        len(lines)-len(set(cleaned_lines))} duplicates")
-                    processed_count += (len(cleaned_lines) - len(set(cleaned_lines)))
-                    cleaned_lines = list(set(cleaned_lines))
-
-                if processed_count:
-                    with open(label_path, 'w') as f:
-                        f.writelines(cleaned_lines)
-                    self.logger.info(f"Processed {label_file}: {processed_count} labels")
-                    total_processed_files += 1
-                    total_converted_labels += processed_count
+        if self.manifest is not None:
+            self.manifest.save()
 
+        total_processed_files = sum(s['processed_files'] for s in stats.values())
+        total_converted_labels = sum(s['converted_labels'] for s in stats.values())
         self.logger.info(f"Total processed files: {total_processed_files}")
         self.logger.info(f"Total converted labels: {total_converted_labels}")
-
-    def validate_dataset(self):
-        """Comprehensive dataset validation"""
+        return stats
+
+    def _merge_results(self, stats, tasks, results):
+        for (split, path), result in zip(tasks, results):
+            for level, message in result.messages:
+                self.logger.log(level, message)
+            if self.manifest is not None:
+                # Recorded after the rewrite, so the manifest describes the cleaned content
+                self.manifest.record(path, cleaned=True, has_duplicates=False)
+            split_stats = stats[split]
+            split_stats['files'] += 1
+            split_stats['duplicates'] += result.duplicates
+            if result.processed:
+                split_stats['processed_files'] += 1
+                split_stats['converted_labels'] += result.processed
+
+    def validate_dataset(self, force=False, deep=False):
+        """
+        Comprehensive dataset validation.
+
+        Args:
+            force (bool): Re-read every label file instead of reusing manifest results
+            deep (bool): Also decode every image (see check_image_integrity)
+        """
         is_valid = True
+        manifest = None if force else self.manifest
         validation_report = {
             'missing_directories': [],
             'missing_labels': {},
             'duplicate_labels': []
         }
+        if deep:
+            integrity = self.check_image_integrity(force=force)
+            validation_report['image_integrity'] = integrity
+            is_valid = integrity.ok
 
         for split in self.splits:
             images_dir = os.path.join(self.dataset_path, split, 'images')
@@ -136,6 +389,8 @@ class YOLODatasetPreprocessor:
 
             image_files = set(os.listdir(images_dir))
             label_files = set(os.listdir(labels_dir))
+            if self.manifest is not None:
+                self._track_images(split, images_dir, image_files, label_files, manifest)
 
             # Check matching images and labels
             expected_labels = {
@@ -143,37 +398,101 @@ class YOLODatasetPreprocessor:
             missing_labels = expected_labels - label_files
 
             if missing_labels:
-                self.logger.warning(f"Missing labels in {
-                                    split}: {missing_labels}")
+                self.logger.warning(f"Missing labels in {split}: {missing_labels}")
                 validation_report['missing_labels'][split] = missing_labels
                 is_valid = False
 
             # Duplicate label validation
-            for label_file in label_files:
+            for label_file in sorted(label_files):
                 label_path = os.path.join(labels_dir, label_file)
-                with open(label_path, 'r') as f:
-                    lines = f.readlines()
-
-                # Check for duplicate labels within the file
-                unique_labels = set(lines)
-                if len(unique_labels) != len(lines):
+                cached = manifest.lookup(label_path) if manifest is not None else None
+                if cached and 'has_duplicates' in cached:
+                    has_duplicates = cached['has_duplicates']
+                else:
+                    with open(label_path, 'r') as f:
+                        lines = f.readlines()
+
+                    # Check for duplicate labels within the file
+                    has_duplicates = len(set(lines)) != len(lines)
+                    if self.manifest is not None:
+                        self.manifest.record(label_path, has_duplicates=has_duplicates)
+
+                if has_duplicates:
                     self.logger.warning(
                         f"Duplicate labels found in {label_file}")
                     validation_report['duplicate_labels'].append(label_file)
                     is_valid = False
 
+        if self.manifest is not None:
+            self.manifest.save()
         return is_valid, validation_report
 
+    def check_image_integrity(self, workers=None, force=False, **limits):
+        """
+        Decode every image of every split and flag unreadable, near-duplicate
+        (also across splits), extreme-aspect and tiny images.
+
+        Args:
+            workers (int): Worker processes, defaults to the CPU count
+            force (bool): Decode every image instead of reusing manifest results
+            **limits: max_aspect, min_side and hash_distance for check_images
+
+        Returns:
+            IntegrityReport
+        """
+        paths = []
+        for split in self.splits:
+            images_dir = os.path.join(self.dataset_path, split, 'images')
+            if os.path.isdir(images_dir):
+                paths += image_files(images_dir)
+        report = check_images(paths, manifest=self.manifest, workers=workers, force=force, **limits)
+
+        for path, error in report.unreadable.items():
+            self.logger.error(f"Unreadable image {path}: {error}")
+        for path, earlier in report.duplicates:
+            self.logger.warning(f"Near-duplicate image {path} of {earlier}")
+        for path in report.extreme_aspect:
+            self.logger.warning(f"Extreme aspect ratio: {path}")
+        for path in report.too_small:
+            self.logger.warning(f"Image too small: {path}")
+        self.logger.info(f"Image integrity: {report.images} images, {report.inspected} read, "
+                         f"{len(report.unreadable)} unreadable, {len(report.duplicates)} near-duplicates, "
+                         f"colour modes {report.modes}")
+        return report
+
+    def _track_images(self, split, images_dir, image_files, label_files, manifest):
+        """Record new or changed images with whether their label exists"""
+        changed = 0
+        for image_file in image_files:
+            image_path = os.path.join(images_dir, image_file)
+            has_label = image_file.rsplit('.', 1)[0] + '.txt' in label_files
+            cached = manifest.lookup(image_path) if manifest is not None else None
+            if cached is None or cached.get('has_label') != has_label:
+                self.manifest.record(image_path, has_label=has_label)
+                changed += cached is None
+        self.manifest.prune(images_dir, [os.path.join(images_dir, f) for f in image_files])
+        if changed:
+            self.logger.info(f"{changed} new or changed images in {split}")
+
     def backup_dataset(self):
-        """Create a backup of the entire dataset"""
-        backup_dir = os.path.join(
-            self.dataset_path, 'backup')
-        shutil.copytree(self.dataset_path, backup_dir, dirs_exist_ok=True)
-        self.logger.info(f"Dataset backed up to {backup_dir}")
-        return backup_dir
-
-    def preprocess(self):
-        """Run full preprocessing pipeline"""
+        """
+        Snapshot the dataset outside its tree.
+
+        Files are hardlinked; label files rewritten later in this run are
+        copied into the snapshot just before the rewrite.
+        """
+        self.snapshot = self.snapshots.create(self.dataset_path)
+        self.logger.info(f"Dataset backed up to {self.snapshot.path}")
+        return self.snapshot.path
+
+    def preprocess(self, force=False, deep=False):
+        """
+        Run full preprocessing pipeline.
+
+        Args:
+            force (bool): Re-validate and re-clean every file, ignoring the manifest
+            deep (bool): Decode every image during the initial validation
+        """
         self.logger.info("Starting dataset preprocessing...")
 
         # Backup dataset
@@ -181,17 +500,20 @@ class YOLODatasetPreprocessor:
 
         # Initial validation
         self.logger.info("Performing initial dataset validation...")
-        initial_valid, initial_report = self.validate_dataset()
-        self.logger.info(f"Initial dataset validation: {
-                         'Valid' if initial_valid else 'Invalid'}")
+        initial_valid, initial_report = self.validate_dataset(force=force, deep=deep)
+        self.logger.info(f"Initial dataset validation: {'Valid' if initial_valid else 'Invalid'}")
 
         # Process labels
         self.logger.info("Processing labels...")
-        self.process_labels()
+        self.process_labels(force=force)
 
         # Final validation
         self.logger.info("Performing final dataset validation...")
-        final_valid, final_report = self.validate_dataset()
+        final_valid, final_report = self.validate_dataset(force=force)
+        if 'image_integrity' in initial_report:
+            # Labels do not touch images: carry the image check over to the final verdict
+            final_report['image_integrity'] = initial_report['image_integrity']
+            final_valid = final_valid and initial_report['image_integrity'].ok
 
         # Generate comprehensive report
         self.generate_preprocessing_report(
@@ -215,20 +537,22 @@ class YOLODatasetPreprocessor:
         self.logger.info(f"Backup Path: {backup_path}")
 
         self.logger.info("Initial Validation:")
-        self.logger.info(f"Overall Status: {
-                        'Valid' if initial_valid else 'Invalid'}")
-        self.logger.info(f"Missing Directories: {
-                        initial_report['missing_directories']}")
+        self.logger.info(f"Overall Status: {'Valid' if initial_valid else 'Invalid'}")
+        self.logger.info(f"Missing Directories: {initial_report['missing_directories']}")
         self.logger.info(f"Missing Labels: {initial_report['missing_labels']}")
         self.logger.info(f"Duplicate Labels: {initial_report['duplicate_labels']}")
 
         self.logger.info("Final Validation:")
-        self.logger.info(f"Overall Status: {
-                        'Valid' if final_valid else 'Invalid'}")
-        self.logger.info(f"Missing Directories: {
-                        final_report['missing_directories']}")
+        self.logger.info(f"Overall Status: {'Valid' if final_valid else 'Invalid'}")
+        self.logger.info(f"Missing Directories: {final_report['missing_directories']}")
         self.logger.info(f"Missing Labels: {final_report['missing_labels']}")
         self.logger.info(f"Duplicate Labels: {final_report['duplicate_labels']}")
+        if 'image_integrity' in final_report:
+            integrity = final_report['image_integrity']
+            self.logger.info(f"Unreadable Images: {sorted(integrity.unreadable)}")
+            self.logger.info(f"Near-duplicate Images: {len(integrity.duplicates)}")
+            self.logger.info(f"Extreme Aspect / Too Small Images: "
+                             f"{len(integrity.extreme_aspect)} / {len(integrity.too_small)}")
 
 
 def main():
@@ -51,6 +51,42 @@ def generate_test_labels():
     print("Test label files and dummy images generated successfully!")
 
 
+def generate_synthetic_dataset(root, files_per_split=1000, splits=('train', 'valid', 'test'), seed=0,
+                               boxes_per_file=(1, 8)):
+    """
+    Write a YOLO dataset of the given size mixing valid boxes, polygons,
+    out-of-range coordinates, malformed rows and duplicates.
+    """
+    rng = random.Random(seed)
+
+    def box():
+        return f"{rng.randint(0, 1)} " + " ".join(f"{rng.uniform(0.05, 0.95):.5f}" for _ in range(4))
+
+    def polygon():
+        points = rng.randint(3, 12)
+        return f"{rng.randint(0, 1)} " + " ".join(f"{rng.uniform(0, 1):.5f}" for _ in range(points * 2))
+
+    for split in splits:
+        labels_dir = os.path.join(root, split, 'labels')
+        images_dir = os.path.join(root, split, 'images')
+        os.makedirs(labels_dir, exist_ok=True)
+        os.makedirs(images_dir, exist_ok=True)
+        for i in range(files_per_split):
+            lines = [box() for _ in range(rng.randint(*boxes_per_file))]
+            lines += [polygon() for _ in range(rng.choice([0, 0, 1, 3]) * max(1, len(lines) // 8))]
+            if rng.random() < 0.1:
+                lines.append(f"0 1.2 0.5 0.3 {rng.uniform(0, 1):.5f}")
+            if rng.random() < 0.05:
+                lines.append("1 -0.1 1.3 0.1")
+            if rng.random() < 0.1:
+                lines.append(rng.choice(lines))
+            rng.shuffle(lines)
+            with open(os.path.join(labels_dir, f'img_{i:06d}.txt'), 'w') as f:
+                f.write("\n".join(lines) + "\n")
+            with open(os.path.join(images_dir, f'img_{i:06d}.jpg'), 'wb') as f:
+                f.write(b'\xff\xd8\xff\xd9')
+
+
 if __name__ == '__main__':
     generate_test_labels()
 
@@ -5,11 +5,13 @@ from pathlib import Path
 from src.config import Config, setup_logging
 from src.fire_detector import Detector
 from src.notification_service import NotificationService
+from tests.fake_services import FakeProviders
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_environment():
-    """Setup test environment and logging"""
+def setup_test_environment(tmp_path_factory):
+    """Setup test environment and logging, outside the repo's logs/"""
+    Config.LOG_FILE = tmp_path_factory.mktemp('logs') / 'fire_detection.log'
     setup_logging()
     Config.validate()
     yield
@@ -28,6 +30,37 @@ def fire_detector():
 
 
 @pytest.fixture
-def notification_service():
+def providers():
+    """Local stand-ins for every notification provider"""
+    with FakeProviders() as providers:
+        yield providers
+
+
+@pytest.fixture
+def make_notification_service(providers, monkeypatch, tmp_path):
+    """
+    Build NotificationService instances that talk to the stand-ins only and
+    keep their outbox and alert images under tmp_path, so test alerts never
+    reach real recipients or the working tree.
+    """
+    services = []
+
+    def make(**environ):
+        for name, value in providers.environ(**environ).items():
+            monkeypatch.setenv(name, value)
+        alerts_dir = tmp_path / 'detected_fires'
+        alerts_dir.mkdir(exist_ok=True)
+        service = NotificationService(providers.config(
+            Config, OUTBOX_PATH=tmp_path / 'outbox.db', DETECTED_FIRES_DIR=alerts_dir))
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.cleanup()
+
+
+@pytest.fixture
+def notification_service(make_notification_service):
     """Create NotificationService instance"""
-    return NotificationService(Config)
+    return make_notification_service()
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    result TEXT NOT NULL
+);
+"""
+
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+class DatasetManifest:
+    def __init__(self, db_path, root):
+        """
+        Size, mtime and content hash of every dataset file with the results
+        of its last validation, so re-runs only look at new or changed files.
+
+        A file counts as unchanged while its size and mtime match. When only
+        the mtime moved (a touch, a copy) the hash decides, and a matching
+        hash keeps the stored results.
+
+        Args:
+            db_path (str): SQLite file holding the manifest
+            root (str): Dataset root; entries are stored relative to it
+        """
+        self.db_path = db_path
+        self.root = root
+        self._prefix = os.path.join(root, '')
+        self._db = sqlite3.connect(db_path)
+        self._db.executescript(SCHEMA)
+        # All entries in memory: one query at start instead of one per file
+        self._entries = {
+            path: (size, mtime_ns, digest, json.loads(result))
+            for path, size, mtime_ns, digest, result in self._db.execute("SELECT * FROM files")
+        }
+        self._dirty = set()
+        self._removed = set()
+
+    def _key(self, path):
+        # Plain prefix slicing: relpath's normalisation dominates on large datasets
+        path = os.fspath(path)
+        return path[len(self._prefix):] if path.startswith(self._prefix) else os.path.relpath(path, self.root)
+
+    def lookup(self, path):
+        """Stored results of an unchanged file (do not modify), None if it is new or changed"""
+        key = self._key(path)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        size, mtime_ns, digest, result = entry
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            if stat.st_size != size or file_hash(path) != digest:
+                return None
+            # Same content under a new mtime: keep the results, skip the hash next time
+            self._entries[key] = (size, stat.st_mtime_ns, digest, result)
+            self._dirty.add(key)
+        return result
+
+    def record(self, path, **results):
+        """
+        Store validation results for a file's current content.
+
+        Results recorded for unchanged content are merged with earlier ones;
+        new content starts a fresh entry.
+        """
+        key = self._key(path)
+        stat = os.stat(path)
+        entry = self._entries.get(key)
+        if entry and (stat.st_size, stat.st_mtime_ns) == entry[:2]:
+            digest, merged = entry[2], dict(entry[3], **results)
+        else:
+            digest, merged = file_hash(path), results
+        self._entries[key] = (stat.st_size, stat.st_mtime_ns, digest, merged)
+        self._dirty.add(key)
+
+    def prune(self, prefix, existing):
+        """Forget files under a directory that no longer exist"""
+        prefix = self._key(prefix) + os.sep
+        existing = {self._key(path) for path in existing}
+        for key in [k for k in self._entries if k.startswith(prefix) and k not in existing]:
+            del self._entries[key]
+            self._dirty.discard(key)
+            self._removed.add(key)
+
+    def save(self):
+        """Write changed entries in one transaction"""
+        with self._db:
+            self._db.executemany("DELETE FROM files WHERE path = ?", [(k,) for k in self._removed])
+            self._db.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                [(key, *self._entries[key][:3], json.dumps(self._entries[key][3])) for key in self._dirty])
+        self._dirty.clear()
+        self._removed.clear()
+
+    def close(self):
+        self.save()
+        self._db.close()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,137 @@
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: plain copies only
+    fcntl = None
+
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+
+
+def reflink_or_copy(src, dst):
+    """
+    Copy a file, sharing its blocks (reflink) where the filesystem supports it.
+
+    Returns:
+        bool: True if the copy is a reflink, False if the bytes were copied
+    """
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as s, open(dst, 'wb') as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            shutil.copystat(src, dst)
+            return True
+        except OSError:
+            pass  # ext4, tmpfs, cross-device: fall through to a real copy
+    shutil.copy2(src, dst)
+    return False
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    path: str
+    source: str
+
+    def target(self, file):
+        """Location of a dataset file inside the snapshot"""
+        return os.path.join(self.path, os.path.relpath(file, self.source))
+
+    def preserve(self, file):
+        """
+        Copy-before-write: give the snapshot its own copy of a file that is
+        about to be rewritten in place, so the hardlink does not carry the
+        new content into the snapshot.
+        """
+        target = self.target(file)
+        try:
+            if not os.path.samefile(file, target):
+                return
+        except FileNotFoundError:
+            return
+        tmp = target + '.cow'
+        reflink_or_copy(file, tmp)
+        os.replace(tmp, target)
+
+
+class SnapshotStore:
+    def __init__(self, root, keep=5, exclude=()):
+        """
+        Dataset snapshots as hardlink trees kept outside the dataset.
+
+        A snapshot links every file, so it costs directory entries rather
+        than data. Files rewritten afterwards must be passed to
+        Snapshot.preserve first; only those are copied.
+
+        Args:
+            root (str): Directory holding one subdirectory per snapshot
+            keep (int): Snapshots retained, older ones are deleted
+            exclude (tuple): File names never snapshotted (e.g. databases written in place)
+        """
+        self.root = root
+        self.keep = keep
+        self.exclude = set(exclude)
+        self.logger = logging.getLogger(__name__)
+
+    def snapshots(self):
+        """Snapshot directories, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(os.path.join(self.root, name) for name in os.listdir(self.root)
+                      if not name.endswith('.partial'))
+
+    def create(self, source):
+        """Snapshot a dataset directory, then apply the retention limit"""
+        source = os.path.abspath(source)
+        if os.path.commonpath([source, os.path.abspath(self.root)]) == source:
+            raise ValueError(f"Snapshots must live outside the dataset: {self.root}")
+        name = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        partial = os.path.join(self.root, name + '.partial')
+        linked = copied = 0
+
+        for directory, dirs, files in os.walk(source):
+            target_dir = os.path.join(partial, os.path.relpath(directory, source))
+            os.makedirs(target_dir, exist_ok=True)
+            for file in files:
+                if file in self.exclude:
+                    continue
+                src, dst = os.path.join(directory, file), os.path.join(target_dir, file)
+                try:
+                    os.link(src, dst)
+                    linked += 1
+                except OSError:  # Cross-device or links unsupported
+                    reflink_or_copy(src, dst)
+                    copied += 1
+
+        # Complete snapshots only: a crash leaves a .partial directory that is never listed, prune removes it
+        path = os.path.join(self.root, name)
+        os.rename(partial, path)
+        self.logger.info(f"Snapshot {path}: {linked} files linked, {copied} copied")
+        self.prune()
+        return Snapshot(path, source)
+
+    def prune(self):
+        """Delete snapshots beyond the retention limit, oldest first, and any left unfinished"""
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                if name.endswith('.partial'):
+                    shutil.rmtree(os.path.join(self.root, name))
+                    self.logger.info(f"Unfinished snapshot {name} removed")
+        snapshots = self.snapshots()
+        for path in snapshots[:max(0, len(snapshots) - self.keep)]:
+            shutil.rmtree(path)
+            self.logger.info(f"Snapshot {path} removed (keeping {self.keep})")
+
+    @staticmethod
+    def unique_bytes(path):
+        """Bytes held only by a snapshot, i.e. the files copied before a rewrite"""
+        total = 0
+        for directory, _, files in os.walk(path):
+            for file in files:
+                stat = os.stat(os.path.join(directory, file))
+                if stat.st_nlink == 1:
+                    total += stat.st_size
+        return total
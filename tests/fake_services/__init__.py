@@ -0,0 +1,26 @@
+"""
+Local stand-ins for the external APIs used by the notification pipeline.
+They run on 127.0.0.1 so alert delivery can be tested and benchmarked
+without credentials or network access.
+"""
+
+from .base import FakeService, parse_body
+from .callmebot import FakeCallMeBot
+from .gcs import FakeGCS
+from .imgur import FakeImgurAPI
+from .telegram import FakeTelegramAPI
+from .twilio import FakeTwilioAPI
+from .webhook import FakeWebhook
+from .harness import FakeProviders
+
+__all__ = [
+    'FakeService',
+    'parse_body',
+    'FakeCallMeBot',
+    'FakeGCS',
+    'FakeImgurAPI',
+    'FakeTelegramAPI',
+    'FakeTwilioAPI',
+    'FakeWebhook',
+    'FakeProviders',
+]
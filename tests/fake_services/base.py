@@ -0,0 +1,141 @@
+import json
+import random
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+def parse_body(headers, body: bytes) -> Tuple[Dict[str, str], Dict[str, bytes]]:
+    """Decode a JSON, form or multipart request body into (fields, files)"""
+    content_type = headers.get('Content-Type', '')
+    if not body:
+        return {}, {}
+    if content_type.startswith('application/json'):
+        return {k: v if isinstance(v, str) else json.dumps(v)
+                for k, v in json.loads(body).items()}, {}
+    if content_type.startswith('multipart/form-data'):
+        message = BytesParser(policy=HTTP).parsebytes(
+            b'Content-Type: ' + content_type.encode() + b'\r\n\r\n' + body)
+        fields, files = {}, {}
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            payload = part.get_payload(decode=True)
+            if part.get_filename() is not None:
+                files[name] = payload
+            else:
+                fields[name] = payload.decode()
+        return fields, files
+    return {k: v[0] for k, v in parse_qs(body.decode()).items()}, {}
+
+
+class FakeService:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 failure_rate: float = 0.0, rate_limit: float = 0.0):
+        """
+        Base class for a local HTTP stand-in running on a background thread.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free one
+            latency (float): Seconds added to every response
+            failure_rate (float): Fraction of requests answered with HTTP 503
+            rate_limit (float): Requests per second answered before HTTP 429 (0 disables)
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rate_limit = rate_limit
+        self._recent = []
+        self.requests = []
+        self._lock = threading.Lock()
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _dispatch(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if service.latency:
+                    time.sleep(service.latency)
+                if service.failure_rate and random.random() < service.failure_rate:
+                    status, headers, payload = service.error_response(503, 'Service Unavailable')
+                elif service._over_rate_limit():
+                    status, headers, payload = service.rate_limited_response()
+                else:
+                    status, headers, payload = service.handle(
+                        self.command, url.path, query, self.headers, body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeService':
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def record(self, **entry) -> None:
+        entry.setdefault('time', time.monotonic())
+        with self._lock:
+            self.requests.append(entry)
+
+    def _over_rate_limit(self) -> bool:
+        """Sliding one second window across all requests"""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            self._recent = [t for t in self._recent if now - t < 1.0]
+            if len(self._recent) >= self.rate_limit:
+                return True
+            self._recent.append(now)
+        return False
+
+    def error_response(self, status: int, message: str):
+        """Injected error response, overridden to match the API's own error format"""
+        return self.json_response({'error': message}, status)
+
+    def rate_limited_response(self):
+        status, headers, payload = self.error_response(429, 'Too Many Requests')
+        return status, dict(headers, **{'Retry-After': '1'}), payload
+
+    def handle(self, method: str, path: str, query: dict, headers, body: bytes):
+        """Return (status, headers, body) for a request"""
+        raise NotImplementedError
+
+    @staticmethod
+    def json_response(data, status: int = 200):
+        return status, {'Content-Type': 'application/json'}, json.dumps(data).encode()
@@ -0,0 +1,32 @@
+from .base import FakeService
+
+
+class FakeCallMeBot(FakeService):
+    def __init__(self, api_key: str = 'fake-api-key', **kwargs):
+        """
+        CallMeBot WhatsApp gateway stand-in.
+
+        Args:
+            api_key (str): API key accepted in the query string
+        """
+        super().__init__(**kwargs)
+        self.api_key = api_key
+
+    @property
+    def api_url(self) -> str:
+        """Value for Config.CALLMEBOT_API_URL"""
+        return f"{self.url}/whatsapp.php"
+
+    def messages(self):
+        with self._lock:
+            return [r for r in self.requests if r['method'] == 'message']
+
+    def handle(self, method, path, query, headers, body):
+        if path != '/whatsapp.php':
+            return 404, {'Content-Type': 'text/html'}, b'Not found'
+        if query.get('apikey') != self.api_key:
+            return 401, {'Content-Type': 'text/html'}, b'APIKey is invalid'
+        if not query.get('phone') or not query.get('text'):
+            return 400, {'Content-Type': 'text/html'}, b'Missing phone or text'
+        self.record(method='message', phone=query['phone'], text=query['text'])
+        return 200, {'Content-Type': 'text/html'}, b'Message queued. You will receive it in a few seconds.'
@@ -0,0 +1,108 @@
+import base64
+import hashlib
+import itertools
+import json
+from email.parser import BytesParser
+from email.policy import HTTP
+from urllib.parse import quote, unquote
+from .base import FakeService
+
+
+class FakeGCS(FakeService):
+    def __init__(self, bucket: str = 'fake-bucket', **kwargs):
+        """
+        Google Cloud Storage JSON API stand-in, used through STORAGE_EMULATOR_HOST.
+
+        Implements what the alert uploads need: object metadata, multipart
+        uploads, ACL patches, and serving object bytes at their public URL.
+
+        Args:
+            bucket (str): Name of the only bucket
+        """
+        super().__init__(**kwargs)
+        self.bucket = bucket
+        self.objects = {}
+        self._generations = itertools.count(1)
+
+    def _resource(self, name: str) -> dict:
+        obj = self.objects[name]
+        return {
+            'kind': 'storage#object',
+            'id': f"{self.bucket}/{name}/{obj['generation']}",
+            'name': name,
+            'bucket': self.bucket,
+            'generation': str(obj['generation']),
+            'metageneration': '1',
+            'contentType': obj['content_type'],
+            'size': str(len(obj['data'])),
+            'md5Hash': base64.b64encode(hashlib.md5(obj['data']).digest()).decode(),
+            'mediaLink': f"{self.url}/download/storage/v1/b/{self.bucket}/o/{quote(name, safe='')}?alt=media",
+        }
+
+    def error_response(self, status, message):
+        return self.json_response({'error': {'code': status, 'message': message}}, status)
+
+    def _not_found(self):
+        return self.error_response(404, 'Not Found')
+
+    def _upload(self, query, headers, body):
+        content_type = headers.get('Content-Type', '')
+        if query.get('uploadType') == 'multipart':
+            message = BytesParser(policy=HTTP).parsebytes(
+                b'Content-Type: ' + content_type.encode() + b'\r\n\r\n' + body)
+            metadata_part, media_part = list(message.iter_parts())[:2]
+            metadata = json.loads(metadata_part.get_payload(decode=True))
+            name = metadata['name']
+            content_type = media_part.get_content_type()
+            data = media_part.get_payload(decode=True)
+        elif query.get('name'):
+            name, data = query['name'], body
+        else:
+            return self.error_response(400, 'Unsupported upload type')
+        with self._lock:
+            self.objects[name] = {'data': data, 'content_type': content_type,
+                                  'generation': next(self._generations), 'acl': []}
+        self.record(method='upload', name=name, bytes=len(data))
+        return self.json_response(self._resource(name))
+
+    def handle(self, method, path, query, headers, body):
+        upload_prefix = f"/upload/storage/v1/b/{self.bucket}/o"
+        object_prefix = f"/storage/v1/b/{self.bucket}/o/"
+        download_prefix = f"/download/storage/v1/b/{self.bucket}/o/"
+        public_prefix = f"/{self.bucket}/"
+
+        if path == upload_prefix and method == 'POST':
+            return self._upload(query, headers, body)
+
+        for prefix in (object_prefix, download_prefix):
+            if path.startswith(prefix):
+                name, _, sub = path[len(prefix):].partition('/')
+                name = unquote(name)
+                if name not in self.objects:
+                    return self._not_found()
+                if sub == 'acl' and method == 'GET':
+                    return self.json_response({'items': self.objects[name]['acl']})
+                if method == 'GET' and (query.get('alt') == 'media' or prefix == download_prefix):
+                    obj = self.objects[name]
+                    return 200, {'Content-Type': obj['content_type']}, obj['data']
+                if method == 'GET':
+                    return self.json_response(self._resource(name))
+                if method == 'PATCH':
+                    # ACL updates (make_public); granting allUsers read exposes the object
+                    acl = json.loads(body or b'{}').get('acl', [])
+                    with self._lock:
+                        self.objects[name]['acl'] = acl
+                    self.record(method='patch', name=name)
+                    return self.json_response(dict(self._resource(name), acl=acl))
+                if method == 'DELETE':
+                    with self._lock:
+                        del self.objects[name]
+                    return 204, {}, b''
+
+        if path.startswith(public_prefix) and method == 'GET':
+            obj = self.objects.get(unquote(path[len(public_prefix):]))
+            if obj is None or not any(e.get('entity') == 'allUsers' for e in obj['acl']):
+                return self._not_found()
+            return 200, {'Content-Type': obj['content_type']}, obj['data']
+
+        return self._not_found()
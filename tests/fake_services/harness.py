@@ -0,0 +1,113 @@
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable
+from cryptography.fernet import Fernet
+from src.subscriber_service import SubscriberStore
+from .callmebot import FakeCallMeBot
+from .gcs import FakeGCS
+from .imgur import FakeImgurAPI
+from .telegram import FakeTelegramAPI
+from .twilio import FakeTwilioAPI
+
+
+class FakeProviders:
+    RECEIVER = '+15550001111'
+    SENDER = '+15550002222'
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, rate_limit: float = 0.0,
+                 chat_ids: Iterable[int] = (1001,), overrides: Dict[str, dict] = None):
+        """
+        Every provider NotificationService talks to, running locally.
+
+        Args:
+            latency (float): Seconds added to every response of every provider
+            failure_rate (float): Fraction of requests answered with HTTP 503
+            rate_limit (float): Requests per second each provider answers before HTTP 429
+            chat_ids (list): Telegram subscribers written to the store
+            overrides (dict): Per provider keyword arguments, e.g. {'twilio': {'latency': 0.3}}
+        """
+        overrides = overrides or {}
+
+        def options(name):
+            return dict(dict(latency=latency, failure_rate=failure_rate, rate_limit=rate_limit),
+                        **overrides.get(name, {}))
+
+        self.twilio = FakeTwilioAPI(**options('twilio'))
+        self.callmebot = FakeCallMeBot(**options('callmebot'))
+        self.imgur = FakeImgurAPI(**options('imgur'))
+        self.gcs = FakeGCS(**options('gcs'))
+        self.telegram = FakeTelegramAPI(**options('telegram'))
+        self.chat_ids = list(chat_ids)
+        self._tmp_dir = None
+
+    @property
+    def services(self) -> list:
+        return [self.twilio, self.callmebot, self.imgur, self.gcs, self.telegram]
+
+    def start(self) -> 'FakeProviders':
+        self._tmp_dir = tempfile.TemporaryDirectory(prefix='fake-providers-')
+        self.encryption_key = Fernet.generate_key().decode()
+        store = SubscriberStore(self.work_dir / 'sysdata.bin', Fernet(self.encryption_key.encode()))
+        store.replace(self.chat_ids)
+        store.flush()
+        for service in self.services:
+            service.start()
+        return self
+
+    def stop(self) -> None:
+        for service in self.services:
+            service.stop()
+        self._tmp_dir.cleanup()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def work_dir(self) -> Path:
+        """Scratch directory for the subscriber store, outbox and alert images"""
+        return Path(self._tmp_dir.name)
+
+    def environ(self, whatsapp: str = 'twilio', gcs: bool = True) -> Dict[str, str]:
+        """
+        Environment variables NotificationService reads its credentials from.
+
+        Args:
+            whatsapp (str): 'twilio' or 'callmebot'
+            gcs (bool): Upload to the GCS emulator, Imgur otherwise
+        """
+        use_twilio = whatsapp == 'twilio'
+        return {
+            # Empty values count as unset and shadow real credentials from .env
+            'TWILIO_ACCOUNT_SID': self.twilio.account_sid if use_twilio else '',
+            'TWILIO_AUTH_TOKEN': self.twilio.auth_token if use_twilio else '',
+            'TWILIO_WHATSAPP_NUMBER': self.SENDER if use_twilio else '',
+            'CALLMEBOT_API_KEY': '' if use_twilio else self.callmebot.api_key,
+            'RECEIVER_WHATSAPP_NUMBER': self.RECEIVER,
+            'TELEGRAM_TOKEN': self.telegram.token,
+            'TELEGRAM_CHAT_ID': '',
+            'ENCRYPTION_KEY': self.encryption_key,
+            'STORAGE_EMULATOR_HOST': self.gcs.url if gcs else '',
+            'GCS_BUCKET_NAME': self.gcs.bucket if gcs else '',
+            'GCS_PROJECT': 'local',
+            'GOOGLE_APPLICATION_CREDENTIALS': '',
+        }
+
+    def config(self, base: type, **overrides) -> type:
+        """Subclass of a Config pointing every provider endpoint at the stand-ins"""
+        self.work_dir.joinpath('detected_fires').mkdir(exist_ok=True)
+        attributes = dict(
+            TWILIO_API_BASE_URL=self.twilio.url,
+            TELEGRAM_API_BASE_URL=self.telegram.base_url,
+            IMGUR_API_URL=self.imgur.upload_url,
+            IMGUR_CLIENT_ID=self.imgur.client_id,
+            CALLMEBOT_API_URL=self.callmebot.api_url,
+            TELEGRAM_STORE_DIR=self.work_dir,
+            TELEGRAM_SUBSCRIBERS='external',  # No update polling during benchmarks
+            OUTBOX_PATH=self.work_dir / 'outbox.db',
+            DETECTED_FIRES_DIR=self.work_dir / 'detected_fires',
+        )
+        attributes.update(overrides)
+        return type(f'Fake{base.__name__}', (base,), attributes)
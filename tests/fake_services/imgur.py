@@ -0,0 +1,44 @@
+import uuid
+from .base import FakeService, parse_body
+
+
+class FakeImgurAPI(FakeService):
+    def __init__(self, client_id: str = 'fake-client-id', **kwargs):
+        """
+        Imgur anonymous upload stand-in; uploaded images are served back from their link.
+
+        Args:
+            client_id (str): Client ID expected in the Authorization header
+        """
+        super().__init__(**kwargs)
+        self.client_id = client_id
+        self.images = {}
+
+    @property
+    def upload_url(self) -> str:
+        """Value for Config.IMGUR_API_URL"""
+        return f"{self.url}/3/image"
+
+    def error_response(self, status, message):
+        return self.json_response({'data': {'error': message}, 'success': False, 'status': status}, status)
+
+    def handle(self, method, path, query, headers, body):
+        if path == '/3/image' and method == 'POST':
+            if headers.get('Authorization') != f"Client-ID {self.client_id}":
+                return self.error_response(401, 'Authentication required')
+            _, files = parse_body(headers, body)
+            image = files.get('image')
+            if not image:
+                return self.error_response(400, 'No image data was sent')
+            image_id = uuid.uuid4().hex[:7]
+            with self._lock:
+                self.images[image_id] = image
+            self.record(method='upload', id=image_id, bytes=len(image))
+            return self.json_response({'data': {
+                'id': image_id, 'type': 'image/jpeg', 'size': len(image),
+                'link': f"{self.url}/{image_id}.jpg"}, 'success': True, 'status': 200})
+
+        image = self.images.get(path.strip('/').rsplit('.', 1)[0])
+        if method == 'GET' and image is not None:
+            return 200, {'Content-Type': 'image/jpeg'}, image
+        return self.error_response(404, 'Not found')
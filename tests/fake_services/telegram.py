@@ -0,0 +1,155 @@
+import itertools
+import threading
+import time
+from .base import FakeService, parse_body
+
+
+class FakeTelegramAPI(FakeService):
+    def __init__(
+        self,
+        token: str = '123456:FAKE',
+        per_chat_interval: float = 0.0,
+        global_rate: float = 0.0,
+        max_poll_wait: float = 2.0,
+        **kwargs
+        ):
+        """
+        Minimal Telegram Bot API stand-in.
+
+        Args:
+            token (str): Bot token accepted in the request path
+            per_chat_interval (float): Minimum seconds between messages to one chat (0 disables)
+            global_rate (float): Maximum messages per second across chats (0 disables)
+            max_poll_wait (float): Cap on how long getUpdates holds a long poll
+        """
+        super().__init__(**kwargs)
+        self.token = token
+        self.per_chat_interval = per_chat_interval
+        self.global_rate = global_rate
+        self.max_poll_wait = max_poll_wait
+        self.updates = []
+        self._new_update = threading.Condition(self._lock)
+        self.uploads = 0
+        self._file_ids = set()
+        self._message_ids = itertools.count(1)
+        self._update_ids = itertools.count(1)
+        self._last_chat_send = {}
+        self._window = []
+
+    @property
+    def base_url(self) -> str:
+        """Value for telegram.Bot(base_url=...)"""
+        return f"{self.url}/bot"
+
+    def add_update(self, chat_id: int, text: str = '/start') -> dict:
+        """Queue an incoming message as returned by getUpdates"""
+        extra = {'text': text}
+        if text.startswith('/'):
+            extra['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+        update = {
+            'update_id': next(self._update_ids),
+            'message': self._message(chat_id, **extra),
+        }
+        with self._lock:
+            self.updates.append(update)
+            self._new_update.notify_all()
+        return update
+
+    def sent_messages(self, method: str = 'sendPhoto'):
+        with self._lock:
+            return [r for r in self.requests if r['method'] == method]
+
+    def _message(self, chat_id: int, **extra) -> dict:
+        return dict({
+            'message_id': next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private', 'first_name': 'Test'},
+            'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Test'},
+        }, **extra)
+
+    def _rate_limited(self, chat_id: int):
+        """Return the retry_after seconds if this send breaks a limit"""
+        now = time.monotonic()
+        with self._lock:
+            if self.per_chat_interval:
+                last = self._last_chat_send.get(chat_id)
+                if last is not None and now - last < self.per_chat_interval:
+                    return max(1, int(self.per_chat_interval))
+            if self.global_rate:
+                self._window = [t for t in self._window if now - t < 1.0]
+                if len(self._window) >= self.global_rate:
+                    return 1
+                self._window.append(now)
+            self._last_chat_send[chat_id] = now
+        return None
+
+    def error_response(self, status, message):
+        return self.json_response({'ok': False, 'error_code': status, 'description': message}, status)
+
+    def handle(self, method, path, query, headers, body):
+        prefix = f"/bot{self.token}/"
+        if not path.startswith(prefix):
+            return self.json_response(
+                {'ok': False, 'error_code': 401, 'description': 'Unauthorized'}, 401)
+        api_method = path[len(prefix):]
+        fields, files = parse_body(headers, body)
+        fields.update(query)
+
+        if api_method == 'getMe':
+            return self.json_response({'ok': True, 'result': {
+                'id': 1, 'is_bot': True, 'first_name': 'FakeBot', 'username': 'fake_bot',
+                'can_join_groups': True, 'can_read_all_group_messages': False,
+                'supports_inline_queries': False}})
+
+        if api_method == 'getUpdates':
+            offset = int(fields.get('offset') or 0)
+            # Long poll: hold the request until an update arrives or the timeout passes
+            deadline = time.monotonic() + min(float(fields.get('timeout') or 0), self.max_poll_wait)
+            with self._lock:
+                while True:
+                    updates = [u for u in self.updates if u['update_id'] >= offset]
+                    remaining = deadline - time.monotonic()
+                    if updates or remaining <= 0:
+                        break
+                    self._new_update.wait(remaining)
+            self.record(method=api_method, offset=offset, count=len(updates))
+            return self.json_response({'ok': True, 'result': updates})
+
+        if api_method in ('sendPhoto', 'sendMessage'):
+            chat_id = int(fields['chat_id'])
+            retry_after = self._rate_limited(chat_id)
+            if retry_after:
+                return self.json_response({
+                    'ok': False, 'error_code': 429,
+                    'description': f'Too Many Requests: retry after {retry_after}',
+                    'parameters': {'retry_after': retry_after}}, 429)
+
+            extra = {}
+            if api_method == 'sendPhoto':
+                if 'photo' in files:
+                    with self._lock:
+                        self.uploads += 1
+                        file_id = f'fake-file-{self.uploads}'
+                        self._file_ids.add(file_id)
+                else:
+                    file_id = fields.get('photo')
+                    if file_id not in self._file_ids:
+                        return self.json_response({
+                            'ok': False, 'error_code': 400,
+                            'description': 'Bad Request: wrong file identifier'}, 400)
+                extra['photo'] = [{'file_id': file_id, 'file_unique_id': file_id,
+                                   'width': 640, 'height': 480}]
+                extra['caption'] = fields.get('caption', '')
+            else:
+                extra['text'] = fields.get('text', '')
+
+            self.record(method=api_method, chat_id=chat_id,
+                        uploaded='photo' in files, **extra)
+            return self.json_response({'ok': True, 'result': self._message(chat_id, **extra)})
+
+        if api_method in ('sendChatAction', 'setWebhook', 'deleteWebhook', 'close', 'logOut'):
+            self.record(method=api_method, **fields)
+            return self.json_response({'ok': True, 'result': True})
+
+        return self.json_response(
+            {'ok': False, 'error_code': 404, 'description': 'Not Found'}, 404)
@@ -0,0 +1,66 @@
+import base64
+import re
+import uuid
+from email.utils import formatdate
+from .base import FakeService, parse_body
+
+MESSAGES_PATH = re.compile(r'^/2010-04-01/Accounts/(?P<sid>AC\w+)/Messages\.json$')
+
+
+class FakeTwilioAPI(FakeService):
+    def __init__(self, account_sid: str = 'AC' + '0' * 32, auth_token: str = 'fake-token', **kwargs):
+        """
+        Twilio REST API stand-in for the Messages resource.
+
+        Args:
+            account_sid (str): Account SID accepted in the path and basic auth
+            auth_token (str): Auth token accepted in basic auth
+        """
+        super().__init__(**kwargs)
+        self.account_sid = account_sid
+        self.auth_token = auth_token
+
+    def messages(self):
+        with self._lock:
+            return [r for r in self.requests if r['method'] == 'message']
+
+    def error_response(self, status, message):
+        return self.json_response({'code': 20000 + status, 'message': message, 'status': status}, status)
+
+    def _authorized(self, headers) -> bool:
+        expected = base64.b64encode(f"{self.account_sid}:{self.auth_token}".encode()).decode()
+        return headers.get('Authorization') == f"Basic {expected}"
+
+    def handle(self, method, path, query, headers, body):
+        match = MESSAGES_PATH.match(path)
+        if not match or method != 'POST':
+            return self.json_response({'code': 20404, 'message': 'Not Found', 'status': 404}, 404)
+        if match['sid'] != self.account_sid or not self._authorized(headers):
+            return self.json_response(
+                {'code': 20003, 'message': 'Authenticate', 'status': 401}, 401)
+
+        fields, _ = parse_body(headers, body)
+        if not fields.get('To') or not (fields.get('Body') or fields.get('MediaUrl')):
+            return self.json_response({
+                'code': 21619, 'message': 'A text message body or media urls must be specified.',
+                'status': 400}, 400)
+
+        sid = 'SM' + uuid.uuid4().hex
+        self.record(method='message', sid=sid, to=fields['To'], from_=fields.get('From'),
+                    body=fields.get('Body', ''), media_url=fields.get('MediaUrl'))
+        now = formatdate(usegmt=True)
+        return self.json_response({
+            'sid': sid,
+            'account_sid': self.account_sid,
+            'to': fields['To'],
+            'from': fields.get('From'),
+            'body': fields.get('Body', ''),
+            'status': 'queued',
+            'num_media': '1' if fields.get('MediaUrl') else '0',
+            'num_segments': '1',
+            'direction': 'outbound-api',
+            'api_version': '2010-04-01',
+            'date_created': now,
+            'date_updated': now,
+            'uri': f"/2010-04-01/Accounts/{self.account_sid}/Messages/{sid}.json",
+        }, 201)
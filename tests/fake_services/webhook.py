@@ -0,0 +1,11 @@
+from .base import FakeService, parse_body
+
+
+class FakeWebhook(FakeService):
+    """Generic endpoint that accepts any request and records it"""
+
+    def handle(self, method, path, query, headers, body):
+        fields, files = parse_body(headers, body)
+        fields.update(query)
+        self.record(method=method, path=path, bytes=len(body), **fields)
+        return self.json_response({'ok': True})
@@ -0,0 +1,138 @@
+import os
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from dataclasses import dataclass, asdict, field
+from typing import Optional
+from PIL import Image
+from src.image_hash import NearDuplicateIndex, dhash
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+HASH_DECODE_SIZE = (64, 64)  # JPEG draft target: decoding at 1/8 scale still reads every byte
+
+
+@dataclass
+class ImageInfo:
+    width: int = 0
+    height: int = 0
+    mode: str = ''
+    format: str = ''
+    dhash: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def aspect(self):
+        """Long side over short side"""
+        return max(self.width, self.height) / max(1, min(self.width, self.height))
+
+
+def inspect_image(path, deep=True):
+    """
+    Header and, if deep, full decode of one image.
+
+    The header gives dimensions, colour mode and format; decoding catches
+    truncated or corrupt data and yields the perceptual hash. JPEGs decode
+    in draft mode, which skips most of the IDCT work but still walks the
+    whole entropy-coded stream.
+    """
+    try:
+        with Image.open(path) as image:
+            info = ImageInfo(*image.size, image.mode, image.format or '')
+            if deep:
+                image.draft('L', HASH_DECODE_SIZE)
+                image.load()
+                info.dhash = dhash(np.asarray(image.convert('L')))
+    except Exception as e:  # PIL raises OSError, SyntaxError, ValueError... for bad files
+        info = ImageInfo(error=f"{type(e).__name__}: {e}")
+    return info
+
+
+@dataclass
+class IntegrityReport:
+    images: int = 0
+    inspected: int = 0
+    unreadable: dict = field(default_factory=dict)  # path -> error
+    duplicates: list = field(default_factory=list)  # (path, earlier near-identical path)
+    extreme_aspect: list = field(default_factory=list)
+    too_small: list = field(default_factory=list)
+    modes: dict = field(default_factory=dict)  # colour mode -> count
+
+    @property
+    def ok(self):
+        """Nothing that would crash training; duplicates and odd shapes are warnings"""
+        return not self.unreadable
+
+
+def check_images(paths, manifest=None, deep=True, workers=None, chunksize=32, max_aspect=4.0, min_side=32,
+                 hash_distance=3, force=False):
+    """
+    Read every image across a process pool and flag unreadable,
+    near-duplicate, extreme-aspect and tiny images.
+
+    Results are cached in the dataset manifest, keyed by size and mtime, so
+    only new or changed images are decoded again.
+
+    Args:
+        paths (list): Image paths, in the order duplicates are attributed
+        manifest (DatasetManifest): Cache for the decoded image properties
+        deep (bool): Decode and hash every image, False reads headers only (no duplicate check)
+        workers (int): Worker processes, defaults to the CPU count; 1 runs serially
+        chunksize (int): Images handed to a worker at a time
+        max_aspect (float): Long over short side above which an image is flagged
+        min_side (int): Short side below which an image is flagged
+        hash_distance (int): dhash bits within which images count as duplicates
+        force (bool): Decode every image, ignoring the cache
+
+    Returns:
+        IntegrityReport
+    """
+    logger = logging.getLogger(__name__)
+    infos, pending = {}, []
+    for path in paths:
+        cached = manifest.lookup(path) if manifest is not None and not force else None
+        info = ImageInfo(**cached['image']) if cached and 'image' in cached else None
+        # A header-only result does not answer a deep check
+        if info is not None and (not deep or info.error or info.dhash is not None):
+            infos[path] = info
+        else:
+            pending.append(path)
+
+    inspect = partial(inspect_image, deep=deep)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(pending) > chunksize:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            decoded = list(executor.map(inspect, pending, chunksize=chunksize))
+    else:
+        decoded = list(map(inspect, pending))
+    for path, info in zip(pending, decoded):
+        infos[path] = info
+        if manifest is not None:
+            manifest.record(path, image=asdict(info))
+    if manifest is not None:
+        manifest.save()
+    logger.info(f"Read {len(pending)} new or changed of {len(paths)} images")
+
+    report = IntegrityReport(images=len(paths), inspected=len(pending))
+    hashes = NearDuplicateIndex(hash_distance)
+    for path in paths:
+        info = infos[path]
+        if info.error:
+            report.unreadable[path] = info.error
+            continue
+        report.modes[info.mode] = report.modes.get(info.mode, 0) + 1
+        if info.aspect > max_aspect:
+            report.extreme_aspect.append(path)
+        if min(info.width, info.height) < min_side:
+            report.too_small.append(path)
+        if info.dhash is not None:
+            earlier = hashes.add(path, info.dhash)
+            if earlier is not None:
+                report.duplicates.append((path, earlier))
+    return report
+
+
+def image_files(images_dir):
+    """Image paths in a directory, sorted"""
+    return [os.path.join(images_dir, f) for f in sorted(os.listdir(images_dir))
+            if f.lower().endswith(IMAGE_EXTENSIONS)]
@@ -0,0 +1,114 @@
+import pytest
+import threading
+import numpy as np
+from src.alert_aggregator import AlertAggregator, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def frame():
+    return np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+def make_aggregator(clock, sent, **kwargs):
+    return AlertAggregator(sent.append, lambda: ['whatsapp', 'telegram'],
+                           window=60, digest_interval=30, clock=clock, **kwargs)
+
+
+def test_first_alert_immediate_then_digest(clock, frame):
+    """Test the first detection alerts at once and follow-ups are digested"""
+    sent = []
+    aggregator = make_aggregator(clock, sent)
+    assert aggregator.report('cam0', 'Fire', frame, 0.6).kind == 'first'
+    for _ in range(10):
+        clock.now += 1
+        assert aggregator.report('cam0', 'Fire', frame, 0.7) is None
+    assert aggregator.tick() is None  # Digest not due yet
+
+    clock.now += 20
+    digest = aggregator.tick()
+    assert digest.kind == 'digest' and digest.confidence == 0.7
+    assert 'Fire ×11' in digest.summary
+    assert [a.kind for a in sent] == ['first', 'digest']
+
+
+def test_new_camera_or_class_escalates(clock, frame):
+    """Test a second camera or a new class is sent without waiting for the digest"""
+    sent = []
+    aggregator = make_aggregator(clock, sent)
+    aggregator.report('cam0', 'Smoke', frame, 0.8)
+    assert aggregator.report('cam1', 'Smoke', frame, 0.8).kind == 'escalation'
+    assert aggregator.report('cam1', 'Fire', frame, 0.5).detection == 'Fire'
+    assert aggregator.report('cam1', 'Fire', frame, 0.5) is None
+    assert 'cam0, cam1' in sent[-1].summary
+
+
+def test_quiet_incident_closes_with_final_digest(clock, frame):
+    """Test unsent follow-ups are flushed when the incident ends"""
+    sent = []
+    aggregator = make_aggregator(clock, sent)
+    aggregator.report('cam0', 'Fire', frame, 0.6)
+    aggregator.report('cam0', 'Fire', frame, 0.9)
+    clock.now += 61
+    assert aggregator.tick().kind == 'final'
+    assert aggregator.incident is None
+    assert aggregator.report('cam0', 'Fire', frame, 0.6).kind == 'first'
+
+
+def test_rate_limits_per_channel(clock, frame):
+    """Test a channel out of tokens is skipped while others still receive alerts"""
+    sent = []
+    aggregator = make_aggregator(
+        clock, sent, rate_limits={'whatsapp': {'rate': 1 / 60, 'capacity': 1}})
+    aggregator.report('cam0', 'Fire', frame, 0.6)
+    aggregator.report('cam1', 'Fire', frame, 0.6)
+    assert sent[0].channels == ['whatsapp', 'telegram']
+    assert sent[1].channels == ['telegram']
+    assert aggregator.stats()['suppressed'] == {'whatsapp': 1}
+
+
+def test_token_bucket_refills(clock):
+    """Test tokens refill at the configured rate up to capacity"""
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now += 1
+    assert bucket.try_acquire()
+
+
+def test_slow_send_does_not_block_reports(clock, frame):
+    """Test a digest being sent from the tick thread does not hold up detections"""
+    sending, release = threading.Event(), threading.Event()
+
+    def send(alert):
+        if alert.kind == 'digest':
+            sending.set()
+            release.wait(5)
+
+    aggregator = AlertAggregator(send, lambda: ['telegram'], window=60, digest_interval=30, clock=clock)
+    aggregator.report('cam0', 'Fire', frame, 0.6)
+    aggregator.report('cam0', 'Fire', frame, 0.7)
+    clock.now += 31
+    ticker = threading.Thread(target=aggregator.tick)
+    ticker.start()
+    try:
+        assert sending.wait(5)
+        reporter = threading.Thread(target=aggregator.report, args=('cam0', 'Fire', frame, 0.8))
+        reporter.start()
+        reporter.join(1)
+        assert not reporter.is_alive()
+    finally:
+        release.set()
+        ticker.join()
@@ -0,0 +1,89 @@
+import logging
+import os
+import numpy as np
+import pytest
+from tests.box_index import BoxIndex, parse_label_text
+from tests.clean_labels_dummy_data import generate_synthetic_dataset
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    generate_synthetic_dataset(tmp_path, files_per_split=40)
+    logging.getLogger('tests.box_index').setLevel(logging.ERROR)
+    return tmp_path
+
+
+def rescan(root, split, class_id, max_area):
+    """Reference answer straight from the label text"""
+    count = 0
+    for label in sorted((root / split / 'labels').glob('*.txt')):
+        classes, boxes, _ = parse_label_text(label.read_text())
+        count += sum(c == class_id and b[2] * b[3] < max_area for c, b in zip(classes, boxes))
+    return count
+
+
+def test_parse_label_text():
+    """Test boxes are kept, polygons reduced to their bounds and malformed rows skipped"""
+    classes, boxes, skipped = parse_label_text("1 0.5 0.5 0.2 0.4\n0 0.1 0.2 0.3 0.4 0.5 0.6\n1 -0.1 1.3 0.1\n\n")
+    assert classes == [1, 0] and skipped == 1
+    assert np.allclose(boxes, [[0.5, 0.5, 0.2, 0.4], [0.3, 0.4, 0.4, 0.4]])
+
+
+def test_queries_match_rescan(dataset):
+    """Test filters and summaries agree with reading the labels"""
+    index = BoxIndex.open(str(dataset), names={0: 'fire', 1: 'smoke'})
+    mask = index.select(split='valid', classes=1, max_area=0.05)
+    assert mask.sum() == rescan(dataset, 'valid', 1, 0.05)
+
+    summary = index.summary()
+    assert summary['train']['images'] == 40
+    assert sum(summary['train']['classes'].values()) == summary['train']['boxes']
+    assert set(summary['train']['classes']) == {'fire', 'smoke'}
+
+    busy = index.images(index.select(classes=0), min_boxes=3)
+    assert all(np.sum(np.array(parse_label_text((dataset / name).read_text())[0]) == 0) >= 3 for name in busy)
+    counts, _ = index.histogram('w', bins=5, mask=mask)
+    assert counts.sum() == mask.sum()
+
+
+def test_incremental_update(dataset):
+    """Test a saved index only re-reads changed files and tracks additions and deletions"""
+    index = BoxIndex.open(str(dataset))
+    index.save()
+
+    labels = dataset / 'train' / 'labels'
+    (labels / 'img_000003.txt').write_text("0 0.5 0.5 0.9 0.9\n")
+    os.remove(labels / 'img_000007.txt')
+    (labels / 'extra.txt').write_text("1 0.5 0.5 0.01 0.01\n1 0.2 0.2 0.01 0.01\n")
+
+    updated = BoxIndex.open(str(dataset), update=False)
+    assert updated.update() == 2
+    assert updated.update() == 0
+    rebuilt = BoxIndex(str(dataset))
+    rebuilt.update()
+
+    assert sorted(updated.image_names) == sorted(rebuilt.image_names)
+    assert updated.images(updated.select(classes=1)) and len(updated) == len(rebuilt)
+    for name, boxes in (('train/labels/img_000003.txt', 1), ('train/labels/extra.txt', 2)):
+        image_id = list(updated.image_names).index(name)
+        assert updated.boxes_per_image()[image_id] == boxes
+    assert 'train/labels/img_000007.txt' not in updated.image_names
+    assert updated.summary() == rebuilt.summary()
+
+
+def test_skipped_rows_follow_files(dataset):
+    """Test malformed rows are counted once per file version and leave with deleted files"""
+    bad = dataset / 'train' / 'labels' / 'bad.txt'
+    bad.write_text("0 0.5\n0 0.5 0.5 0.1 0.1\n")
+    index = BoxIndex.open(str(dataset))
+    with_bad = index.skipped
+
+    bad.write_text("0 0.5\n1 x y z w\n0 0.5 0.5 0.1 0.1\n")
+    index.update()
+    assert index.skipped == with_bad + 1
+    index.save()
+    assert BoxIndex.open(str(dataset)).skipped == with_bad + 1
+
+    os.remove(bad)
+    index.update()
+    assert index.skipped == with_bad - 1
@@ -0,0 +1,106 @@
+import logging
+import os
+import shutil
+import random
+import pytest
+from tests.clean_labels import (YOLODatasetPreprocessor, LabelFileResult, clean_label_file,
+                                clean_lines, clean_lines_vectorised, unique_rows)
+from tests.clean_labels_dummy_data import generate_synthetic_dataset
+
+
+def test_duplicates_removed_in_order(tmp_path):
+    """Test the first occurrence of a repeated label keeps its position"""
+    label = tmp_path / 'a.txt'
+    label.write_text("1 0.2 0.3 0.1 0.2\n0 0.5 0.5 0.3 0.4\n1 0.2 0.3 0.1 0.2\n0 0.1 0.2 0.3 0.4 0.5 0.6\n")
+    result = clean_label_file(str(label))
+    assert label.read_text() == "1 0.2 0.3 0.1 0.2\n0 0.5 0.5 0.3 0.4\n0 0.3 0.4 0.4 0.4\n"
+    assert (result.processed, result.duplicates) == (2, 1)
+
+
+def test_parallel_matches_serial(tmp_path):
+    """Test sharding across processes rewrites files and counts exactly like a serial run"""
+    generate_synthetic_dataset(tmp_path / 'serial', files_per_split=60)
+    shutil.copytree(tmp_path / 'serial', tmp_path / 'parallel')
+
+    results = []
+    for name, workers in (('serial', 1), ('parallel', 2)):
+        preprocessor = YOLODatasetPreprocessor(str(tmp_path / name))
+        preprocessor.logger.setLevel(logging.ERROR)
+        results.append(preprocessor.process_labels(workers=workers, chunksize=8))
+
+    assert results[0] == results[1]
+    assert results[0]['train']['files'] == 60 and results[0]['train']['duplicates'] > 0
+    def contents(root):
+        return {p.relative_to(root): p.read_bytes() for p in root.rglob('*.txt')}
+
+    assert contents(tmp_path / 'serial') == contents(tmp_path / 'parallel')
+
+
+def random_lines(rng, count):
+    def number():
+        return rng.choice([f"{rng.uniform(-0.2, 1.2):.5f}", str(rng.randint(0, 1)), "1e-3", "0.50"])
+    lines = []
+    for _ in range(count):
+        tokens = [rng.choice(['0', '1', '+1', '02'])] + [number() for _ in range(rng.randint(0, 14))]
+        lines.append(" ".join(tokens) + rng.choice(["\n", "  \n", "\n"]))
+    return lines
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_vectorised_matches_line_by_line(seed):
+    """Test the NumPy path keeps, converts and reports exactly like the reference"""
+    lines = random_lines(random.Random(seed), 40)
+    expected, actual = LabelFileResult(), LabelFileResult()
+    vector_lines, vector_keys = clean_lines_vectorised(lines, 'f.txt', actual)
+    scalar_lines, scalar_keys = clean_lines(lines, 'f.txt', expected)
+    assert vector_lines == scalar_lines
+    assert unique_rows(vector_keys) == unique_rows(scalar_keys)
+    assert actual == expected
+
+
+def test_vectorised_falls_back_on_unusual_tokens():
+    """Test files the array parser could read differently take the reference path"""
+    for line in ("0 nan 0.5 0.3 0.4\n", "0.5 0.5 0.5 0.3 0.4\n", "0 1_0 0.5 0.3 0.4\n", "0 . 0.5 0.3 0.4\n"):
+        result = LabelFileResult()
+        assert clean_lines_vectorised([line], 'f.txt', result) is None
+        assert result == LabelFileResult()
+
+
+def test_duplicates_compare_by_value(tmp_path):
+    """Test rows equal in value but not in text are duplicates, on both paths"""
+    lines = ["0 0.5 0.5 0.3 0.4\n", "1 0.2 0.3 0.1 0.2\n", "0 0.50 0.5 0.30 0.4  \n"] * 30
+    for vectorised in (False, True):
+        label = tmp_path / f'{vectorised}.txt'
+        label.write_text(''.join(lines))
+        result = clean_label_file(str(label), vectorised=vectorised)
+        assert label.read_text() == ''.join(lines[:2])
+        assert result.duplicates == 88
+
+
+def test_rerun_only_touches_changed_files(tmp_path):
+    """Test the manifest skips unchanged files and picks up edits, touches and deletions"""
+    generate_synthetic_dataset(tmp_path, files_per_split=10)
+
+    def run(**kwargs):
+        preprocessor = YOLODatasetPreprocessor(str(tmp_path))
+        preprocessor.logger.setLevel(logging.ERROR)
+        valid, report = preprocessor.validate_dataset(**kwargs)
+        stats = preprocessor.process_labels(workers=1, **kwargs)
+        preprocessor.manifest.close()
+        return valid, report, {split: s['files'] for split, s in stats.items()}
+
+    assert run()[2] == {'train': 10, 'valid': 10, 'test': 10}
+    assert run()[2] == {'train': 0, 'valid': 0, 'test': 0}
+
+    labels = tmp_path / 'train' / 'labels'
+    with open(labels / 'img_000003.txt', 'a') as f:
+        f.write("0 0.5 0.5 0.2 0.2\n0 0.5 0.5 0.2 0.2\n")
+    os.utime(labels / 'img_000004.txt', ns=(0, 0))  # Touched, same content
+    (labels / 'img_000005.txt').unlink()
+
+    valid, report, cleaned = run()
+    assert cleaned == {'train': 1, 'valid': 0, 'test': 0}
+    assert report['duplicate_labels'] == ['img_000003.txt']
+    assert report['missing_labels'] == {'train': {'img_000005.txt'}}
+
+    assert run(force=True)[2] == {'train': 9, 'valid': 10, 'test': 10}
@@ -0,0 +1,61 @@
+import pytest
+import time
+import numpy as np
+from src.clip_recorder import ClipRecorder
+
+
+@pytest.fixture
+def clip_recorder(tmp_path):
+    recorder = ClipRecorder(tmp_path, pre_seconds=1.0, post_seconds=0.5,
+                            max_buffer_bytes=512 * 1024)
+    yield recorder
+    recorder.close()
+
+
+@pytest.fixture
+def sample_frame():
+    return np.random.randint(0, 255, (120, 160, 3), dtype=np.uint8)
+
+
+def test_buffer_is_bounded(clip_recorder, sample_frame):
+    """Test rolling buffer respects the byte budget"""
+    now = time.time()
+    for i in range(200):
+        clip_recorder.add_frame(sample_frame, timestamp=now + i * 0.001)
+        clip_recorder.drain()
+    assert clip_recorder._buffer_bytes["default"] <= clip_recorder.max_buffer_bytes
+
+
+def test_old_frames_are_dropped(clip_recorder, sample_frame):
+    """Test frames older than the pre-event window are evicted"""
+    now = time.time()
+    clip_recorder.add_frame(sample_frame, timestamp=now - 10)
+    clip_recorder.add_frame(sample_frame, timestamp=now)
+    clip_recorder.drain()
+    assert len(clip_recorder._buffers["default"]) == 1
+
+
+def test_clip_written_after_event(clip_recorder, sample_frame):
+    """Test a clip covering pre and post event frames is encoded"""
+    for _ in range(5):
+        clip_recorder.add_frame(sample_frame)
+        time.sleep(0.05)
+    path = clip_recorder.trigger(label="Fire")
+    for _ in range(5):
+        clip_recorder.add_frame(sample_frame)
+        time.sleep(0.15)
+    clip_recorder.close()
+    assert path.exists() and path.stat().st_size > 0
+
+
+def test_raw_frames_encoded_off_thread(tmp_path, sample_frame):
+    """Test raw frames are queued for the background encoder and dropped when it falls behind"""
+    recorder = ClipRecorder(tmp_path, encode_queue_size=2)
+    try:
+        for _ in range(50):
+            recorder.add_frame(sample_frame)
+        recorder.drain()
+        assert recorder.dropped_frames > 0
+        assert len(recorder._buffers["default"]) == 50 - recorder.dropped_frames
+    finally:
+        recorder.close()
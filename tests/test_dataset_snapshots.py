@@ -0,0 +1,57 @@
+import logging
+import os
+import pytest
+from tests.clean_labels import YOLODatasetPreprocessor
+from tests.clean_labels_dummy_data import generate_synthetic_dataset
+from tests.dataset_snapshots import SnapshotStore
+
+
+def read_tree(root):
+    return {os.path.relpath(os.path.join(d, f), root): open(os.path.join(d, f), 'rb').read()
+            for d, _, files in os.walk(root) for f in files}
+
+
+@pytest.fixture
+def preprocessor(tmp_path):
+    generate_synthetic_dataset(tmp_path / 'dataset', files_per_split=20)
+    preprocessor = YOLODatasetPreprocessor(str(tmp_path / 'dataset'), keep_snapshots=2)
+    preprocessor.logger.setLevel(logging.ERROR)
+    return preprocessor
+
+
+def test_snapshot_keeps_originals_and_copies_only_rewrites(preprocessor, tmp_path):
+    """Test rewritten labels are copied into the snapshot and everything else stays linked"""
+    dataset = tmp_path / 'dataset'
+    original = read_tree(dataset)
+    snapshot = preprocessor.backup_dataset()
+    assert snapshot.startswith(str(tmp_path / 'dataset.snapshots'))
+    assert SnapshotStore.unique_bytes(snapshot) == 0
+
+    stats = preprocessor.process_labels(workers=1)
+    rewritten = [path for path, data in read_tree(dataset).items()
+                 if original.get(path) != data and path.endswith('.txt')]
+    assert len(rewritten) == sum(s['processed_files'] for s in stats.values()) > 0
+
+    saved = read_tree(snapshot)
+    assert saved == {path: data for path, data in original.items() if not path.startswith('.')}
+    assert SnapshotStore.unique_bytes(snapshot) == sum(len(original[path]) for path in rewritten)
+
+
+def test_retention_and_location(preprocessor, tmp_path):
+    """Test old snapshots are pruned and snapshots inside the dataset are refused"""
+    for _ in range(3):
+        preprocessor.backup_dataset()
+    assert len(preprocessor.snapshots.snapshots()) == 2
+
+    with pytest.raises(ValueError):
+        SnapshotStore(str(tmp_path / 'dataset' / 'backup')).create(str(tmp_path / 'dataset'))
+
+
+def test_unfinished_snapshot_removed(preprocessor, tmp_path):
+    """Test a .partial directory left by an interrupted snapshot is deleted by the next one"""
+    stale = tmp_path / 'dataset.snapshots' / '20240101-000000-000000.partial'
+    (stale / 'train' / 'labels').mkdir(parents=True)
+    (stale / 'train' / 'labels' / 'a.txt').write_text('0 0.5 0.5 0.1 0.1\n')
+    preprocessor.backup_dataset()
+    assert not stale.exists()
+    assert len(preprocessor.snapshots.snapshots()) == 1
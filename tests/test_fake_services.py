@@ -0,0 +1,77 @@
+import time
+import pytest
+import numpy as np
+import requests
+from tests.fake_services import FakeProviders, FakeTwilioAPI
+from src.config import Config
+from src.notification_service import NotificationService
+
+
+@pytest.fixture
+def providers():
+    with FakeProviders(chat_ids=[1001, 1002]) as providers:
+        yield providers
+
+
+def make_service(providers, monkeypatch, **environ):
+    for name, value in providers.environ(**environ).items():
+        monkeypatch.setenv(name, value)
+    return NotificationService(providers.config(Config, OUTBOX_MAX_ATTEMPTS=3))
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return (rng.random((240, 320, 3)) * 255).astype(np.uint8)
+
+
+def test_alert_delivered_through_fakes(providers, monkeypatch, frame):
+    """Test an alert reaches Twilio and every Telegram subscriber with a GCS image URL"""
+    service = make_service(providers, monkeypatch)
+    try:
+        assert service.send_alert(frame, 'Fire', details='cam0')
+        assert wait_for(lambda: providers.twilio.messages()
+                        and len(providers.telegram.sent_messages()) == 2)
+    finally:
+        service.cleanup()
+
+    body = providers.twilio.messages()[0]['body']
+    assert 'Fire Detected!' in body and 'cam0' in body
+    image_url = body.split('View at ')[1].split()[0]
+    assert image_url.startswith(providers.gcs.url)
+    assert requests.get(image_url).content[:2] == b'\xff\xd8'  # Served publicly
+    assert {m['chat_id'] for m in providers.telegram.sent_messages()} == {1001, 1002}
+
+
+def test_callmebot_and_imgur_fallbacks(providers, monkeypatch, frame):
+    """Test the CallMeBot path with images uploaded to Imgur"""
+    service = make_service(providers, monkeypatch, whatsapp='callmebot', gcs=False)
+    try:
+        service.send_alert(frame, 'Smoke', channels=['whatsapp'])
+        assert wait_for(lambda: providers.callmebot.messages())
+    finally:
+        service.cleanup()
+    text = providers.callmebot.messages()[0]['text']
+    assert 'Smoke Detected!' in text and providers.imgur.url in text
+    assert not providers.twilio.requests and not providers.gcs.requests
+
+
+def test_rate_limit_and_failures():
+    """Test injected 503s and 429s in the providers' own error format"""
+    with FakeTwilioAPI(rate_limit=2) as twilio:
+        url = f"{twilio.url}/2010-04-01/Accounts/{twilio.account_sid}/Messages.json"
+        auth = (twilio.account_sid, twilio.auth_token)
+        codes = [requests.post(url, data={'To': 'a', 'Body': 'b'}, auth=auth).status_code
+                 for _ in range(3)]
+        assert codes == [201, 201, 429]
+
+    with FakeTwilioAPI(failure_rate=1.0) as twilio:
+        url = f"{twilio.url}/2010-04-01/Accounts/{twilio.account_sid}/Messages.json"
+        assert requests.post(url, data={'To': 'a', 'Body': 'b'}).status_code == 503
@@ -32,3 +32,12 @@ def test_process_frame(fire_detector, sample_frame):
     processed_frame, detection = fire_detector.process_frame(sample_frame)
     assert isinstance(processed_frame, np.ndarray)
     assert isinstance(detection, (str, type(None)))
+
+
+def test_update_settings(fire_detector, sample_frame):
+    """Test thresholds can be swapped on a running detector"""
+    settings = fire_detector.update_settings(min_confidence=0.6, roi=(0.0, 0.0, 0.5, 0.5))
+    assert fire_detector.settings is settings
+    assert fire_detector.min_confidence == 0.6
+    processed_frame, detection = fire_detector.process_frame(sample_frame)
+    assert isinstance(processed_frame, np.ndarray)
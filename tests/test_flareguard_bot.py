@@ -0,0 +1,70 @@
+import pytest
+import asyncio
+from pathlib import Path
+from cryptography.fernet import Fernet
+from tests.fake_services import FakeTelegramAPI
+from src.notification_service import FlareGuardBot
+
+
+@pytest.fixture
+def fake_api():
+    with FakeTelegramAPI() as api:
+        yield api
+
+
+@pytest.fixture
+def bot(fake_api, tmp_path, monkeypatch):
+    monkeypatch.setenv("ENCRYPTION_KEY", Fernet.generate_key().decode())
+    bot = FlareGuardBot(fake_api.token, base_url=fake_api.base_url,
+                        max_concurrency=8, storage_dir=tmp_path)
+    bot.chat_ids = set(range(1, 41))
+    return bot
+
+
+def test_photo_uploaded_once(bot, fake_api):
+    """Test fan-out uploads the photo once and reuses its file_id"""
+    async def run():
+        sent = await bot.send_alert(Path('data/test_image.png'), "🚨 Fire Detected!")
+        await bot.shutdown()
+        return sent
+
+    assert asyncio.run(run()) is True
+    messages = fake_api.sent_messages()
+    assert sorted(m['chat_id'] for m in messages) == list(range(1, 41))
+    assert fake_api.uploads == 1
+    assert sum(m['uploaded'] for m in messages) == 1
+
+
+
+def test_only_failed_chats_are_retried(bot, fake_api, monkeypatch):
+    """Test transient failures are returned for retry and the retry skips delivered chats"""
+    send_to_chat = bot._send_to_chat
+
+    async def flaky(chat_id, photo, caption):
+        if chat_id in (5, 6):
+            return None, False
+        return await send_to_chat(chat_id, photo, caption)
+
+    async def run():
+        monkeypatch.setattr(bot, '_send_to_chat', flaky)
+        failed = await bot.deliver(Path('data/test_image.png'), "🚨 Fire Detected!")
+        monkeypatch.setattr(bot, '_send_to_chat', send_to_chat)
+        retried = await bot.deliver(Path('data/test_image.png'), "🚨 Fire Detected!", chat_ids=failed)
+        await bot.shutdown()
+        return failed, retried
+
+    assert asyncio.run(run()) == ([5, 6], [])
+    assert sorted(m['chat_id'] for m in fake_api.sent_messages()) == list(range(1, 41))
+
+
+def test_no_subscribers_counts_as_sent(bot, fake_api):
+    """Test an alert with nobody to send to is not retried"""
+    bot.chat_ids = set()
+
+    async def run():
+        sent = await bot.send_alert(Path('data/test_image.png'), "🚨 Fire Detected!")
+        await bot.shutdown()
+        return sent
+
+    assert asyncio.run(run()) is True
+    assert not fake_api.sent_messages()
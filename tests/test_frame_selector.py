@@ -0,0 +1,47 @@
+import threading
+import time
+import cv2
+import numpy as np
+from src.frame_selector import BestFrameSelector, sharpness
+
+
+def make_frame(blur: bool = False):
+    rng = np.random.default_rng(0)
+    frame = (rng.random((240, 320, 3)) * 255).astype(np.uint8)
+    return cv2.GaussianBlur(frame, (15, 15), 5) if blur else frame
+
+
+def test_sharpness_prefers_focused_frames():
+    """Test the Laplacian variance drops for blurred frames"""
+    assert sharpness(make_frame()) > sharpness(make_frame(blur=True))
+    assert sharpness(make_frame(), [(10, 10, 100, 100)]) > 0
+
+
+def test_best_frame_sent_after_window():
+    """Test the highest-scoring frame in the window is delivered"""
+    selector = BestFrameSelector(window_ms=100)
+    delivered = []
+    ready = threading.Event()
+    boxes = [(50, 50, 150, 150)]
+
+    start = time.monotonic()
+    selector.begin('cam0', make_frame(blur=True), 0.55, boxes,
+                   lambda frame, confidence, b: delivered.append(confidence) or ready.set())
+    selector.offer('cam0', make_frame(), 0.9, boxes)
+    selector.offer('cam0', make_frame(blur=True), 0.6, boxes)
+    selector.offer('cam1', make_frame(), 0.99, boxes)  # Other source, ignored
+
+    assert ready.wait(2)
+    assert delivered == [0.9]
+    # The deadline timer bounds the delay even without further frames
+    assert time.monotonic() - start < 1.0
+    selector.stop()
+
+
+def test_stop_flushes_open_windows():
+    """Test pending selections are delivered on shutdown"""
+    selector = BestFrameSelector(window_ms=10_000)
+    delivered = []
+    selector.begin('cam0', make_frame(), 0.7, [], lambda *args: delivered.append(args[1]))
+    selector.stop()
+    assert delivered == [0.7]
@@ -0,0 +1,54 @@
+import pytest
+import os
+import numpy as np
+import cv2
+from src.gallery import ThumbnailGallery
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    images = tmp_path / 'detected_fires'
+    images.mkdir()
+    frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    for i in range(3):
+        cv2.imwrite(str(images / f'alert_2025010{i}-000000-000000.jpg'), frame)
+    return images
+
+
+@pytest.fixture
+def gallery(image_dir, tmp_path):
+    return ThumbnailGallery(image_dir, tmp_path / 'thumbs', thumb_size=64)
+
+
+def test_thumbnails_generated_once(gallery):
+    """Test thumbnails are built on first scan and reused afterwards"""
+    assert gallery.scan() == 3
+    assert gallery.scan() == 0
+    thumb = cv2.imread(str(gallery.thumb_dir / gallery.list()[0]['name']))
+    assert max(thumb.shape[:2]) == 64
+
+
+def test_modified_image_is_rebuilt(gallery, image_dir):
+    """Test the mtime index picks up changed images"""
+    gallery.scan()
+    path = next(image_dir.iterdir())
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert gallery.scan() == 1
+
+
+def test_index_persists(gallery, image_dir, tmp_path):
+    """Test a new gallery instance reuses the saved index"""
+    gallery.scan()
+    reloaded = ThumbnailGallery(image_dir, tmp_path / 'thumbs', thumb_size=64)
+    assert len(reloaded) == 3
+    assert reloaded.scan() == 0
+
+
+def test_removed_image_is_dropped(gallery, image_dir):
+    """Test deleted alert images disappear from the gallery"""
+    gallery.scan()
+    name = gallery.list()[0]['name']
+    (image_dir / name).unlink()
+    gallery.scan()
+    assert name not in gallery
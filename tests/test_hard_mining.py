@@ -0,0 +1,82 @@
+import csv
+import sys
+import cv2
+import numpy as np
+import pytest
+from pathlib import Path
+from src.fire_detector import DetectorSettings
+from src.hard_mining import HardExampleMiner, iter_snapshots, main, sample_video
+from tests.test_image_hash import scene
+
+
+class ScriptedDetector:
+    """Returns a fixed detection confidence per frame, keyed by the frame's top-left pixel"""
+    names = {0: 'fire', 1: 'smoke'}
+    settings = DetectorSettings(min_confidence=0.5, smoke_confidence=0.75)
+
+    def __init__(self, confidences):
+        self.confidences = confidences
+        self.batches = []
+
+    def predict_batch(self, frames, min_confidence=None, batch_size=8):
+        self.batches.append(len(frames))
+        predictions = []
+        for frame in frames:
+            class_id, confidence = self.confidences.get(int(frame[0, 0, 0]), (0, 0.0))
+            predictions.append([] if confidence < min_confidence else [{
+                'class': self.names[class_id], 'class_id': class_id, 'confidence': confidence,
+                'box': (10, 10, 50, 50), 'xywhn': (0.25, 0.25, 0.1, 0.2)}])
+        return predictions
+
+
+def tagged(seed, tag):
+    frame = scene(seed)
+    frame[0, 0, 0] = tag
+    return frame
+
+
+def test_mining_ranks_by_uncertainty_and_exports(tmp_path):
+    """Test duplicates are skipped before inference and candidates export ranked with YOLO labels"""
+    detector = ScriptedDetector({1: (0, 0.97), 2: (0, 0.52), 3: (1, 0.7), 4: (0, 0.05)})
+    frames = [('certain', tagged(0, 1)), ('borderline_fire', tagged(1, 2)),
+              ('borderline_fire_again', tagged(1, 2)), ('smoke', tagged(2, 3)), ('nothing', tagged(3, 4))]
+    miner = HardExampleMiner(detector, batch_size=2, limit=2)
+    miner.add(frames)
+
+    assert miner.stats == {'frames': 5, 'duplicates': 1, 'inferred': 4, 'with_detections': 3}
+    assert detector.batches == [2, 2]
+    assert [c.name for c in miner.candidates()] == ['borderline_fire', 'smoke']
+    spool = Path(miner._spool.name)
+    assert sorted(spool.iterdir()) == sorted(c.path for c in miner.candidates())
+
+    labels = miner.export(tmp_path)
+    assert [p.name for p in labels] == ['00000_borderline_fire.txt', '00001_smoke.txt']
+    assert labels[1].read_text() == "1 0.250000 0.250000 0.100000 0.200000\n"
+    assert (tmp_path / 'train' / 'images' / '00000_borderline_fire.jpg').exists()
+    with open(tmp_path / 'candidates.csv') as f:
+        assert [row['source'] for row in csv.DictReader(f)] == ['borderline_fire', 'smoke']
+    miner.close()
+    assert not spool.exists()
+
+
+def test_missing_snapshots_dir_is_an_error(tmp_path, monkeypatch, capsys):
+    """Test a --snapshots directory that does not exist is rejected instead of mining nothing"""
+    monkeypatch.setattr(sys, 'argv', ['hard_mining', '--snapshots', str(tmp_path / 'missing')])
+    with pytest.raises(SystemExit):
+        main()
+    assert '--snapshots is not a directory' in capsys.readouterr().err
+
+
+def test_frame_sources(tmp_path):
+    """Test snapshots are read in name order and videos sampled once per interval"""
+    cv2.imwrite(str(tmp_path / 'alert_2.jpg'), scene(0))
+    cv2.imwrite(str(tmp_path / 'alert_1.jpg'), scene(1))
+    (tmp_path / 'alert_1.json').write_text('{}')
+    assert [name for name, _ in iter_snapshots(tmp_path)] == ['alert_1', 'alert_2']
+
+    video = tmp_path / 'clip.avi'
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+    for i in range(25):
+        writer.write(np.full((48, 64, 3), i * 10, dtype=np.uint8))
+    writer.release()
+    assert [name for name, _ in sample_video(video, every=1.0)] == ['clip_f000000', 'clip_f000010', 'clip_f000020']
@@ -0,0 +1,117 @@
+import pytest
+import time
+import requests
+from tests.fake_services import FakeService
+from src.http_client import HttpClient
+
+
+class FlakyService(FakeService):
+    """Fails the first `failures` requests with `status`, then answers 200"""
+
+    def __init__(self, failures=0, status=503, retry_after=None, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.status = status
+        self.retry_after = retry_after
+
+    def handle(self, method, path, query, headers, body):
+        self.record(method=method, path=path)
+        if len(self.requests) <= self.failures:
+            status, headers, payload = self.json_response({'error': 'unavailable'}, self.status)
+            if self.retry_after is not None:
+                headers['Retry-After'] = str(self.retry_after)
+            return status, headers, payload
+        return self.json_response({'ok': True})
+
+
+class DroppingService(FakeService):
+    """Reads every request, then closes the connection without answering"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.server.handle_error = lambda request, address: None
+
+    def handle(self, method, path, query, headers, body):
+        self.record(method=method, path=path)
+        raise ConnectionAbortedError("dropped after reading the request")
+
+
+@pytest.fixture
+def http_client():
+    client = HttpClient(max_retries=2, backoff_base=0.01)
+    yield client
+    client.close()
+
+
+def test_connections_are_kept_alive(http_client):
+    """Test sequential requests reuse one pooled connection"""
+    with FlakyService() as service:
+        for _ in range(5):
+            assert http_client.get(f"{service.url}/ping").status_code == 200
+        pools = http_client.session.get_adapter(service.url).poolmanager.pools
+        assert [pools[key].num_connections for key in pools.keys()] == [1]
+
+
+def test_retry_on_unavailable(http_client):
+    """Test retryable statuses are retried with backoff"""
+    with FlakyService(failures=2) as service:
+        response = http_client.post(f"{service.url}/send", data={'a': 1}, retry_status=True)
+        assert response.status_code == 200
+        assert len(service.requests) == 3
+
+    metrics = http_client.metrics()[service.url.split('//')[1]]
+    assert metrics['requests'] == 3
+    assert metrics['retries'] == 2
+    assert metrics['errors'] == 2
+    assert metrics['latency_ms']['p50'] is not None
+
+
+def test_gives_up_after_max_retries(http_client):
+    """Test the last error response is returned once retries run out"""
+    with FlakyService(failures=10) as service:
+        assert http_client.get(f"{service.url}/ping").status_code == 503
+        assert len(service.requests) == 3
+
+
+def test_connection_errors_are_recorded(http_client):
+    """Test failures without a response are counted and raised"""
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http_client.get("http://127.0.0.1:9/unreachable", retries=0)
+    assert http_client.metrics()['127.0.0.1:9']['errors'] == 1
+
+
+def test_read_timeout_not_retried_for_side_effects(http_client):
+    """Test a GET marked non-idempotent is not resent after a read timeout"""
+    with FlakyService(latency=0.5) as service:
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            http_client.get(f"{service.url}/send", timeout=(1, 0.1), idempotent=False)
+        time.sleep(1.0)  # Requests are recorded once the latency has passed
+        assert len(service.requests) == 1
+
+
+def test_dropped_connection_not_retried_for_side_effects(http_client):
+    """Test a request the server read before dropping the connection is only resent if idempotent"""
+    with DroppingService() as service:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            http_client.get(f"{service.url}/send", idempotent=False)
+        assert len(service.requests) == 1
+        with pytest.raises(requests.exceptions.ConnectionError):
+            http_client.get(f"{service.url}/ping")
+        assert len(service.requests) == 4
+
+
+def test_error_status_not_retried_for_side_effects(http_client):
+    """Test a 502 is returned as is for non-idempotent requests, a 429 with Retry-After is retried"""
+    with FlakyService(failures=1, status=502) as service:
+        assert http_client.get(f"{service.url}/send", idempotent=False).status_code == 502
+        assert len(service.requests) == 1
+    with FlakyService(failures=1, status=429, retry_after=0) as service:
+        assert http_client.post(f"{service.url}/send").status_code == 200
+        assert len(service.requests) == 2
+
+
+def test_refused_connection_retried_for_side_effects(http_client):
+    """Test a connection that was never established is retried even if not idempotent"""
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http_client.get("http://127.0.0.1:9/send", idempotent=False)
+    assert http_client.metrics()['127.0.0.1:9']['requests'] == 3
@@ -0,0 +1,30 @@
+import cv2
+import numpy as np
+import pytest
+from src.image_hash import NearDuplicateIndex, dhash, hamming
+
+
+def scene(seed, size=(240, 320)):
+    rng = np.random.default_rng(seed)
+    image = cv2.resize(rng.integers(0, 255, (6, 8, 3), dtype=np.uint8), size[::-1], interpolation=cv2.INTER_CUBIC)
+    return image
+
+
+def test_dhash_tolerates_rescale_and_recompression():
+    """Test a resized, recompressed copy hashes close and a different scene far"""
+    image = scene(0)
+    _, jpeg = cv2.imencode('.jpg', cv2.resize(image, (160, 120)), [cv2.IMWRITE_JPEG_QUALITY, 60])
+    copy = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+    assert hamming(dhash(image), dhash(copy)) <= 3
+    assert hamming(dhash(image), dhash(scene(1))) > 10
+
+
+def test_near_duplicate_index():
+    """Test hashes within max_distance are matched to the first one seen"""
+    index = NearDuplicateIndex(max_distance=3)
+    assert index.add('a', 0xF0F0_0000_FFFF_1234) is None
+    assert index.add('b', 0xF0F0_0000_FFFF_1234 ^ 0b10000001 ^ (1 << 40)) == 'a'
+    assert index.add('c', 0x0F0F_FFFF_0000_1234) is None
+    assert index.find(0xF0F0_0000_FFFF_1234 ^ 0b1111) is None
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(max_distance=4)
@@ -0,0 +1,54 @@
+import logging
+import cv2
+import numpy as np
+from tests.clean_labels import YOLODatasetPreprocessor
+from tests.test_image_hash import scene
+
+
+def write_images(images_dir):
+    images_dir.mkdir(parents=True)
+    cv2.imwrite(str(images_dir / 'a.jpg'), scene(0))
+    cv2.imwrite(str(images_dir / 'b.png'), scene(1))
+    cv2.imwrite(str(images_dir / 'a_small.jpg'), cv2.resize(scene(0), (160, 120)))
+    cv2.imwrite(str(images_dir / 'banner.jpg'), cv2.resize(scene(2), (640, 80)))
+    data = (images_dir / 'b.png').read_bytes()
+    _, jpeg = cv2.imencode('.jpg', scene(3))
+    (images_dir / 'truncated.jpg').write_bytes(jpeg.tobytes()[:len(jpeg) // 2])
+    (images_dir / 'empty.png').write_bytes(data[:20])
+
+
+def test_deep_check_flags_bad_images(tmp_path):
+    """Test unreadable, near-duplicate and extreme-aspect images are reported and the cache reused"""
+    write_images(tmp_path / 'train' / 'images')
+    write_images(tmp_path / 'valid' / 'images')
+    preprocessor = YOLODatasetPreprocessor(str(tmp_path))
+    preprocessor.logger.setLevel(logging.CRITICAL)
+
+    report = preprocessor.check_image_integrity(workers=1)
+    train, valid = tmp_path / 'train' / 'images', tmp_path / 'valid' / 'images'
+    assert set(report.unreadable) == {str(d / f) for d in (train, valid) for f in ('truncated.jpg', 'empty.png')}
+    assert (str(train / 'a_small.jpg'), str(train / 'a.jpg')) in report.duplicates
+    assert (str(valid / 'a.jpg'), str(train / 'a.jpg')) in report.duplicates  # Leak across splits
+    assert report.extreme_aspect == [str(train / 'banner.jpg'), str(valid / 'banner.jpg')]
+    assert report.modes == {'RGB': 8} and not report.ok
+
+    (train / 'b.png').write_bytes((valid / 'a.jpg').read_bytes())
+    again = YOLODatasetPreprocessor(str(tmp_path)).check_image_integrity(workers=1)
+    assert again.inspected == 1
+    assert (str(train / 'b.png'), str(train / 'a.jpg')) in again.duplicates
+    assert again.unreadable == report.unreadable
+
+
+def test_validate_dataset_deep(tmp_path):
+    """Test unreadable images make a deep validation fail"""
+    write_images(tmp_path / 'train' / 'images')
+    (tmp_path / 'train' / 'labels').mkdir()
+    for image in (tmp_path / 'train' / 'images').iterdir():
+        (tmp_path / 'train' / 'labels' / (image.stem + '.txt')).write_text("0 0.5 0.5 0.1 0.1\n")
+    preprocessor = YOLODatasetPreprocessor(str(tmp_path))
+    preprocessor.splits = ['train']
+    preprocessor.logger.setLevel(logging.CRITICAL)
+
+    assert preprocessor.validate_dataset()[0]
+    valid, report = preprocessor.validate_dataset(deep=True)
+    assert not valid and len(report['image_integrity'].unreadable) == 2
@@ -0,0 +1,48 @@
+import pytest
+import cv2
+from src.image_profiles import ImageProfile, ImageStats, crop_to_boxes, optimise
+
+
+@pytest.fixture
+def sample_frame():
+    # Camera-sized frame
+    return cv2.resize(cv2.imread('data/test_image.png'), (1280, 768))
+
+
+def test_quality_search_meets_target(sample_frame):
+    """Test the highest quality under max_bytes is chosen"""
+    profile = ImageProfile(quality=95, min_quality=20, max_bytes=40 * 1024)
+    result = optimise(sample_frame, profile)
+    assert len(result.data) <= profile.max_bytes
+    if result.quality < profile.quality:
+        # One step up would have been too large
+        ret, buffer = cv2.imencode('.jpg', sample_frame, [cv2.IMWRITE_JPEG_QUALITY, result.quality + 1])
+        assert len(buffer) > profile.max_bytes
+
+
+def test_max_dim_and_downscale_fallback(sample_frame):
+    """Test max_dim is applied and unreachable targets shrink the image"""
+    resized = optimise(sample_frame, ImageProfile(max_dim=320))
+    assert max(resized.width, resized.height) == 320
+
+    tiny = optimise(sample_frame, ImageProfile(max_bytes=3000, min_quality=60))
+    assert len(tiny.data) <= 3000
+    assert max(tiny.width, tiny.height) < max(sample_frame.shape[:2])
+
+
+def test_crop_to_boxes(sample_frame):
+    """Test cropping keeps the boxes plus margin and ignores empty detections"""
+    cropped = crop_to_boxes(sample_frame, [(100, 100, 200, 150), (300, 120, 400, 140)], margin=0.5)
+    assert cropped.shape[:2] == (100, 550)  # Left margin clipped at the frame edge
+    assert crop_to_boxes(sample_frame, []) is sample_frame
+
+
+def test_stats_report_savings():
+    """Test bytes saved and time saved from observed upload throughput"""
+    stats = ImageStats()
+    stats.record('telegram', 400_000, 100_000, 0.02)
+    stats.record_upload('telegram', 100_000, 1.0)
+    report = stats.report()['telegram']
+    assert report['bytes_saved'] == 300_000
+    assert report['throughput_bps'] == 100_000
+    assert report['seconds_saved'] == pytest.approx(2.98)
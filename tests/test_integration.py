@@ -1,7 +1,6 @@
 import pytest
 import cv2
 from src.fire_detector import Detector
-from src.notification_service import NotificationService
 from src.config import Config
 
 
@@ -10,12 +9,6 @@ def fire_detector():
     return Detector(Config.MODEL_PATH)
 
 
-@pytest.fixture
-def notification_service():
-    config = Config()
-    return NotificationService(config)
-
-
 @pytest.fixture
 def sample_frame():
     return cv2.imread('data/test_image.png')
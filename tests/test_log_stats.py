@@ -0,0 +1,87 @@
+import gzip
+import logging
+import pytest
+import src.log_stats as log_stats
+from src.log_stats import LogStats, log_files, work_units
+from src.logging_setup import configure_logging, log_detection_change, set_log_context, shutdown_logging
+
+TEXT_LOG = """\
+2025-05-06 10:01:02 - __main__ - INFO - 🚀 Starting Fire Detection System
+2025-05-06 10:01:03 - src.notification_service - ERROR - Telegram setup failed: bad token
+2025-05-06 10:05:00 - __main__ - WARNING - 🐦‍🔥 Fire first alert queued (1 camera)
+Traceback (most recent call last):
+  File "x.py", line 1, in <module>
+2025-05-06 10:05:01 - src.fire_detector - ERROR - Error processing frame: 'AAttn' object
+2025-05-06 11:00:00 - __main__ - INFO - Detection status changed: Smoke
+2025-05-06 11:00:01 - __main__ - WARNING - 🐦‍🔥 Smoke escalation alert queued (2 cameras)
+2025-05-06 11:00:02 - werkzeug - INFO - 127.0.0.1 - - "GET /api/stats HTTP/1.1" 200 -
+2025-05-07 09:00:00 - __main__ - WARNING - Fire Detected! Queueing alert
+2025-05-07 09:30:00 - app - WARNING - 🔥 Smoke digest alert (Smoke ×4, 1 camera)
+2025-05-07 09:31:00 - app - WARNING - 🔥 Fire first alert queued (1 camera)
+"""
+
+
+def test_counts_per_bucket_across_rotations(tmp_path):
+    """Test events are bucketed by hour over gzipped rotations and the active log"""
+    log = tmp_path / 'fire_detection.log'
+    lines = TEXT_LOG.splitlines(keepends=True)
+    (tmp_path / 'fire_detection.log.1.gz').write_bytes(gzip.compress(''.join(lines[:6]).encode()))
+    log.write_text(''.join(lines[6:]))
+    assert [p.name for p in log_files(log)] == ['fire_detection.log.1.gz', 'fire_detection.log']
+
+    stats = LogStats('hour').add_files(log_files(log))
+    assert stats.table('alert') == {'2025-05-06 10': {'Fire': 1}, '2025-05-06 11': {'Smoke': 1},
+                                    '2025-05-07 09': {'Fire': 2, 'Smoke': 1}}
+    assert stats.table('failure') == {'2025-05-06 10': {'telegram': 1, 'fire_detector': 1}}
+    assert stats.table('detection') == {'2025-05-06 11': {'Smoke': 1}}
+    assert stats.totals()['startup'] == {'start': 1}
+
+    recent = LogStats('day', since='2025-05-07').add_files([log])
+    assert recent.totals() == {'alert': {'Fire': 2, 'Smoke': 1}}
+
+
+def test_parallel_ranges_match_single_scan(tmp_path, monkeypatch):
+    """Test splitting a file into line-aligned ranges across processes changes nothing"""
+    log = tmp_path / 'fire_detection.log'
+    log.write_text(TEXT_LOG * 200)
+    expected = LogStats('minute').add_files([log]).counts
+
+    monkeypatch.setattr(log_stats, 'CHUNK_SIZE', 1000)
+    units = work_units(log)
+    assert len(units) > 10 and units[-1][2] == log.stat().st_size
+    assert all(log.read_bytes()[end - 1:end] == b'\n' for _, _, end in units)
+    assert LogStats('minute').add_files([log]).counts == expected
+    assert LogStats('minute').add_files([log], workers=2).counts == expected
+
+
+@pytest.fixture
+def json_log(tmp_path):
+    log = tmp_path / 'fire_detection.log'
+    configure_logging(log, json_lines=True, console=False)
+    set_log_context(camera_id='cam-1')
+    logger = logging.getLogger('__main__')
+    logger.info("🚀 Starting Fire Detection System")
+    logger.warning('🐦‍🔥 Fire first alert queued ("front" camera)')
+    logging.getLogger('src.notification_service').error("WhatsApp alert failed: timeout")
+    shutdown_logging()
+    set_log_context(camera_id=None)
+    return log
+
+
+def test_json_lines(json_log):
+    """Test the JSON-lines format is counted like the text format"""
+    totals = LogStats('day').add_files([json_log]).totals()
+    assert totals == {'startup': {'start': 1}, 'alert': {'Fire': 1}, 'failure': {'whatsapp': 1}}
+
+
+@pytest.mark.parametrize('json_lines', [False, True])
+def test_detection_changes_from_frame_loop(tmp_path, json_lines):
+    """Test status changes logged by the frame loops are counted, clearing the status is not"""
+    log = tmp_path / 'fire_detection.log'
+    configure_logging(log, json_lines=json_lines, console=False)
+    logger = logging.getLogger('__main__')
+    for detection in ('Fire', None, 'Smoke', 'Fire'):
+        log_detection_change(logger, detection)
+    shutdown_logging()
+    totals = LogStats('day').add_files([log]).totals()
+    assert totals == {'detection': {'Fire': 2, 'Smoke': 1}}
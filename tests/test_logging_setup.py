@@ -0,0 +1,63 @@
+import gzip
+import json
+import logging
+import pytest
+from src.logging_setup import SamplingFilter, configure_logging, set_log_context, shutdown_logging
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    yield tmp_path / 'logs' / 'fire_detection.log'
+    shutdown_logging()
+    set_log_context(camera_id=None, frame_ts=None)
+
+
+def test_rotated_logs_are_compressed(log_file):
+    """Test records reach the file through the listener and rollovers are gzipped"""
+    configure_logging(log_file, max_bytes=2000, backups=2, console=False)
+    logger = logging.getLogger('test.rotation')
+    for i in range(100):
+        logger.info(f"Fire alert {i:03d} queued")
+    shutdown_logging()
+
+    backups = sorted(p.name for p in log_file.parent.iterdir())
+    assert backups == ['fire_detection.log', 'fire_detection.log.1.gz', 'fire_detection.log.2.gz']
+    newest_backup = gzip.decompress((log_file.parent / 'fire_detection.log.1.gz').read_bytes()).decode()
+    assert 'test.rotation - INFO - Fire alert' in newest_backup
+    assert log_file.read_text().splitlines()[-1].endswith('Fire alert 099 queued')
+
+
+def test_json_lines_carry_context(log_file):
+    """Test JSON records include the camera and frame context of the logging thread"""
+    configure_logging(log_file, json_lines=True, console=False)
+    set_log_context(camera_id='cam-1', frame_ts=1700000000.5)
+    logging.getLogger('test.json').warning("Fire detected")
+    set_log_context(frame_ts=None)
+    logging.getLogger('test.json').error("Telegram failed")
+    shutdown_logging()
+
+    first, second = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert first['msg'] == 'Fire detected' and first['level'] == 'WARNING'
+    assert (first['camera_id'], first['frame_ts']) == ('cam-1', 1700000000.5)
+    assert second['camera_id'] == 'cam-1' and 'frame_ts' not in second
+
+
+def test_debug_records_are_sampled_per_call_site():
+    """Test each call site passes one DEBUG record per interval and reports the rest"""
+    now = [0.0]
+    sampler = SamplingFilter(interval=1.0, clock=lambda: now[0])
+
+    def record(line, level=logging.DEBUG):
+        return logging.LogRecord('t', level, 'main.py', line, 'frame', None, None)
+
+    passed = []
+    for i in range(30):
+        now[0] = i * 0.1
+        for line in (10, 20):
+            r = record(line)
+            if sampler.filter(r):
+                passed.append((line, r.getMessage()))
+        assert sampler.filter(record(30, logging.INFO))
+
+    assert passed[:2] == [(10, 'frame'), (20, 'frame')]
+    assert len(passed) == 6 and passed[2] == (10, 'frame (+9 similar suppressed)')
@@ -1,17 +1,10 @@
 import pytest
+import asyncio
 import cv2
-from src.notification_service import NotificationService
+import threading
+import time
 from pathlib import Path
-from src.config import Config
-
-
-@pytest.fixture
-def notification_service():
-    config = Config()
-    service = NotificationService(config)
-    yield service
-    # Ensure proper cleanup after each test
-    service.cleanup()
+from src.outbox import Outbox, PENDING
 
 
 @pytest.fixture
@@ -33,11 +26,13 @@ def test_save_frame(notification_service, sample_frame):
     path.unlink()  # Cleanup
 
 
-def test_imgur_upload(notification_service, sample_frame):
+def test_imgur_upload(make_notification_service, providers, sample_frame):
     """Test Imgur upload functionality"""
+    notification_service = make_notification_service(gcs=False)
     path = notification_service.save_frame(sample_frame)
     url = notification_service.upload_image(path)
-    assert url is not None and url.startswith('http')
+    assert url is not None and url.startswith(providers.imgur.url)
+    assert providers.imgur.requests
     path.unlink()  # Cleanup
 
 
@@ -45,3 +40,54 @@ def test_whatsapp_alert(notification_service, sample_frame):
     """Test WhatsApp alert sending"""
     result = notification_service.send_alert(sample_frame, '---TESTS---')
     assert result is True
+
+
+def test_dispatcher_loop_runs_on_own_thread(notification_service):
+    """Test coroutines are executed on the long-lived dispatcher thread"""
+    import threading
+
+    async def current_thread_name():
+        return threading.current_thread().name
+
+    assert notification_service.loop_thread.is_alive()
+    assert notification_service._submit(current_thread_name()).result(timeout=5) == "notification-loop"
+
+
+def test_encode_frame_once(notification_service, sample_frame):
+    """Test alert frames are encoded into immutable JPEG bytes"""
+    image_data = notification_service.encode_frame(sample_frame)
+    assert isinstance(image_data, bytes)
+    assert image_data[:2] == b'\xff\xd8'
+
+
+def test_alert_persisted_in_background(notification_service, sample_frame):
+    """Test the alert image is written by the background writer"""
+    saved = []
+    notification_service.on_alert_saved.append(saved.append)
+    notification_service.send_alert(sample_frame, '---TESTS---')
+    notification_service.disk_writer.submit(lambda: None).result(timeout=10)
+    assert saved and saved[0].exists()
+    saved[0].unlink()
+    saved[0].with_suffix('.json').unlink()
+
+
+def test_cleanup_cancels_hanging_delivery(make_notification_service, sample_frame, tmp_path):
+    """Test cleanup does not wait out a hanging Telegram send and keeps the alert for the next run"""
+    notification_service = make_notification_service()
+    started = threading.Event()
+
+    async def hang(*args):
+        started.set()
+        await asyncio.sleep(3600)
+
+    notification_service._send_telegram_alert = hang
+    notification_service.outbox.enqueue(
+        '---TESTS---', notification_service.encode_frame(sample_frame), ['telegram'])
+    assert started.wait(timeout=10)
+
+    start = time.monotonic()
+    notification_service.cleanup()
+    assert time.monotonic() - start < 10
+    outbox = Outbox(tmp_path / 'outbox.db', {})
+    assert outbox.stats()['channels'] == {'telegram': {PENDING: 1}}
+    outbox.close()
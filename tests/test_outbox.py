@@ -0,0 +1,104 @@
+import pytest
+import threading
+import time
+from src.outbox import Outbox, OutboxFull, SENT, DEAD
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / 'outbox.db'
+
+
+def test_alert_delivered_to_each_channel(db_path):
+    """Test each channel handler receives the persisted alert"""
+    received = []
+    outbox = Outbox(db_path, {
+        'a': lambda alert: received.append(('a', alert['image'])) or True,
+        'b': lambda alert: received.append(('b', alert['image'])) or True,
+    }).start()
+    outbox.enqueue('Fire', b'jpeg', ['a', 'b'])
+    assert outbox.wait_idle()
+    assert sorted(received) == [('a', b'jpeg'), ('b', b'jpeg')]
+    assert outbox.stats()['channels'] == {'a': {SENT: 1}, 'b': {SENT: 1}}
+    outbox.close()
+
+
+def test_failed_delivery_is_retried_then_dead_lettered(db_path):
+    """Test retries with backoff and dead-lettering after max attempts"""
+    attempts = []
+    outbox = Outbox(db_path, {'a': lambda alert: attempts.append(alert['attempt']) and False},
+                    max_attempts=3, base_delay=0.01, poll_interval=0.01).start()
+    outbox.enqueue('Fire', b'jpeg', ['a'])
+    deadline = time.time() + 5
+    while not outbox.dead_letters() and time.time() < deadline:
+        time.sleep(0.01)
+    assert attempts == [1, 2, 3]
+    assert outbox.dead_letters()[0]['channel'] == 'a'
+    assert outbox.stats()['channels'] == {'a': {DEAD: 1}}
+    outbox.close()
+
+
+def test_progress_kept_between_attempts(db_path):
+    """Test what a failed attempt recorded in its progress is handed to the retry"""
+    seen = []
+
+    def handler(alert):
+        seen.append(dict(alert['progress']))
+        alert['progress']['left'] = ['b']
+        return len(seen) > 1
+
+    outbox = Outbox(db_path, {'a': handler}, base_delay=0.01, poll_interval=0.01).start()
+    outbox.enqueue('Fire', b'jpeg', ['a'])
+    deadline = time.time() + 5
+    while len(seen) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert outbox.wait_idle()
+    assert seen == [{}, {'left': ['b']}]
+    outbox.close()
+
+
+def test_scheduler_purges_delivered_alerts(db_path):
+    """Test delivered alerts past the retention are purged while failed ones stay"""
+    outbox = Outbox(db_path, {'a': lambda alert: True, 'b': lambda alert: False},
+                    max_attempts=1, poll_interval=0.01, retention=0.0, purge_interval=0.01).start()
+    outbox.enqueue('Fire', b'jpeg', ['a'])
+    outbox.enqueue('Smoke', b'jpeg', ['b'])
+    deadline = time.time() + 5
+    while outbox.stats()['channels'] != {'b': {DEAD: 1}} and time.time() < deadline:
+        time.sleep(0.01)
+    assert outbox.stats()['channels'] == {'b': {DEAD: 1}}
+    assert outbox.retry_dead() == 1
+    outbox.close()
+
+
+def test_pending_alerts_replayed_on_restart(db_path):
+    """Test alerts persisted before a crash are delivered on the next start"""
+    outbox = Outbox(db_path, {'a': lambda alert: True})  # Never started
+    outbox.enqueue('Smoke', b'jpeg', ['a'])
+    outbox.close()
+
+    delivered = threading.Event()
+    outbox = Outbox(db_path, {'a': lambda alert: delivered.set() or True}).start()
+    assert delivered.wait(timeout=5)
+    outbox.close()
+
+
+def test_drop_policy_rejects_when_full(db_path):
+    """Test the drop policy refuses alerts once the memory queue is full"""
+    outbox = Outbox(db_path, {'a': lambda alert: True}, queue_size=1, backpressure='drop')
+    outbox.enqueue('Fire', b'jpeg', ['a'])
+    with pytest.raises(OutboxFull):
+        outbox.enqueue('Fire', b'jpeg', ['a'])
+    outbox.close()
+
+
+def test_spill_policy_keeps_overflow_on_disk(db_path):
+    """Test overflow beyond the memory queue is delivered later from disk"""
+    outbox = Outbox(db_path, {'a': lambda alert: True}, queue_size=2, poll_interval=0.01)
+    for _ in range(10):
+        outbox.enqueue('Fire', b'jpeg', ['a'])
+    assert outbox._queue.qsize() == 2
+    outbox.start()
+    assert outbox.wait_idle()
+    assert outbox.stats()['channels'] == {'a': {SENT: 10}}
+    outbox.close()
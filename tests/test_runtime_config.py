@@ -0,0 +1,58 @@
+import pytest
+import json
+import os
+from src.runtime_config import RuntimeConfig, RuntimeSettings, ConfigVersionError
+
+
+@pytest.fixture
+def runtime_config(tmp_path):
+    return RuntimeConfig(RuntimeSettings(), config_file=tmp_path / 'runtime_config.json')
+
+
+def test_update_bumps_version(runtime_config):
+    """Test a valid update is applied and versioned"""
+    settings = runtime_config.update({'min_confidence': 0.6})
+    assert settings.min_confidence == 0.6
+    assert settings.version == 1
+    assert runtime_config.current is settings
+
+
+def test_invalid_update_is_rejected(runtime_config):
+    """Test validation leaves the current settings untouched"""
+    with pytest.raises(ValueError):
+        runtime_config.update({'iou_threshold': 1.5})
+    with pytest.raises(ValueError):
+        runtime_config.update({'roi': [0.5, 0.5, 0.2, 0.8]})
+    with pytest.raises(ValueError):
+        runtime_config.update({'unknown': 1})
+    assert runtime_config.current.version == 0
+
+
+def test_version_conflict(runtime_config):
+    """Test stale updates are refused"""
+    runtime_config.update({'alert_cooldown': 10})
+    with pytest.raises(ConfigVersionError):
+        runtime_config.update({'alert_cooldown': 20}, expected_version=0)
+
+
+def test_listeners_receive_settings(runtime_config):
+    """Test subscribers see each new settings object"""
+    received = []
+    runtime_config.subscribe(received.append)
+    runtime_config.update({'roi': [0.1, 0.1, 0.9, 0.9]})
+    assert received[0].roi == (0.1, 0.1, 0.9, 0.9)
+
+
+def test_file_changes_are_applied(runtime_config):
+    """Test edits to the watched file are picked up"""
+    runtime_config.update({'min_confidence': 0.4})
+    assert not runtime_config.check_file()  # Our own write is ignored
+
+    with open(runtime_config.config_file, 'w') as f:
+        json.dump({'min_confidence': 0.7, 'alert_cooldown': 5}, f)
+    stat = runtime_config.config_file.stat()
+    os.utime(runtime_config.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert runtime_config.check_file()
+    assert runtime_config.current.min_confidence == 0.7
+    assert runtime_config.current.alert_cooldown == 5
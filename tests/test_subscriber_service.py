@@ -0,0 +1,108 @@
+import pytest
+import asyncio
+import json
+import time
+import requests
+from cryptography.fernet import Fernet
+from tests.fake_services import FakeTelegramAPI
+from src.subscriber_service import SubscriberService, SubscriberStore
+
+
+@pytest.fixture
+def cipher():
+    return Fernet(Fernet.generate_key())
+
+
+@pytest.fixture
+def store(tmp_path, cipher):
+    return SubscriberStore(tmp_path / 'sysdata.bin', cipher, save_delay=0.1)
+
+
+@pytest.fixture
+def fake_api():
+    with FakeTelegramAPI() as api:
+        yield api
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    return condition()
+
+
+def test_store_batches_writes(store, tmp_path, cipher):
+    """Test changes are written once, atomically, and visible to another process"""
+    for chat_id in (1, 2, 3):
+        store.add(chat_id)
+    store.remove([2])
+    assert not store.storage_file.exists()  # Still debounced
+    time.sleep(0.3)
+    other = SubscriberStore(tmp_path / 'sysdata.bin', cipher)
+    assert other.ids() == {1, 3}
+
+    other.add(4)
+    other.flush()
+    assert store.ids() == {1, 3, 4}  # Picked up on the next lookup
+
+
+def test_store_merges_concurrent_writes(store, tmp_path, cipher):
+    """Test a pending save keeps chats another process registered in the meantime"""
+    store.add(1)
+    store.flush()
+    store.add(2)
+    store.remove([1])
+    other = SubscriberStore(tmp_path / 'sysdata.bin', cipher)
+    other.add(3)
+    other.flush()
+    store.flush()
+    assert SubscriberStore(tmp_path / 'sysdata.bin', cipher).ids() == {2, 3}
+    assert store.ids() == {2, 3}
+
+
+def test_store_reads_legacy_format(tmp_path, cipher):
+    """Test stores holding a bare list of IDs still load"""
+    (tmp_path / 'sysdata.bin').write_bytes(cipher.encrypt(json.dumps([7, 8]).encode()))
+    assert SubscriberStore(tmp_path / 'sysdata.bin', cipher).ids() == {7, 8}
+
+
+def test_start_registers_subscriber_by_polling(fake_api, store):
+    """Test /start over long polling subscribes the chat and replies"""
+    service = SubscriberService(fake_api.token, store, base_url=fake_api.base_url)
+
+    async def run():
+        await service.start()
+        fake_api.add_update(42, '/start')
+        fake_api.add_update(43, '/help')
+        replied = await wait_for(lambda: len(fake_api.sent_messages('sendMessage')) == 2)
+        await service.stop()
+        return replied
+
+    assert asyncio.run(run())
+    assert store.ids() == {42, 43}
+    assert store.storage_file.exists()  # Flushed on stop
+
+
+def test_webhook_mode(fake_api, store):
+    """Test updates posted to the webhook receiver are handled without polling"""
+    service = SubscriberService(
+        fake_api.token, store, base_url=fake_api.base_url,
+        webhook_url='https://example.test/telegram', webhook_listen='127.0.0.1',
+        webhook_port=0, webhook_secret='s3cret')
+
+    async def run():
+        await service.start()
+        host, port = service.webhook_address
+        url = f'http://{host}:{port}/telegram'
+        update = fake_api.add_update(55, '/start')
+        loop = asyncio.get_running_loop()
+        forbidden = await loop.run_in_executor(None, lambda: requests.post(url, json=update))
+        accepted = await loop.run_in_executor(None, lambda: requests.post(
+            url, json=update, headers={'X-Telegram-Bot-Api-Secret-Token': 's3cret'}))
+        registered = await wait_for(lambda: 55 in store)
+        await service.stop()
+        return forbidden.status_code, accepted.status_code, registered
+
+    assert asyncio.run(run()) == (403, 200, True)
+    assert fake_api.sent_messages('setWebhook')
+    assert not fake_api.sent_messages('getUpdates')
@@ -0,0 +1,72 @@
+import json
+import os
+import signal
+import threading
+import time
+import pytest
+from src.tracing import Tracer
+
+
+def test_ring_keeps_latest_spans():
+    """Test a full ring overwrites the oldest spans and exports them in time order"""
+    tracer = Tracer(capacity=4)
+    for i in range(6):
+        with tracer.span(f"step{i}", 'test', index=i):
+            pass
+    assert [s[0] for s in tracer.spans()] == ['step2', 'step3', 'step4', 'step5']
+
+    tracer.configure(enabled=False)
+    with tracer.span('ignored') as span:
+        span.set(boxes=1)
+    assert len(tracer.spans()) == 4
+
+
+def test_chrome_trace_per_thread():
+    """Test spans from several threads export as complete events with thread names"""
+    tracer = Tracer()
+
+    @tracer.traced(cat='test')
+    def work():
+        time.sleep(0.002)
+
+    def capture():
+        with tracer.span('capture', 'test') as span:
+            work()
+            span.set(frame=7)
+
+    thread = threading.Thread(target=capture, name='camera-1')
+    thread.start()
+    thread.join()
+    work()
+
+    events = tracer.chrome_trace()['traceEvents']
+    names = {e['tid']: e['args']['name'] for e in events if e['ph'] == 'M'}
+    spans = [e for e in events if e['ph'] == 'X']
+    assert sorted(names.values()) == ['MainThread', 'camera-1']
+    assert [(e['name'], names[e['tid']]) for e in spans] == [
+        ('capture', 'camera-1'), ('test_chrome_trace_per_thread.<locals>.work', 'camera-1'),
+        ('test_chrome_trace_per_thread.<locals>.work', 'MainThread')]
+    capture_span, nested = spans[:2]
+    assert capture_span['args'] == {'frame': 7} and nested['dur'] >= 2000
+    assert capture_span['ts'] <= nested['ts'] and nested['ts'] + nested['dur'] <= capture_span['ts'] + capture_span['dur']
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGUSR1'), reason='SIGUSR1 is POSIX only')
+def test_signal_dumps_trace(tmp_path):
+    """Test SIGUSR1 writes the buffer as a trace file"""
+    tracer = Tracer()
+    previous = signal.getsignal(signal.SIGUSR1)
+    try:
+        assert tracer.install_signal_handler(tmp_path)
+        with tracer.span('inference'):
+            pass
+        os.kill(os.getpid(), signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+    for thread in threading.enumerate():
+        if thread.name == 'trace-dump':
+            thread.join(timeout=5)
+    (dump,) = tmp_path.glob('trace-*.json')
+    events = json.loads(dump.read_text())['traceEvents']
+    assert [e['name'] for e in events if e['ph'] == 'X'] == ['inference']
@@ -0,0 +1,125 @@
+import pytest
+import threading
+import time
+from src.upload_cache import UploadCache, content_hash
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+
+    @property
+    def public_url(self):
+        return f"https://storage.test/{self.name}"
+
+    def exists(self):
+        return self.name in self.bucket.blobs
+
+    def upload_from_string(self, data, content_type=None):
+        self.bucket.uploads.append(self.name)
+        self.bucket.blobs[self.name] = data
+
+    def make_public(self):
+        pass
+
+    def generate_signed_url(self, **kwargs):
+        self.bucket.signed.append(self.name)
+        return f"{self.public_url}?signature={len(self.bucket.signed)}"
+
+
+class FakeBucket:
+    """In-memory stand-in for google.cloud.storage.Bucket"""
+
+    def __init__(self):
+        self.blobs = {}
+        self.uploads = []
+        self.signed = []
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+
+def test_same_content_uploaded_once():
+    """Test identical bytes reuse the cached URL"""
+    cache = UploadCache()
+    calls = []
+    upload = lambda data, digest: calls.append(digest) or f"https://x/{digest}"
+    first = cache.get_or_upload(b'jpeg', upload)
+    assert cache.get_or_upload(b'jpeg', upload) == first
+    assert calls == [content_hash(b'jpeg')]
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+
+def test_lru_eviction_and_ttl():
+    """Test least recently used entries are evicted and expired URLs are dropped"""
+    now = [0.0]
+    cache = UploadCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.put('a', 'url-a')
+    cache.put('b', 'url-b')
+    cache.get('a')
+    cache.put('c', 'url-c')
+    assert cache.get('b') is None and cache.get('a') == 'url-a'
+    now[0] = 11
+    assert cache.get('a') is None and len(cache) == 1
+
+
+def test_concurrent_uploads_are_single_flight():
+    """Test concurrent requests for the same content share one upload"""
+    cache = UploadCache()
+    calls = []
+
+    def slow_upload(data, digest):
+        calls.append(digest)
+        time.sleep(0.1)
+        return 'https://x/1'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        cache.get_or_upload(b'jpeg', slow_upload))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and results == ['https://x/1'] * 8
+
+
+def test_failed_upload_not_cached():
+    """Test a failed upload is retried on the next request"""
+    cache = UploadCache()
+    assert cache.get_or_upload(b'jpeg', lambda data, digest: None) is None
+    assert cache.get_or_upload(b'jpeg', lambda data, digest: 'https://x/1') == 'https://x/1'
+
+
+@pytest.fixture
+def gcs_service(make_notification_service):
+    service = make_notification_service(gcs=False)
+    service.bucket = FakeBucket()
+    service.gcs_enabled = True
+    return service
+
+
+def test_gcs_blob_named_by_content_hash(gcs_service):
+    """Test alert images land under their hash and are uploaded once"""
+    image = b'\xff\xd8alert'
+    url = gcs_service.upload_image(image)
+    assert gcs_service.upload_image(image) == url
+    assert gcs_service.bucket.uploads == [f"fire_alerts/{content_hash(image)}.jpg"]
+    assert url.endswith(gcs_service.bucket.uploads[0])
+
+
+def test_existing_blob_not_uploaded_again(gcs_service):
+    """Test a blob uploaded by a previous run is reused without a cache entry"""
+    gcs_service.bucket.blobs[f"fire_alerts/{content_hash(b'old')}.jpg"] = b'old'
+    assert gcs_service.upload_image(b'old')
+    assert gcs_service.bucket.uploads == []
+
+
+def test_signed_url_reused(gcs_service):
+    """Test the Twilio temp_media fallback signs each image once"""
+    first = gcs_service.upload_cache.get_or_upload(
+        b'img', gcs_service._upload_signed, namespace='signed')
+    second = gcs_service.upload_cache.get_or_upload(
+        b'img', gcs_service._upload_signed, namespace='signed')
+    assert first == second
+    assert gcs_service.bucket.signed == [f"temp_media/{content_hash(b'img')}.jpg"]
@@ -0,0 +1,53 @@
+import time
+import uuid
+import cv2
+import numpy as np
+import requests
+
+
+def create_test_image():
+    """Create a fire-like test frame with a unique label"""
+    img = np.zeros((400, 600, 3), dtype=np.uint8)
+    img[:, :] = (30, 30, 60)  # Dark blue background
+
+    # Radial red-to-yellow gradient around the centre
+    ys, xs = np.mgrid[0:400, 0:600]
+    intensity = np.clip(1.0 - np.hypot(xs - 300, ys - 225) / 150, 0, 1)
+    flame = np.random.default_rng(0).random((400, 600)) > 0.3
+    fire = (intensity > 0) & flame
+    img[fire] = np.stack([30 * intensity, 100 * intensity, 255 * intensity], axis=-1)[fire].astype(np.uint8)
+
+    cv2.putText(img, "FIRE DETECTED!", (150, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.3, (255, 255, 255), 3)
+    cv2.putText(img, f"Test: {str(uuid.uuid4())[:8]}", (400, 380),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    return img
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_gcs_upload(make_notification_service, providers):
+    """Test alert images are uploaded to GCS and served publicly"""
+    notification_service = make_notification_service()
+    assert notification_service.gcs_enabled
+    image_data = notification_service.encode_frame(create_test_image())
+
+    url = notification_service.upload_image(image_data)
+    assert url is not None and url.startswith(providers.gcs.url)
+    assert requests.get(url).content == image_data
+
+
+def test_notification_service(make_notification_service, providers, tmp_path):
+    """Test a WhatsApp alert goes through Twilio with the uploaded image"""
+    notification_service = make_notification_service()
+    assert notification_service.whatsapp_enabled
+
+    assert notification_service.send_alert(create_test_image(), "TEST", channels=['whatsapp'])
+    assert wait_for(lambda: providers.twilio.messages())
+    body = providers.twilio.messages()[0]['body']
+    assert 'TEST Detected!' in body and providers.gcs.url in body
+    assert wait_for(lambda: list((tmp_path / 'detected_fires').glob('alert_*.jpg')))